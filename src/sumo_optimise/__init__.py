@@ -10,6 +10,7 @@ from .conversion import (
     OutputFileTemplates,
     build_and_persist,
     build_corridor_artifacts,
+    build_many,
 )
 
 __all__ = [
@@ -21,4 +22,5 @@ __all__ = [
     "BuildTask",
     "build_and_persist",
     "build_corridor_artifacts",
+    "build_many",
 ]
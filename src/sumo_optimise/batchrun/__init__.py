@@ -5,6 +5,8 @@ from .models import (
     DEFAULT_WARMUP_SECONDS,
     DEFAULT_UNSAT_SECONDS,
     DEFAULT_SAT_SECONDS,
+    CheckpointConfig,
+    FcdReduceConfig,
     QueueDurabilityConfig,
     ScaleProbeConfig,
     ScaleMode,
@@ -19,6 +21,8 @@ __all__ = [
     "DEFAULT_WARMUP_SECONDS",
     "DEFAULT_UNSAT_SECONDS",
     "DEFAULT_SAT_SECONDS",
+    "CheckpointConfig",
+    "FcdReduceConfig",
     "QueueDurabilityConfig",
     "ScaleProbeConfig",
     "ScaleMode",
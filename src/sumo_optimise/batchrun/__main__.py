@@ -4,9 +4,13 @@ import argparse
 from pathlib import Path
 
 from .models import (
+    DEFAULT_CHECKPOINT_RESUMES,
+    DEFAULT_FCD_BIN_SECONDS,
     DEFAULT_MAX_WORKERS,
     DEFAULT_QUEUE_THRESHOLD_LENGTH,
     DEFAULT_QUEUE_THRESHOLD_STEPS,
+    CheckpointConfig,
+    FcdReduceConfig,
     OutputFormat,
     QueueDurabilityConfig,
     ScaleProbeConfig,
@@ -67,6 +71,46 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Temporarily log metrics parsing progress (debug; may be removed later)",
     )
+    parser.add_argument(
+        "--size-scan-interval",
+        type=float,
+        default=0.0,
+        help=(
+            "Seconds between full scans of the output root to reconcile the reported output size "
+            "(default: 0 = disabled; the size is accumulated from worker reports)"
+        ),
+    )
+    parser.add_argument(
+        "--fcd-reduce",
+        action="store_true",
+        help="Reduce FCD output to per-lane density/speed/queue time bins (fcd_lanes_<run>.npz; needs numpy)",
+    )
+    parser.add_argument(
+        "--fcd-bin-seconds",
+        type=float,
+        default=DEFAULT_FCD_BIN_SECONDS,
+        help="Time bin width for --fcd-reduce (default: 60)",
+    )
+    parser.add_argument(
+        "--drop-raw-fcd",
+        action="store_true",
+        help="Delete the raw FCD output after a successful --fcd-reduce",
+    )
+    parser.add_argument(
+        "--checkpoint-period",
+        type=float,
+        default=0.0,
+        help=(
+            "Simulation seconds between SUMO state saves (--save-state.period); a failed run resumes "
+            "from the latest state and appends its outputs (default: 0 = disabled)"
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint-resumes",
+        type=int,
+        default=DEFAULT_CHECKPOINT_RESUMES,
+        help="Maximum resume attempts per run when checkpointing is enabled (default: 2)",
+    )
     return parser.parse_args()
 
 
@@ -89,6 +133,16 @@ def main() -> None:
         max_workers=args.workers,
         metrics_trace=args.metrics_trace,
         output_format=output_format,
+        size_scan_interval=args.size_scan_interval or None,
+        fcd_reduce=FcdReduceConfig(
+            enabled=args.fcd_reduce,
+            bin_seconds=args.fcd_bin_seconds,
+            keep_raw=not args.drop_raw_fcd,
+        ),
+        checkpoint=CheckpointConfig(
+            period=args.checkpoint_period,
+            max_resumes=args.checkpoint_resumes,
+        ),
     )
 
 
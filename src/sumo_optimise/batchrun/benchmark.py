@@ -0,0 +1,323 @@
+"""Benchmark orchestrator overhead with a stub ``sumo`` executable.
+
+Usage::
+
+    python -m sumo_optimise.batchrun.benchmark --spec spec.json --demand-dir demand/ \\
+        --workers 1,4,16,64 --runs-per-worker 2 --step-rate 500
+
+``sumo`` is replaced on ``PATH`` by :mod:`sumo_optimise.batchrun.sumo_stub`, so
+the measured time is the batch runner itself: build, scheduling, status channel,
+metrics parsing and compression. Micro-benchmarks for the status channel, the
+parsers and zst compression run on the reference outputs independently of the
+worker sweep.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .models import (
+    OutputFormat,
+    QueueDurabilityConfig,
+    RunArtifacts,
+    ScaleProbeConfig,
+    ScenarioConfig,
+    WorkerPhase,
+)
+from .orchestrator import _compress_artifacts, _send_status, run_batch
+from .parsers import parse_tripinfo, parse_waiting_percentile, parse_waiting_ratio
+from .sumo_stub import DEFAULT_REFERENCE_DIR, REFERENCE_DIR_ENV, STDOUT_ENV, STEP_RATE_ENV, require_reference_dir
+
+DEFAULT_WORKER_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def install_sumo_stub(bin_dir: Path) -> Path:
+    """Write a ``sumo`` launcher for the stub into ``bin_dir`` and return its path."""
+
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    src_root = Path(__file__).resolve().parents[2]
+    launcher = bin_dir / "sumo"
+    launcher.write_text(
+        "#!/bin/sh\n"
+        f'PYTHONPATH="{src_root}${{PYTHONPATH:+:$PYTHONPATH}}" '
+        f'exec "{sys.executable}" -m sumo_optimise.batchrun.sumo_stub "$@"\n',
+        encoding="utf-8",
+    )
+    launcher.chmod(launcher.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return launcher
+
+
+@contextlib.contextmanager
+def stub_environment(
+    bin_dir: Path,
+    *,
+    reference_dir: Path,
+    step_rate: float,
+    stdout_replay: Optional[Path] = None,
+):
+    """Temporarily put the stub first on ``PATH`` (inherited by pool workers)."""
+
+    install_sumo_stub(bin_dir)
+    overrides = {
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        REFERENCE_DIR_ENV: str(reference_dir),
+        STEP_RATE_ENV: str(step_rate),
+    }
+    if stdout_replay is not None:
+        overrides[STDOUT_ENV] = str(stdout_replay)
+    previous = {key: os.environ.get(key) for key in list(overrides) + [STDOUT_ENV]}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def bench_status_channel(events: int = 10000) -> Dict[str, float]:
+    """Round-trip cost of status events through a Manager queue."""
+
+    manager = multiprocessing.Manager()
+    try:
+        queue = manager.Queue()
+        start = time.perf_counter()
+        for idx in range(events):
+            _send_status(queue, worker_id=idx % 64, scenario_id="bench", phase=WorkerPhase.SUMO, step=float(idx))
+        put_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(events):
+            queue.get()
+        get_elapsed = time.perf_counter() - start
+    finally:
+        manager.shutdown()
+    return {
+        "events": float(events),
+        "put_us": put_elapsed / events * 1e6,
+        "get_us": get_elapsed / events * 1e6,
+    }
+
+
+def bench_parsers(reference_dir: Path, *, repeat: int = 5) -> Dict[str, float]:
+    """Mean parse time per call on the reference outputs."""
+
+    trip = reference_dir / "vehicle_tripinfo.csv"
+    person = reference_dir / "person_tripinfo.csv"
+    summary = reference_dir / "vehicle_summary.csv"
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_tripinfo(trip, begin_filter=0.0, end_filter=None, personinfo=person)
+    timings["tripinfo_ms"] = (time.perf_counter() - start) / repeat * 1e3
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_waiting_ratio(summary, config=QueueDurabilityConfig())
+    timings["waiting_ratio_ms"] = (time.perf_counter() - start) / repeat * 1e3
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_waiting_percentile(summary, begin=0.0, end=float("inf"))
+    timings["waiting_percentile_ms"] = (time.perf_counter() - start) / repeat * 1e3
+    return timings
+
+
+def bench_compression(reference_dir: Path, *, level: int, work_dir: Path) -> Dict[str, float]:
+    """Time ``_compress_artifacts`` on a copy of the reference outputs."""
+
+    run_dir = work_dir / "compress"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    names = {
+        "tripinfo": "vehicle_tripinfo.csv",
+        "personinfo": "person_tripinfo.csv",
+        "summary": "vehicle_summary.csv",
+        "person_summary": "person_summary.csv",
+    }
+    paths = {key: run_dir / name for key, name in names.items()}
+    raw_bytes = 0
+    for key, name in names.items():
+        shutil.copyfile(reference_dir / name, paths[key])
+        raw_bytes += paths[key].stat().st_size
+    artifacts = RunArtifacts(
+        outdir=run_dir,
+        sumocfg=run_dir / "bench.sumocfg",
+        network=run_dir / "bench.net.xml",
+        tripinfo=paths["tripinfo"],
+        personinfo=paths["personinfo"],
+        fcd=run_dir / "fcd.csv",
+        summary=paths["summary"],
+        person_summary=paths["person_summary"],
+        detector=run_dir / "detector.xml",
+        queue=run_dir / "queue.xml",
+        sumo_log=run_dir / "sumo.log",
+        run_id="bench",
+    )
+    start = time.perf_counter()
+    delta = _compress_artifacts(artifacts, level=level, log_path=None)
+    elapsed = time.perf_counter() - start
+    return {
+        "level": float(level),
+        "raw_bytes": float(raw_bytes),
+        "compressed_bytes": float(raw_bytes + delta),
+        "elapsed_ms": elapsed * 1e3,
+    }
+
+
+def _bench_scenarios(spec: Path, demand_dir: Path, count: int) -> List[ScenarioConfig]:
+    return [
+        ScenarioConfig(
+            spec=spec,
+            scenario_id=f"bench-{seed}",
+            scenario_base_id="bench",
+            seed=seed,
+            demand_dir=demand_dir,
+            warmup_seconds=100.0,
+            unsat_seconds=200.0,
+            sat_seconds=183.0,
+            ped_unsat_scale=1.0,
+            ped_sat_scale=1.0,
+            veh_unsat_scale=1.0,
+            veh_sat_scale=1.0,
+        )
+        for seed in range(1, count + 1)
+    ]
+
+
+def bench_run_batch(
+    *,
+    spec: Path,
+    demand_dir: Path,
+    workers: int,
+    runs: int,
+    output_format: OutputFormat,
+    work_dir: Path,
+) -> Dict[str, float]:
+    """Wall time and throughput of ``run_batch`` for ``runs`` stubbed scenarios."""
+
+    output_root = work_dir / f"workers-{workers}"
+    if output_root.exists():
+        shutil.rmtree(output_root)
+    scenarios = _bench_scenarios(spec, demand_dir, runs)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_batch(
+            scenarios,
+            output_root=output_root,
+            queue_config=QueueDurabilityConfig(),
+            scale_probe=ScaleProbeConfig(enabled=False),
+            results_csv=output_root / "results.csv",
+            max_workers=workers,
+            output_format=output_format,
+        )
+    elapsed = time.perf_counter() - start
+    return {
+        "workers": float(workers),
+        "runs": float(runs),
+        "elapsed_s": elapsed,
+        "runs_per_s": runs / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _parse_worker_counts(raw: str) -> List[int]:
+    counts = [int(token) for token in raw.split(",") if token.strip()]
+    if not counts or any(count < 1 for count in counts):
+        raise argparse.ArgumentTypeError("worker counts must be positive integers")
+    return counts
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the batch runner with a stub sumo executable")
+    parser.add_argument("--spec", type=Path, help="Corridor spec used for every benchmark run")
+    parser.add_argument("--demand-dir", type=Path, help="Demand directory (*.pe/pj/ve/vj.csv)")
+    parser.add_argument(
+        "--workers",
+        type=_parse_worker_counts,
+        default=list(DEFAULT_WORKER_COUNTS),
+        help="Comma-separated worker counts to sweep (default: 1,2,4,8,16,32,64)",
+    )
+    parser.add_argument("--runs-per-worker", type=int, default=2, help="Scenarios per worker (default: 2)")
+    parser.add_argument(
+        "--step-rate",
+        type=float,
+        default=0.0,
+        help="Stub SUMO steps per second; 0 replays as fast as possible (default: 0)",
+    )
+    parser.add_argument("--stdout-replay", type=Path, help="Recorded SUMO stdout to replay")
+    parser.add_argument("--reference-dir", type=Path, default=DEFAULT_REFERENCE_DIR)
+    parser.add_argument("--output-format", choices=["csv.gz", "csv.zst"], default="csv.gz")
+    parser.add_argument("--zstd-level", type=int, default=10)
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temporary directory)")
+    parser.add_argument("--json", type=Path, help="Optional path for machine-readable results")
+    parser.add_argument(
+        "--skip-batch",
+        action="store_true",
+        help="Only run the status-channel, parser and compression micro-benchmarks",
+    )
+    args = parser.parse_args(argv)
+    if not args.skip_batch and (args.spec is None or args.demand_dir is None):
+        parser.error("--spec and --demand-dir are required unless --skip-batch is given")
+    require_reference_dir(args.reference_dir)
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    output_format = OutputFormat.from_string(args.output_format, zstd_level=args.zstd_level)
+    report: Dict[str, object] = {}
+
+    with contextlib.ExitStack() as stack:
+        work_dir = args.work_dir or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="batchrun-bench-")))
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        report["status_channel"] = bench_status_channel()
+        report["parsers"] = bench_parsers(args.reference_dir)
+        report["compression"] = bench_compression(args.reference_dir, level=args.zstd_level, work_dir=work_dir)
+        for section in ("status_channel", "parsers", "compression"):
+            values = ", ".join(f"{key}={value:.3f}" for key, value in report[section].items())
+            print(f"[bench] {section}: {values}")
+
+        if not args.skip_batch:
+            sweep: List[Dict[str, float]] = []
+            with stub_environment(
+                work_dir / "bin",
+                reference_dir=args.reference_dir,
+                step_rate=args.step_rate,
+                stdout_replay=args.stdout_replay,
+            ):
+                for workers in args.workers:
+                    row = bench_run_batch(
+                        spec=args.spec.resolve(),
+                        demand_dir=args.demand_dir.resolve(),
+                        workers=workers,
+                        runs=workers * args.runs_per_worker,
+                        output_format=output_format,
+                        work_dir=work_dir,
+                    )
+                    sweep.append(row)
+                    print(
+                        f"[bench] run_batch workers={workers} runs={int(row['runs'])} "
+                        f"elapsed={row['elapsed_s']:.2f}s throughput={row['runs_per_s']:.2f} runs/s"
+                    )
+            report["run_batch"] = sweep
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import math
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .models import FcdReduceConfig
+from .parsers import _XmlDocumentSplitter, _cutoff_for, _segment_cutoffs
+
+
+@dataclass
+class FcdLaneAggregates:
+    """Per-lane FCD aggregates on a fixed time grid (arrays shaped ``lanes x bins``).
+
+    * ``vehicles``: mean number of vehicles on the lane per timestep.
+    * ``density``: vehicles per km (NaN when the lane length is unknown).
+    * ``mean_speed``: mean speed of the observed vehicles in m/s (NaN without samples).
+    * ``queue``: mean number of halting vehicles per timestep.
+    """
+
+    lanes: List[str]
+    bin_start: object
+    bin_seconds: float
+    vehicles: object
+    density: object
+    mean_speed: object
+    queue: object
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("[fcd] numpy not installed; install with `pip install numpy` to enable FCD reduction")
+    return np
+
+
+def _open_binary(path: Path) -> BinaryIO:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.name.endswith(".zst"):
+        import zstandard as zstd
+
+        return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True))
+    return path.open("rb")
+
+
+def _base_suffix(path: Path) -> str:
+    name = path.name
+    for ext in (".gz", ".zst"):
+        if name.endswith(ext):
+            name = name[: -len(ext)]
+    return Path(name).suffix.lower()
+
+
+_Sample = Tuple[int, float, Optional[str], Optional[float]]
+
+
+def _iter_csv_samples(path: Path) -> Iterator[_Sample]:
+    with _open_binary(path) as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            return
+        segment = 0
+        for values in reader:
+            if not values:
+                continue
+            if values == header:
+                # Resumed runs append a new segment with its own header.
+                segment += 1
+                continue
+            row = dict(zip(header, values))
+            try:
+                timestep = float(row.get("timestep_time") or "")
+            except ValueError:
+                continue
+            lane = row.get("vehicle_lane") or None
+            try:
+                speed = float(row.get("vehicle_speed") or "")
+            except ValueError:
+                speed = None
+            yield segment, timestep, lane, speed
+
+
+def _iter_xml_samples(path: Path) -> Iterator[_Sample]:
+    with _open_binary(path) as fp:
+        splitter = _XmlDocumentSplitter(fp)
+        for segment, stream in enumerate(splitter.documents()):
+            try:
+                for _, elem in ET.iterparse(stream, events=("end",)):
+                    if elem.tag != "timestep":
+                        continue
+                    try:
+                        timestep = float(elem.attrib.get("time") or "")
+                    except ValueError:
+                        elem.clear()
+                        continue
+                    yield segment, timestep, None, None
+                    for vehicle in elem.iter("vehicle"):
+                        try:
+                            speed = float(vehicle.attrib.get("speed") or "")
+                        except ValueError:
+                            speed = None
+                        yield segment, timestep, vehicle.attrib.get("lane") or None, speed
+                    elem.clear()
+            except ET.ParseError:
+                stream.drain()
+                if not splitter.has_more:
+                    raise
+
+
+def read_lane_lengths(net_path: Path) -> Dict[str, float]:
+    """Return lane lengths (m) from a SUMO ``.net.xml``; empty when unavailable."""
+
+    lengths: Dict[str, float] = {}
+    if not net_path.exists():
+        return lengths
+    try:
+        for _, elem in ET.iterparse(net_path, events=("end",)):
+            if elem.tag == "lane":
+                try:
+                    lengths[elem.attrib["id"]] = float(elem.attrib["length"])
+                except (KeyError, ValueError):
+                    pass
+            elif elem.tag == "edge":
+                elem.clear()
+    except ET.ParseError:
+        return {}
+    return lengths
+
+
+def reduce_fcd(
+    path: Path,
+    *,
+    config: FcdReduceConfig,
+    lane_lengths: Optional[Dict[str, float]] = None,
+    segment_starts: Sequence[float] = (),
+) -> FcdLaneAggregates:
+    """Stream an FCD output (csv/xml, optionally gz/zst) into per-lane time-bin aggregates.
+
+    ``segment_starts`` lists the checkpoint times of resumed segments (see
+    :func:`sumo_optimise.batchrun.parsers.parse_tripinfo`).
+    """
+
+    np = _require_numpy()
+    lane_lengths = lane_lengths or {}
+    cutoffs = _segment_cutoffs(segment_starts)
+    samples = _iter_csv_samples(path) if _base_suffix(path) == ".csv" else _iter_xml_samples(path)
+
+    lane_index: Dict[str, int] = {}
+    vehicles: Dict[Tuple[int, int], int] = {}
+    speed_sum: Dict[Tuple[int, int], float] = {}
+    halting: Dict[Tuple[int, int], int] = {}
+    steps_per_bin: Dict[int, int] = {}
+    first_time: Optional[float] = None
+    last_time: Optional[float] = None
+
+    for segment, timestep, lane, speed in samples:
+        if timestep >= _cutoff_for(cutoffs, segment):
+            continue
+        if first_time is None:
+            first_time = timestep
+        bin_idx = int(math.floor((timestep - first_time) / config.bin_seconds))
+        if timestep != last_time:
+            steps_per_bin[bin_idx] = steps_per_bin.get(bin_idx, 0) + 1
+            last_time = timestep
+        if lane is None:
+            continue
+        lane_idx = lane_index.setdefault(lane, len(lane_index))
+        key = (lane_idx, bin_idx)
+        vehicles[key] = vehicles.get(key, 0) + 1
+        if speed is not None:
+            speed_sum[key] = speed_sum.get(key, 0.0) + speed
+            if speed < config.halting_speed:
+                halting[key] = halting.get(key, 0) + 1
+
+    bin_count = (max(steps_per_bin) + 1) if steps_per_bin else 0
+    shape = (len(lane_index), bin_count)
+    counts = np.zeros(shape, dtype=np.float64)
+    speeds = np.zeros(shape, dtype=np.float64)
+    queues = np.zeros(shape, dtype=np.float64)
+    for (lane_idx, bin_idx), count in vehicles.items():
+        counts[lane_idx, bin_idx] = count
+        speeds[lane_idx, bin_idx] = speed_sum.get((lane_idx, bin_idx), 0.0)
+        queues[lane_idx, bin_idx] = halting.get((lane_idx, bin_idx), 0)
+
+    steps = np.array([steps_per_bin.get(idx, 0) for idx in range(bin_count)], dtype=np.float64)
+    steps[steps == 0] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_vehicles = counts / steps
+        mean_speed = np.where(counts > 0, speeds / np.where(counts > 0, counts, 1.0), np.nan)
+        lengths_km = np.array(
+            [lane_lengths.get(lane, math.nan) / 1000.0 for lane in lane_index], dtype=np.float64
+        ).reshape(-1, 1)
+        density = mean_vehicles / lengths_km
+    origin = first_time if first_time is not None else 0.0
+    return FcdLaneAggregates(
+        lanes=list(lane_index),
+        bin_start=origin + np.arange(bin_count, dtype=np.float64) * config.bin_seconds,
+        bin_seconds=config.bin_seconds,
+        vehicles=mean_vehicles.astype(np.float32),
+        density=density.astype(np.float32),
+        mean_speed=mean_speed.astype(np.float32),
+        queue=(queues / steps).astype(np.float32),
+    )
+
+
+def save_fcd_aggregates(path: Path, aggregates: FcdLaneAggregates) -> Path:
+    np = _require_numpy()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as fp:
+        np.savez_compressed(
+            fp,
+            lanes=np.array(aggregates.lanes, dtype=str),
+            bin_start=aggregates.bin_start,
+            bin_seconds=np.array(aggregates.bin_seconds),
+            vehicles=aggregates.vehicles,
+            density=aggregates.density,
+            mean_speed=aggregates.mean_speed,
+            queue=aggregates.queue,
+        )
+    return path
+
+
+def load_fcd_aggregates(path: Path) -> FcdLaneAggregates:
+    np = _require_numpy()
+    with np.load(path) as data:
+        return FcdLaneAggregates(
+            lanes=[str(lane) for lane in data["lanes"]],
+            bin_start=data["bin_start"],
+            bin_seconds=float(data["bin_seconds"]),
+            vehicles=data["vehicles"],
+            density=data["density"],
+            mean_speed=data["mean_speed"],
+            queue=data["queue"],
+        )
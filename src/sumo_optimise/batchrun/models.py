@@ -15,6 +15,9 @@ DEFAULT_SCALE_PROBE_COARSE_STEP = 1.0
 DEFAULT_WARMUP_SECONDS = 1200.0
 DEFAULT_UNSAT_SECONDS = 1200.0
 DEFAULT_SAT_SECONDS = 0.0
+DEFAULT_FCD_BIN_SECONDS = 60.0
+DEFAULT_CHECKPOINT_RESUMES = 2
+DEFAULT_FCD_HALTING_SPEED = 0.1  # m/s, SUMO's default halting threshold
 
 
 class ScaleMode(str, Enum):
@@ -117,6 +120,24 @@ class QueueDurabilityConfig:
     length_threshold: float = DEFAULT_QUEUE_THRESHOLD_LENGTH
 
 
+@dataclass(frozen=True)
+class FcdReduceConfig:
+    enabled: bool = False
+    bin_seconds: float = DEFAULT_FCD_BIN_SECONDS
+    halting_speed: float = DEFAULT_FCD_HALTING_SPEED
+    keep_raw: bool = True
+
+
+@dataclass(frozen=True)
+class CheckpointConfig:
+    period: float = 0.0  # simulation seconds between SUMO state saves; 0 disables checkpointing
+    max_resumes: int = DEFAULT_CHECKPOINT_RESUMES
+
+    @property
+    def enabled(self) -> bool:
+        return self.period > 0
+
+
 @dataclass
 class TripinfoMetrics:
     vehicle_count: int = 0
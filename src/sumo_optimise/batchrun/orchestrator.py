@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import csv
 import gzip
+import hashlib
 import json
 import math
 import multiprocessing
@@ -12,13 +13,15 @@ import subprocess
 import sys
 import threading
 import time
+import zlib
 from contextlib import contextmanager
+from dataclasses import replace
 from datetime import datetime
 import xml.etree.ElementTree as ET
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from queue import Empty
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import Callable, Dict, Iterable, List, Sequence
 
 from sumo_optimise.conversion.domain.models import (
     BuildOptions,
@@ -27,11 +30,14 @@ from sumo_optimise.conversion.domain.models import (
     OutputDirectoryTemplate,
     OutputFileTemplates,
 )
-from sumo_optimise.conversion.pipeline import build_and_persist
+from sumo_optimise.conversion.emitters.conflict_table import CACHE_DIR_ENV as CONFLICT_TABLE_CACHE_ENV
+from sumo_optimise.conversion.pipeline import build_and_persist, build_routes_document
 from sumo_optimise.conversion.utils.constants import SCHEMA_JSON_PATH
-from sumo_optimise.conversion.utils.io import write_sumocfg
+from sumo_optimise.conversion.utils.io import BuildArtifacts, write_sumocfg
+from sumo_optimise.conversion.utils.memo import StageCache, code_fingerprint, digest_file
 
 from .models import (
+    CheckpointConfig,
     DEFAULT_MAX_WORKERS,
     DEFAULT_SAT_SECONDS,
     DEFAULT_UNSAT_SECONDS,
@@ -40,6 +46,7 @@ from .models import (
     OutputCompression,
     OutputFormat,
     DemandFiles,
+    FcdReduceConfig,
     QueueDurabilityConfig,
     QueueDurabilityMetrics,
     RunArtifacts,
@@ -53,6 +60,7 @@ from .models import (
     WorkerPhase,
     WorkerStatus,
 )
+from .fcd import read_lane_lengths, reduce_fcd, save_fcd_aggregates
 # CSV output layout (grouped by scenario inputs → trip stats → queue durability → probe metadata → notes).
 # queue_first_over_saturation_time: first timestep where waiting/running ratio stayed above
 # queue_threshold_length for at least queue_threshold_steps consecutive seconds; blank means durable.
@@ -175,6 +183,20 @@ def _send_status(
     )
 
 
+def _send_bytes(queue, *, worker_id: int, nbytes: int) -> None:
+    """Report bytes added to (or, when negative, removed from) the output tree."""
+
+    if queue is None or not nbytes:
+        return
+    queue.put(
+        {
+            "worker_id": worker_id,
+            "bytes_written": int(nbytes),
+            "timestamp": time.time(),
+        }
+    )
+
+
 def _safe_id_for_filename(scenario_id: str) -> str:
     """Make a scenario identifier safe for file names."""
     safe = re.sub(r"[^A-Za-z0-9._-]+", "_", scenario_id).strip("_")
@@ -249,6 +271,62 @@ def _dir_size_bytes(path: Path) -> int:
     return total
 
 
+def _artifact_bytes(artifacts: RunArtifacts) -> int:
+    total = 0
+    for path in (
+        artifacts.tripinfo,
+        artifacts.personinfo,
+        artifacts.fcd,
+        artifacts.summary,
+        artifacts.person_summary,
+        artifacts.detector,
+        artifacts.queue,
+        artifacts.sumo_log,
+    ):
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+# Plain outputs of the first netconvert step, written next to ``netconvert_plain_prefix``.
+_NETCONVERT_PLAIN_SUFFIXES = (".nod.xml", ".edg.xml", ".con.xml", ".tll.xml", ".typ.xml")
+
+
+def _build_bytes(build_result, *, include_routes: bool) -> int:
+    """Bytes of the files a build wrote, without walking the run directory.
+
+    Stage-cache pickles the build added under ``<output_root>/_stage_cache``
+    are included. ``include_routes=False`` skips a routes file hard-linked
+    from the shared prebuild, whose bytes were already reported once for the
+    whole group.
+    """
+
+    outdir = build_result.manifest_path.parent
+    paths = BuildArtifacts(outdir, context={"id": build_result.run_id}, file_templates=OutputFileTemplates())
+    written = [
+        paths.log_path,
+        paths.manifest_path,
+        paths.nodes_path,
+        paths.edges_path,
+        paths.connections_path,
+        paths.tll_path,
+        paths.network_path,
+        paths.sumocfg_path,
+        *(outdir / f"{paths.netconvert_prefix}{suffix}" for suffix in _NETCONVERT_PLAIN_SUFFIXES),
+    ]
+    if include_routes:
+        written.append(paths.routes_path)
+    total = build_result.cache_bytes_written
+    for path in written:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
 def _render_grid(
     statuses: Dict[int, WorkerStatus],
     *,
@@ -284,14 +362,17 @@ def _render_loop(
     worker_count: int,
     output_root: Path,
     diag_log_path: Path | None = None,
+    size_scan_interval: float | None = None,
 ) -> None:
     statuses: Dict[int, WorkerStatus] = {
         idx: WorkerStatus(worker_id=idx) for idx in range(worker_count)
     }
     last_render = 0.0
     completed = 0
-    last_size_time = 0.0
-    size_display: str | None = None
+    # Workers report bytes as they write artefacts; the optional scan only
+    # reconciles drift (e.g. log appends) and should run rarely on big trees.
+    bytes_total = 0
+    last_scan_time = time.time()
     last_height = 0
     use_tty = sys.stdout.isatty()
     task_start: Dict[int, float] = {}
@@ -319,8 +400,8 @@ def _render_loop(
             parts.append(f"wall_avg {_format_seconds(wall_avg)}")
         else:
             parts.append("wall_avg -")
-        if size_display:
-            parts.append(f"out {size_display}")
+        if bytes_total > 0:
+            parts.append(f"out {_format_bytes(bytes_total)}")
         summary_line = " | ".join(parts)
         grid_text = "".join(rows)
         height = grid_text.count("\n")
@@ -348,6 +429,9 @@ def _render_loop(
             evt = status_queue.get(timeout=0.1)
         except Empty:
             evt = None
+        if evt is not None and "bytes_written" in evt:
+            bytes_total = max(0, bytes_total + int(evt["bytes_written"]))
+            evt = None
         if evt is not None:
             worker_id = int(evt.get("worker_id", -1))
             status = statuses.get(worker_id, WorkerStatus(worker_id=worker_id))
@@ -387,13 +471,12 @@ def _render_loop(
                 except OSError:
                     pass
         now = time.time()
-        if now - last_size_time >= 2.0:
+        if size_scan_interval and now - last_scan_time >= size_scan_interval:
             try:
-                size_bytes = _dir_size_bytes(output_root)
-                size_display = _format_bytes(size_bytes)
+                bytes_total = _dir_size_bytes(output_root)
             except OSError:
-                size_display = None
-            last_size_time = now
+                pass
+            last_scan_time = now
         if now - last_render >= 0.5:
             _render()
             last_render = now
@@ -673,6 +756,9 @@ def _build_options_for_scenario(
         demand=demand_options,
         generate_demand_templates=False,
         network_input=network_input,
+        # Shared across scenarios: runs that only differ in demand scales reuse the
+        # propagated unit OD and the network stages instead of rebuilding them.
+        cache_dir=output_root / STAGE_CACHE_DIR_NAME,
         extra_context={
             "scenario": safe_sid,
             "seed": scenario.seed,
@@ -683,6 +769,94 @@ def _build_options_for_scenario(
     )
 
 
+SHARED_ROUTES_DIR_NAME = "_shared_routes"
+STAGE_CACHE_DIR_NAME = "_stage_cache"
+
+
+def _routes_share_key(scenario: ScenarioConfig) -> str:
+    """Return a key identifying scenarios whose routes files are identical.
+
+    The seed only reaches SUMO through the sumocfg, so it is deliberately
+    excluded; everything that feeds demand generation is included. The spec
+    and demand CSVs enter by content, so editing them in place yields a new
+    key instead of reusing routes a previous batch left in the output root.
+    """
+
+    demand_files = resolve_demand_files(scenario.demand_dir)
+    payload = {
+        "code": code_fingerprint(),
+        "spec": digest_file(Path(scenario.spec)),
+        "demand": [
+            digest_file(path)
+            for path in (
+                demand_files.ped_endpoint,
+                demand_files.ped_junction,
+                demand_files.veh_endpoint,
+                demand_files.veh_junction,
+            )
+        ],
+        "warmup_seconds": scenario.warmup_seconds,
+        "unsat_seconds": scenario.unsat_seconds,
+        "sat_seconds": scenario.sat_seconds,
+        "ped_unsat_scale": scenario.ped_unsat_scale,
+        "ped_sat_scale": scenario.ped_sat_scale,
+        "veh_unsat_scale": scenario.veh_unsat_scale,
+        "veh_sat_scale": scenario.veh_sat_scale,
+        "scale_mode": scenario.scale_mode.value,
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def _group_by_routes_key(scenarios: Sequence[ScenarioConfig]) -> Dict[str, List[int]]:
+    groups: Dict[str, List[int]] = {}
+    for idx, scenario in enumerate(scenarios):
+        try:
+            key = _routes_share_key(scenario)
+        except (OSError, ValueError):
+            # Unreadable inputs: leave the run ungrouped so its own build
+            # reports the failure instead of aborting the whole batch.
+            key = f"ungrouped-{idx}"
+        groups.setdefault(key, []).append(idx)
+    return groups
+
+
+def _shared_routes_path(output_root: Path, key: str) -> Path:
+    return output_root / SHARED_ROUTES_DIR_NAME / f"demandflow.rou_{key}.xml"
+
+
+def _prebuild_shared_routes(scenario: ScenarioConfig, *, output_root: Path) -> tuple[Path, int]:
+    """Build the routes document once for a group of seed runs.
+
+    Returns the routes path and the bytes to report: the routes file plus the
+    stage-cache entries the build wrote.
+    """
+
+    destination = _shared_routes_path(output_root, _routes_share_key(scenario))
+    if destination.exists():
+        return destination, destination.stat().st_size
+    options = _build_options_for_scenario(scenario, output_root=output_root)
+    cache = StageCache(options.cache_dir)
+    demand_xml = build_routes_document(scenario.spec, options, cache=cache)
+    if demand_xml is None:
+        raise ValueError("demand build produced no routes")
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(demand_xml, encoding="utf-8")
+    os.replace(tmp_path, destination)
+    return destination, destination.stat().st_size + cache.bytes_written
+
+
+def _link_shared_routes(source: Path, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        # Cross-device output roots or filesystems without hard links.
+        shutil.copy2(source, destination)
+
+
 def _collect_artifacts(result, *, scenario: ScenarioConfig, label: str, output_format: OutputFormat) -> RunArtifacts:
     if result.manifest_path is None:
         raise ValueError("manifest path not recorded by build")
@@ -759,13 +933,242 @@ def _artifacts_for_label(base: RunArtifacts, label: str | None) -> RunArtifacts:
     )
 
 
+CHECKPOINT_DIR_NAME = "state"
+_STATE_TIME_PATTERN = re.compile(r"^state_([0-9]+(?:\.[0-9]+)?)\.")
+
+
 def _sumo_command(
     artifacts: RunArtifacts,
     scenario: ScenarioConfig,
     *,
     fcd_begin: float,
+    checkpoint: CheckpointConfig | None = None,
+    resume_state: Path | None = None,
+    output_overrides: Dict[str, Path] | None = None,
 ) -> List[str]:
-    return ["sumo", "-c", str(artifacts.sumocfg)]
+    cmd = ["sumo", "-c", str(artifacts.sumocfg)]
+    if checkpoint is not None and checkpoint.enabled:
+        cmd += [
+            "--save-state.period",
+            f"{checkpoint.period:g}",
+            "--save-state.prefix",
+            str(_checkpoint_dir(artifacts) / "state"),
+        ]
+    if resume_state is not None:
+        cmd += ["--load-state", str(resume_state)]
+    for option, path in (output_overrides or {}).items():
+        cmd += [option, str(path)]
+    return cmd
+
+
+def _checkpoint_dir(artifacts: RunArtifacts) -> Path:
+    return artifacts.outdir / CHECKPOINT_DIR_NAME
+
+
+def _segments_record_path(artifacts: RunArtifacts) -> Path:
+    return artifacts.outdir / f"segments_{artifacts.run_id}.json"
+
+
+def _sumo_output_options(artifacts: RunArtifacts) -> Dict[str, Path]:
+    return {
+        "--tripinfo-output": artifacts.tripinfo,
+        "--personinfo-output": artifacts.personinfo,
+        "--fcd-output": artifacts.fcd,
+        "--summary-output": artifacts.summary,
+        "--person-summary-output": artifacts.person_summary,
+    }
+
+
+def _segment_path(path: Path, index: int) -> Path:
+    name = path.name
+    for suffix in (".csv.gz", ".xml.gz", ".csv", ".xml"):
+        if name.endswith(suffix):
+            return path.with_name(f"{name[: -len(suffix)]}.part{index}{suffix}")
+    return path.with_name(f"{name}.part{index}")
+
+
+def _latest_state(artifacts: RunArtifacts, *, exclude: set[Path]) -> tuple[Path, float] | None:
+    candidates: List[tuple[float, Path]] = []
+    state_dir = _checkpoint_dir(artifacts)
+    if not state_dir.exists():
+        return None
+    for path in state_dir.iterdir():
+        match = _STATE_TIME_PATTERN.match(path.name)
+        if match is None or path in exclude or path.stat().st_size == 0:
+            continue
+        candidates.append((float(match.group(1)), path))
+    if not candidates:
+        return None
+    state_time, state_path = max(candidates)
+    return state_path, state_time
+
+
+def _salvage_output(path: Path) -> None:
+    """Cut an interrupted output back to its last complete line so segments can be appended."""
+
+    if not path.exists():
+        return
+    if not path.name.endswith(".gz"):
+        with path.open("rb+") as fp:
+            pos = fp.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(1 << 16, pos)
+                pos -= step
+                fp.seek(pos)
+                newline = fp.read(step).rfind(b"\n")
+                if newline != -1:
+                    fp.truncate(pos + newline + 1)
+                    return
+            fp.truncate(0)
+        return
+
+    # A killed writer leaves an unterminated gzip member; recompress what is readable.
+    tmp = path.with_name(f"{path.name}.salvage")
+    decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = b""
+    with path.open("rb") as src, gzip.open(tmp, "wb") as dst:
+        try:
+            for chunk in iter(lambda: src.read(1 << 20), b""):
+                while chunk:
+                    pending += decomp.decompress(chunk)
+                    chunk = b""
+                    if decomp.eof:
+                        chunk = decomp.unused_data
+                        decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    cut = pending.rfind(b"\n") + 1
+                    if cut:
+                        dst.write(pending[:cut])
+                        pending = pending[cut:]
+        except zlib.error:
+            pass
+    os.replace(tmp, path)
+
+
+def _merge_output_segment(artifacts: RunArtifacts, index: int) -> None:
+    """Append the outputs of resumed segment ``index`` to the main output files."""
+
+    for main in _sumo_output_options(artifacts).values():
+        segment = _segment_path(main, index)
+        if not segment.exists():
+            continue
+        _salvage_output(segment)
+        if not main.exists():
+            segment.replace(main)
+            continue
+        # Plain files concatenate directly; gzip readers accept multi-member streams.
+        with main.open("ab") as dst, segment.open("rb") as src:
+            shutil.copyfileobj(src, dst)
+        segment.unlink()
+
+
+def _prepare_resume(
+    artifacts: RunArtifacts,
+    scenario: ScenarioConfig,
+    *,
+    checkpoint: CheckpointConfig,
+    segment_starts: List[float],
+    tried_states: set[Path],
+) -> List[str] | None:
+    """Merge the interrupted attempt and return the command that resumes from the latest state."""
+
+    if not checkpoint.enabled or len(segment_starts) >= checkpoint.max_resumes:
+        return None
+    index = len(segment_starts)
+    if index:
+        _merge_output_segment(artifacts, index)
+    else:
+        for main in _sumo_output_options(artifacts).values():
+            _salvage_output(main)
+    latest = _latest_state(artifacts, exclude=tried_states)
+    if latest is None:
+        _debug_log(artifacts.sumo_log, "[checkpoint] no saved state available; cannot resume")
+        return None
+    state_path, state_time = latest
+    tried_states.add(state_path)
+    segment_starts.append(state_time)
+    # Record the segment before launching it so a later invocation knows which
+    # partN outputs belong to the run if this worker is killed.
+    _write_segment_starts(artifacts, segment_starts)
+    # Only redirect outputs the run actually writes; overriding others would enable them.
+    overrides = {
+        option: _segment_path(path, index + 1)
+        for option, path in _sumo_output_options(artifacts).items()
+        if path.exists()
+    }
+    _debug_log(
+        artifacts.sumo_log,
+        f"[checkpoint] resuming from {state_path.name} t={state_time:g} segment={index + 1}",
+    )
+    return _sumo_command(
+        artifacts,
+        scenario,
+        fcd_begin=scenario.unsat_begin,
+        checkpoint=checkpoint,
+        resume_state=state_path,
+        output_overrides=overrides,
+    )
+
+
+def _resume_interrupted_run(
+    artifacts: RunArtifacts,
+    scenario: ScenarioConfig,
+    *,
+    checkpoint: CheckpointConfig,
+    segment_starts: List[float],
+    tried_states: set[Path],
+) -> List[str] | None:
+    """Return the command that continues a run an earlier invocation left unfinished.
+
+    A finished run removes its state directory, so saved states found here
+    mean the worker or node died mid-run. Without usable states, or once the
+    resume budget is spent, the run starts over from t=0.
+    """
+
+    if _latest_state(artifacts, exclude=set()) is not None:
+        segment_starts.extend(load_segment_starts(artifacts.outdir, artifacts.run_id))
+        _debug_log(
+            artifacts.sumo_log,
+            f"[checkpoint] found state from an interrupted invocation ({len(segment_starts)} earlier resumes)",
+        )
+        cmd = _prepare_resume(
+            artifacts,
+            scenario,
+            checkpoint=checkpoint,
+            segment_starts=segment_starts,
+            tried_states=tried_states,
+        )
+        if cmd is not None:
+            return cmd
+        segment_starts.clear()
+        tried_states.clear()
+    shutil.rmtree(_checkpoint_dir(artifacts), ignore_errors=True)
+    # A record left by an earlier run would make the parsers drop valid rows.
+    _segments_record_path(artifacts).unlink(missing_ok=True)
+    return None
+
+
+def _write_segment_starts(artifacts: RunArtifacts, segment_starts: List[float]) -> None:
+    _segments_record_path(artifacts).write_text(
+        json.dumps({"segment_starts": segment_starts}, indent=2),
+        encoding="utf-8",
+    )
+
+
+def _finish_checkpointed_run(artifacts: RunArtifacts, segment_starts: List[float]) -> None:
+    if segment_starts:
+        _merge_output_segment(artifacts, len(segment_starts))
+        _write_segment_starts(artifacts, segment_starts)
+    shutil.rmtree(_checkpoint_dir(artifacts), ignore_errors=True)
+
+
+def load_segment_starts(outdir: Path, run_id: str) -> List[float]:
+    """Return the checkpoint times recorded for a resumed run (empty if it never resumed)."""
+
+    path = outdir / f"segments_{run_id}.json"
+    if not path.exists():
+        return []
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return [float(value) for value in payload.get("segment_starts", [])]
 
 
 def _decompress_gz(src: Path) -> Path:
@@ -786,6 +1189,7 @@ def _materialize_metrics_inputs(
     need_tripinfo: bool,
     need_personinfo: bool,
     need_summary: bool,
+    bytes_cb: Callable[[int], None] | None = None,
 ):
     temp_plain: List[Path] = []
 
@@ -811,11 +1215,13 @@ def _materialize_metrics_inputs(
             for path in temp_plain:
                 path.unlink(missing_ok=True)
         elif output_format.compression is OutputCompression.ZST:
-            _compress_artifacts(
+            delta = _compress_artifacts(
                 artifacts,
                 level=output_format.zstd_level,
                 log_path=artifacts.sumo_log,
             )
+            if bytes_cb is not None:
+                bytes_cb(delta)
 
 
 def _run_sumo_streaming(
@@ -1092,6 +1498,50 @@ def _format_scale_label(scale: float) -> str:
     return f"scale_{safe}"
 
 
+def _fcd_aggregate_path(artifacts: RunArtifacts) -> Path:
+    return artifacts.outdir / f"fcd_lanes_{artifacts.run_id}.npz"
+
+
+def _reduce_fcd_artifact(
+    artifacts: RunArtifacts,
+    *,
+    config: FcdReduceConfig,
+    log_path: Path | None,
+    segment_starts: Sequence[float] = (),
+) -> int:
+    """Write per-lane FCD aggregates next to the run outputs; return the net byte change."""
+
+    if not artifacts.fcd.exists():
+        _debug_log(log_path, f"[fcd] no FCD output at {artifacts.fcd.name}; skip reduction")
+        return 0
+    start = time.time()
+    try:
+        aggregates = reduce_fcd(
+            artifacts.fcd,
+            config=config,
+            lane_lengths=read_lane_lengths(artifacts.network),
+            segment_starts=segment_starts,
+        )
+        target = save_fcd_aggregates(_fcd_aggregate_path(artifacts), aggregates)
+    except Exception as exc:  # noqa: BLE001
+        # Keep the raw FCD whenever the reduction did not complete.
+        _debug_log(log_path, f"[fcd] reduction failed ({exc}); raw FCD kept")
+        return 0
+    delta = target.stat().st_size
+    _debug_log(
+        log_path,
+        (
+            f"[fcd] {artifacts.fcd.name} -> {target.name} lanes={len(aggregates.lanes)} "
+            f"bins={len(aggregates.bin_start)} elapsed={time.time() - start:.2f}s bytes={delta}"
+        ),
+    )
+    if not config.keep_raw:
+        delta -= artifacts.fcd.stat().st_size
+        artifacts.fcd.unlink(missing_ok=True)
+        _debug_log(log_path, f"[fcd] dropped raw {artifacts.fcd.name}")
+    return delta
+
+
 def _run_for_scale(
     artifacts: RunArtifacts,
     scenario: ScenarioConfig,
@@ -1113,6 +1563,8 @@ def _run_for_scale(
     metrics_phase: WorkerPhase | None = None,
     metrics_label: str | None = None,
     compute_queue_metrics: bool = True,
+    fcd_reduce: FcdReduceConfig = FcdReduceConfig(),
+    checkpoint: CheckpointConfig = CheckpointConfig(),
 ) -> tuple[TripinfoMetrics, QueueDurabilityMetrics, float | None]:
     artifacts.tripinfo.parent.mkdir(parents=True, exist_ok=True)
     artifacts.personinfo.parent.mkdir(parents=True, exist_ok=True)
@@ -1120,27 +1572,74 @@ def _run_for_scale(
     artifacts.sumo_log.parent.mkdir(parents=True, exist_ok=True)
 
     applied_scale = sumo_scale if sumo_scale is not None else scale
-    cmd = _sumo_command(artifacts, scenario, fcd_begin=scenario.unsat_begin)
-    with artifacts.sumo_log.open("a", encoding="utf-8") as log_fp:
-        log_fp.write(" ".join(cmd) + "\n")
-        log_fp.flush()
-        aborted, live_waiting_metrics = _run_sumo_streaming(
-            cmd,
-            affinity_cpu=affinity_cpu,
-            status_queue=status_queue,
-            worker_id=worker_id,
-            scenario_id=scenario.scenario_id,
-            seed=scenario.seed,
-            phase=phase,
-            scale=scale,
-            use_pty=use_pty,
-            log_file=log_fp,
-            summary_path=artifacts.summary,
-            waiting_config=queue_config if compute_queue_metrics else None,
-            enable_waiting_abort=enable_waiting_abort and compute_queue_metrics,
+    cmd = _sumo_command(
+        artifacts,
+        scenario,
+        fcd_begin=scenario.unsat_begin,
+        checkpoint=checkpoint,
+    )
+    segment_starts: List[float] = []
+    tried_states: set[Path] = set()
+    if checkpoint.enabled:
+        cmd = (
+            _resume_interrupted_run(
+                artifacts,
+                scenario,
+                checkpoint=checkpoint,
+                segment_starts=segment_starts,
+                tried_states=tried_states,
+            )
+            or cmd
         )
+        _checkpoint_dir(artifacts).mkdir(parents=True, exist_ok=True)
+    with artifacts.sumo_log.open("a", encoding="utf-8") as log_fp:
+        while True:
+            log_fp.write(" ".join(cmd) + "\n")
+            log_fp.flush()
+            try:
+                aborted, live_waiting_metrics = _run_sumo_streaming(
+                    cmd,
+                    affinity_cpu=affinity_cpu,
+                    status_queue=status_queue,
+                    worker_id=worker_id,
+                    scenario_id=scenario.scenario_id,
+                    seed=scenario.seed,
+                    phase=phase,
+                    scale=scale,
+                    use_pty=use_pty,
+                    log_file=log_fp,
+                    summary_path=artifacts.summary,
+                    waiting_config=queue_config if compute_queue_metrics else None,
+                    enable_waiting_abort=enable_waiting_abort and compute_queue_metrics,
+                )
+                break
+            except subprocess.CalledProcessError:
+                resume_cmd = _prepare_resume(
+                    artifacts,
+                    scenario,
+                    checkpoint=checkpoint,
+                    segment_starts=segment_starts,
+                    tried_states=tried_states,
+                )
+                if resume_cmd is None:
+                    raise
+                cmd = resume_cmd
+    if checkpoint.enabled:
+        _finish_checkpointed_run(artifacts, segment_starts)
 
     _mark_end(sumo_timing)
+    _send_bytes(status_queue, worker_id=worker_id or 0, nbytes=_artifact_bytes(artifacts))
+    if fcd_reduce.enabled:
+        _send_bytes(
+            status_queue,
+            worker_id=worker_id or 0,
+            nbytes=_reduce_fcd_artifact(
+                artifacts,
+                config=fcd_reduce,
+                log_path=artifacts.sumo_log,
+                segment_starts=segment_starts,
+            ),
+        )
     _send_status(
         status_queue,
         worker_id=worker_id or 0,
@@ -1168,6 +1667,7 @@ def _run_for_scale(
         need_tripinfo=collect_tripinfo,
         need_personinfo=collect_tripinfo,
         need_summary=need_summary,
+        bytes_cb=lambda delta: _send_bytes(status_queue, worker_id=worker_id or 0, nbytes=delta),
     ) as (trip_path, person_path, summary_path):
         if collect_tripinfo and trip_path is not None:
             trip_start = time.time()
@@ -1189,6 +1689,7 @@ def _run_for_scale(
                 end_filter=scenario.unsat_end,
                 personinfo=person_path,
                 progress_cb=_trip_progress if metrics_trace else None,
+                segment_starts=segment_starts,
             )
             if metrics_trace:
                 trip_elapsed = time.time() - trip_start
@@ -1209,6 +1710,7 @@ def _run_for_scale(
                 progress_cb=(
                     (lambda msg: _debug_log(artifacts.sumo_log, msg)) if metrics_trace else None
                 ),
+                segment_starts=segment_starts,
             )
         if scenario.sat_seconds > 0 and (summary_path or artifacts.summary).exists():
             waiting_p95_sat = parse_waiting_percentile(
@@ -1218,6 +1720,7 @@ def _run_for_scale(
                 progress_cb=(
                     (lambda msg: _debug_log(artifacts.sumo_log, msg)) if metrics_trace else None
                 ),
+                segment_starts=segment_starts,
             )
         if metrics_trace and compute_queue_metrics:
             queue_elapsed = time.time() - queue_start
@@ -1526,6 +2029,9 @@ def run_scenario(
     status_queue,
     use_pty: bool,
     metrics_trace: bool = False,
+    shared_routes: Path | None = None,
+    fcd_reduce: FcdReduceConfig = FcdReduceConfig(),
+    checkpoint: CheckpointConfig = CheckpointConfig(),
 ) -> ScenarioResult | None:
     if scale_probe.enabled:
         raise ValueError("Scale probing is not supported with multi-phase scaling; please disable it.")
@@ -1561,13 +2067,29 @@ def run_scenario(
             scenario,
             output_root=output_root,
         )
-        build_result = build_and_persist(scenario.spec, options, task=BuildTask.ALL)
+        if shared_routes is not None:
+            # Routes were built once for every seed sharing these inputs; only
+            # the network and the per-seed sumocfg are produced here.
+            build_result = build_and_persist(
+                scenario.spec,
+                replace(options, demand=None),
+                task=BuildTask.NETWORK,
+            )
+            routes_name = options.output_files.routes.format_map({"id": build_result.run_id})
+            _link_shared_routes(shared_routes, build_result.manifest_path.parent / routes_name)
+        else:
+            build_result = build_and_persist(scenario.spec, options, task=BuildTask.ALL)
         artifacts = _collect_artifacts(
             build_result,
             scenario=scenario,
             label="base",
             output_format=output_format,
         )
+        _send_bytes(
+            status_queue,
+            worker_id=worker_id,
+            nbytes=_build_bytes(build_result, include_routes=shared_routes is None),
+        )
         _mark_end(timings.build)
     except Exception as exc:  # noqa: BLE001
         _mark_end(timings.build)
@@ -1629,6 +2151,8 @@ def run_scenario(
             metrics_phase=WorkerPhase.PARSE,
             metrics_label="post",
             compute_queue_metrics=scale_probe.enabled,
+            fcd_reduce=fcd_reduce,
+            checkpoint=checkpoint,
         )
         if timings.sumo.end is None:
             _mark_end(timings.sumo)
@@ -1697,6 +2221,12 @@ def run_scenario(
     return result
 
 
+def _init_worker(stage_cache_dir: Path) -> None:
+    # The compiled conflict table joins the batch's stage cache; an explicit
+    # $SUMO_OPTIMISE_CACHE_DIR (including an empty one) still wins.
+    os.environ.setdefault(CONFLICT_TABLE_CACHE_ENV, str(stage_cache_dir))
+
+
 def _affinity_plan(count: int) -> List[int | None]:
     cpu_total = os.cpu_count() or 1
     return [(idx % cpu_total) for idx in range(count)]
@@ -1713,6 +2243,9 @@ def run_batch(
     use_pty: bool = False,
     metrics_trace: bool = False,
     output_format: OutputFormat = OutputFormat(),
+    size_scan_interval: float | None = None,
+    fcd_reduce: FcdReduceConfig = FcdReduceConfig(),
+    checkpoint: CheckpointConfig = CheckpointConfig(),
 ) -> None:
     scenario_list = list(scenarios)
     scenario_order = {sc.scenario_id: idx for idx, sc in enumerate(scenario_list)}
@@ -1747,18 +2280,27 @@ def run_batch(
             workers,
             output_root,
             (output_root / "batchrun.log") if metrics_trace else None,
+            size_scan_interval,
         ),
         daemon=True,
     )
     render_thread.start()
 
-    with ProcessPoolExecutor(max_workers=workers) as pool:
+    routes_groups = _group_by_routes_key(scenario_list)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(output_root / STAGE_CACHE_DIR_NAME,),
+    ) as pool:
         futures = {}
-        for idx, scenario in enumerate(scenario_list):
+        prebuild_futures = {}
+
+        def submit_scenario(idx: int, shared_routes: Path | None) -> None:
             worker_slot = idx % workers
             fut = pool.submit(
                 run_scenario,
-                scenario,
+                scenario_list[idx],
                 output_root=output_root,
                 queue_config=queue_config,
                 scale_probe=scale_probe,
@@ -1768,33 +2310,66 @@ def run_batch(
                 status_queue=status_queue,
                 use_pty=use_pty,
                 metrics_trace=metrics_trace,
+                shared_routes=shared_routes,
+                fcd_reduce=fcd_reduce,
+                checkpoint=checkpoint,
             )
             futures[fut] = worker_slot
 
-        for future in as_completed(futures):
-            worker_slot = futures[future]
-            result = future.result()
-            if result is None:
-                continue
-            if result.error is not None:
-                print(
-                    f"[skip] scenario={result.scenario_id} seed={result.seed} error={result.error}"
-                )
-                _send_status(
-                    status_queue,
-                    worker_id=worker_slot,
-                    scenario_id=result.scenario_id,
-                    seed=result.seed,
-                    scale=result.veh_unsat_scale,
-                    affinity_cpu=affinity[worker_slot],
-                    phase=WorkerPhase.ERROR,
-                    label="error",
-                    error=result.error,
-                    done=True,
-                    completed=True,
-                )
+        for indices in routes_groups.values():
+            if len(indices) == 1:
+                submit_scenario(indices[0], None)
                 continue
-            results.append(result)
+            fut = pool.submit(
+                _prebuild_shared_routes,
+                scenario_list[indices[0]],
+                output_root=output_root,
+            )
+            prebuild_futures[fut] = indices
+
+        pending = set(futures) | set(prebuild_futures)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in prebuild_futures:
+                    indices = prebuild_futures.pop(future)
+                    try:
+                        shared_routes, nbytes = future.result()
+                    except Exception as exc:  # noqa: BLE001
+                        # Fall back to per-run builds so each run reports its own error.
+                        print(f"[routes] shared build failed ({exc}); building per run")
+                        shared_routes = None
+                    else:
+                        _send_bytes(status_queue, worker_id=indices[0] % workers, nbytes=nbytes)
+                    before = set(futures)
+                    for idx in indices:
+                        submit_scenario(idx, shared_routes)
+                    pending |= set(futures) - before
+                    continue
+
+                worker_slot = futures[future]
+                result = future.result()
+                if result is None:
+                    continue
+                if result.error is not None:
+                    print(
+                        f"[skip] scenario={result.scenario_id} seed={result.seed} error={result.error}"
+                    )
+                    _send_status(
+                        status_queue,
+                        worker_id=worker_slot,
+                        scenario_id=result.scenario_id,
+                        seed=result.seed,
+                        scale=result.veh_unsat_scale,
+                        affinity_cpu=affinity[worker_slot],
+                        phase=WorkerPhase.ERROR,
+                        label="error",
+                        error=result.error,
+                        done=True,
+                        completed=True,
+                    )
+                    continue
+                results.append(result)
 
     if results:
         results_sorted = sorted(
@@ -1829,7 +2404,9 @@ def _format_error_field(result: ScenarioResult) -> str:
     return "; ".join(errors)
 
 
-def _compress_artifacts(artifacts: RunArtifacts, *, level: int, log_path: Path | None) -> None:
+def _compress_artifacts(artifacts: RunArtifacts, *, level: int, log_path: Path | None) -> int:
+    """Compress run outputs to ``.zst`` and return the net change in bytes on disk."""
+
     try:
         import zstandard as zstd
     except ImportError:
@@ -1850,21 +2427,26 @@ def _compress_artifacts(artifacts: RunArtifacts, *, level: int, log_path: Path |
         artifacts.fcd,
     ]
     cctx = zstd.ZstdCompressor(level=level, threads=1)
+    delta = 0
 
     for src in targets:
         if not src.exists():
             continue
         dst = src.with_suffix(src.suffix + ".zst")
         try:
+            src_size = src.stat().st_size
             with src.open("rb") as rfp, dst.open("wb") as wfp:
                 wfp.write(cctx.compress(rfp.read()))
             src.unlink(missing_ok=True)
+            dst_size = dst.stat().st_size
+            delta += dst_size - src_size
             _debug_log(
                 log_path,
-                f"[compress] {src.name} -> {dst.name} level={level} bytes={dst.stat().st_size}",
+                f"[compress] {src.name} -> {dst.name} level={level} bytes={dst_size}",
             )
         except Exception as exc:  # noqa: BLE001
             _debug_log(log_path, f"[compress] failed {src.name}: {exc}")
+    return delta
 
 
 def _result_to_row(result: ScenarioResult, *, include_probe_columns: bool) -> dict:
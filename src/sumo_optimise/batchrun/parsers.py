@@ -5,7 +5,7 @@ import math
 import xml.etree.ElementTree as ET
 import time
 from pathlib import Path
-from typing import Callable, Optional, List
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from .models import (
     QueueDurabilityConfig,
@@ -23,6 +23,108 @@ def _as_float(value: Optional[str]) -> Optional[float]:
         return None
 
 
+def _segment_cutoffs(segment_starts: Sequence[float]) -> List[float]:
+    """Return the exclusive end time of every output segment.
+
+    A run resumed from a checkpoint appends a new segment that restarts at the
+    checkpoint time, so records of the previous segment at or after that time
+    are superseded and must be ignored.
+    """
+
+    return [float(value) for value in segment_starts] + [math.inf]
+
+
+def _cutoff_for(cutoffs: List[float], segment: int) -> float:
+    # Segments beyond the recorded checkpoints are treated like the final one.
+    return cutoffs[min(segment, len(cutoffs) - 1)]
+
+
+def _iter_csv_segments(path: Path) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield ``(segment, row)``; each repeated header line starts a new segment."""
+
+    with path.open("r", encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            return
+        segment = 0
+        for values in reader:
+            if not values:
+                continue
+            if values == header:
+                segment += 1
+                continue
+            yield segment, dict(zip(header, values))
+
+
+class _XmlDocumentSplitter:
+    """Split concatenated XML documents (resumed SUMO outputs) into separate streams."""
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self._fp = fp
+        self._pending: bytes | None = None
+
+    @property
+    def has_more(self) -> bool:
+        return self._pending is not None
+
+    def documents(self) -> Iterator["_XmlDocumentStream"]:
+        while True:
+            first = self._pending if self._pending is not None else self._fp.readline()
+            self._pending = None
+            if not first:
+                return
+            stream = _XmlDocumentStream(self, first)
+            yield stream
+            stream.drain()
+
+    def _next_line(self) -> bytes:
+        line = self._fp.readline()
+        if line.lstrip().startswith(b"<?xml"):
+            self._pending = line
+            return b""
+        return line
+
+
+class _XmlDocumentStream:
+    def __init__(self, splitter: _XmlDocumentSplitter, first_line: bytes) -> None:
+        self._splitter = splitter
+        self._buffer = first_line
+        self._done = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            line = self._splitter._next_line()
+            if not line:
+                self._done = True
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    def drain(self) -> None:
+        while self.read(1 << 16):
+            pass
+
+
+def _iter_xml_segments(path: Path) -> Iterator[Tuple[int, ET.Element]]:
+    """Yield ``(segment, element)`` end events across concatenated XML documents."""
+
+    with path.open("rb") as fp:
+        splitter = _XmlDocumentSplitter(fp)
+        for segment, stream in enumerate(splitter.documents()):
+            try:
+                for _, elem in ET.iterparse(stream, events=("end",)):
+                    yield segment, elem
+            except ET.ParseError:
+                # An interrupted segment is truncated; later segments carry on from the checkpoint.
+                stream.drain()
+                if not splitter.has_more:
+                    raise
+
+
 def _parse_tripinfo_csv_file(
     path: Path,
     metrics: TripinfoMetrics,
@@ -31,46 +133,47 @@ def _parse_tripinfo_csv_file(
     end_filter: float | None,
     is_person_file: bool,
     progress_cb: Callable[[int, float], None] | None,
+    segment_cutoffs: List[float],
 ) -> None:
     start_time = time.time()
     total_processed = 0
-    with path.open("r", encoding="utf-8", newline="") as fp:
-        reader = csv.DictReader(fp, delimiter=";")
-        for row in reader:
-            arrival = _as_float(row.get("arrival"))
-            depart = _as_float(row.get("depart"))
-            duration = _as_float(row.get("duration"))
-            if arrival is None and depart is not None and duration is not None:
-                arrival = depart + duration
-            if arrival is None or arrival < begin_filter:
-                continue
-            if end_filter is not None and arrival > end_filter:
-                continue
+    for segment, row in _iter_csv_segments(path):
+        arrival = _as_float(row.get("arrival"))
+        depart = _as_float(row.get("depart"))
+        duration = _as_float(row.get("duration"))
+        if arrival is None and depart is not None and duration is not None:
+            arrival = depart + duration
+        if arrival is None or arrival < begin_filter:
+            continue
+        if end_filter is not None and arrival > end_filter:
+            continue
+        if arrival >= _cutoff_for(segment_cutoffs, segment):
+            continue
 
-            if is_person_file:
-                time_loss = _as_float(row.get("timeLoss"))
-                if time_loss is None:
-                    time_loss = _as_float(row.get("walk_timeLoss"))
-                route_length = _as_float(row.get("routeLength"))
-                if route_length is None:
-                    route_length = _as_float(row.get("walk_routeLength"))
-                if time_loss is not None and not math.isnan(time_loss):
-                    metrics.person_time_loss_sum += time_loss
-                if route_length is not None and not math.isnan(route_length):
-                    metrics.person_route_length_sum += route_length
-                metrics.person_count += 1
-            else:
-                time_loss = _as_float(row.get("timeLoss"))
-                if time_loss is not None and not math.isnan(time_loss):
-                    metrics.vehicle_time_loss_sum += time_loss
-                    metrics.vehicle_count += 1
-
-            total_processed += 1
-            if progress_cb:
-                elapsed = time.time() - start_time
-                if elapsed > 0.5:
-                    progress_cb(total_processed, elapsed)
-                    start_time = time.time()
+        if is_person_file:
+            time_loss = _as_float(row.get("timeLoss"))
+            if time_loss is None:
+                time_loss = _as_float(row.get("walk_timeLoss"))
+            route_length = _as_float(row.get("routeLength"))
+            if route_length is None:
+                route_length = _as_float(row.get("walk_routeLength"))
+            if time_loss is not None and not math.isnan(time_loss):
+                metrics.person_time_loss_sum += time_loss
+            if route_length is not None and not math.isnan(route_length):
+                metrics.person_route_length_sum += route_length
+            metrics.person_count += 1
+        else:
+            time_loss = _as_float(row.get("timeLoss"))
+            if time_loss is not None and not math.isnan(time_loss):
+                metrics.vehicle_time_loss_sum += time_loss
+                metrics.vehicle_count += 1
+
+        total_processed += 1
+        if progress_cb:
+            elapsed = time.time() - start_time
+            if elapsed > 0.5:
+                progress_cb(total_processed, elapsed)
+                start_time = time.time()
 
 
 def _parse_tripinfo_xml_file(
@@ -80,11 +183,12 @@ def _parse_tripinfo_xml_file(
     begin_filter: float,
     end_filter: float | None,
     progress_cb: Callable[[int, float], None] | None,
+    segment_cutoffs: List[float],
 ) -> None:
     start_time = time.time()
     processed = 0
     total_processed = 0
-    for _, elem in ET.iterparse(path, events=("end",)):
+    for segment, elem in _iter_xml_segments(path):
         tag = elem.tag.split("}")[-1]
         if tag in {"walk", "ride", "stop", "tranship"}:
             # keep child legs intact so the parent <personinfo> can access their attributes
@@ -114,6 +218,9 @@ def _parse_tripinfo_xml_file(
         if end_filter is not None and arrival > end_filter:
             elem.clear()
             continue
+        if arrival >= _cutoff_for(segment_cutoffs, segment):
+            elem.clear()
+            continue
 
         time_loss = _as_float(elem.attrib.get("timeLoss"))
         route_length = _as_float(elem.attrib.get("routeLength"))
@@ -169,8 +276,10 @@ def parse_tripinfo(
     end_filter: float | None = None,
     personinfo: Path | None = None,
     progress_cb: Callable[[int, float], None] | None = None,
+    segment_starts: Sequence[float] = (),
 ) -> TripinfoMetrics:
     metrics = TripinfoMetrics()
+    cutoffs = _segment_cutoffs(segment_starts)
     paths = [p for p in (path, personinfo) if p is not None]
     if not paths:
         return metrics
@@ -188,6 +297,7 @@ def parse_tripinfo(
                 end_filter=end_filter,
                 is_person_file=is_person_file,
                 progress_cb=progress_cb,
+                segment_cutoffs=cutoffs,
             )
             continue
 
@@ -197,6 +307,7 @@ def parse_tripinfo(
             begin_filter=begin_filter,
             end_filter=end_filter,
             progress_cb=progress_cb,
+            segment_cutoffs=cutoffs,
         )
 
     return metrics
@@ -206,6 +317,7 @@ def _parse_waiting_ratio_csv_file(
     path: Path,
     config: QueueDurabilityConfig,
     progress_cb: Callable[[str], None] | None,
+    segment_cutoffs: List[float],
 ) -> QueueDurabilityMetrics:
     metrics = QueueDurabilityMetrics(
         threshold_steps=config.step_window,
@@ -213,32 +325,32 @@ def _parse_waiting_ratio_csv_file(
     )
     start_time = time.time()
     total_processed = 0
-    with path.open("r", encoding="utf-8", newline="") as fp:
-        reader = csv.DictReader(fp, delimiter=";")
-        streak = 0
-        for row in reader:
-            waiting = _as_float(row.get("waiting")) or 0.0
-            running = _as_float(row.get("running")) or 0.0
-            time_value = _as_float(row.get("time")) or _as_float(row.get("timestep")) or 0.0
+    streak = 0
+    for segment, row in _iter_csv_segments(path):
+        waiting = _as_float(row.get("waiting")) or 0.0
+        running = _as_float(row.get("running")) or 0.0
+        time_value = _as_float(row.get("time")) or _as_float(row.get("timestep")) or 0.0
+        if time_value >= _cutoff_for(segment_cutoffs, segment):
+            continue
 
-            ratio = (waiting / running) if running > 0 else 0.0
-            metrics.max_queue_length = max(metrics.max_queue_length, ratio)
+        ratio = (waiting / running) if running > 0 else 0.0
+        metrics.max_queue_length = max(metrics.max_queue_length, ratio)
 
-            if ratio >= config.length_threshold:
-                streak += 1
-                if metrics.first_failure_time is None and streak >= config.step_window:
-                    metrics.first_failure_time = time_value
-            else:
-                streak = 0
+        if ratio >= config.length_threshold:
+            streak += 1
+            if metrics.first_failure_time is None and streak >= config.step_window:
+                metrics.first_failure_time = time_value
+        else:
+            streak = 0
 
-            total_processed += 1
-            if progress_cb:
-                elapsed = time.time() - start_time
-                if elapsed > 0.5:
-                    progress_cb(
-                        f"[metrics-trace] waiting_ratio steps={total_processed} elapsed={elapsed:.1f}s file={path}"
-                    )
-                    start_time = time.time()
+        total_processed += 1
+        if progress_cb:
+            elapsed = time.time() - start_time
+            if elapsed > 0.5:
+                progress_cb(
+                    f"[metrics-trace] waiting_ratio steps={total_processed} elapsed={elapsed:.1f}s file={path}"
+                )
+                start_time = time.time()
 
     return metrics
 
@@ -248,6 +360,7 @@ def parse_waiting_ratio(
     *,
     config: QueueDurabilityConfig,
     progress_cb: Callable[[str], None] | None = None,
+    segment_starts: Sequence[float] = (),
 ) -> QueueDurabilityMetrics:
     """Determine durability from summary output using waiting/running ratio."""
     metrics = QueueDurabilityMetrics(
@@ -257,14 +370,15 @@ def parse_waiting_ratio(
     if not path.exists():
         return metrics
 
+    cutoffs = _segment_cutoffs(segment_starts)
     if path.suffix.lower() == ".csv":
-        return _parse_waiting_ratio_csv_file(path, config, progress_cb)
+        return _parse_waiting_ratio_csv_file(path, config, progress_cb, cutoffs)
 
     streak = 0
     processed = 0
     total_processed = 0
     start_time = time.time()
-    for _, elem in ET.iterparse(path, events=("end",)):
+    for segment, elem in _iter_xml_segments(path):
         tag = elem.tag.split("}")[-1]
         if tag != "step":
             elem.clear()
@@ -277,6 +391,9 @@ def parse_waiting_ratio(
             or _as_float(elem.attrib.get("timestep"))
             or 0.0
         )
+        if time_value >= _cutoff_for(cutoffs, segment):
+            elem.clear()
+            continue
 
         # Use waiting/running (not waiting/(waiting+running)) to gauge saturation relative to flow.
         ratio = (waiting / running) if running > 0 else 0.0
@@ -359,30 +476,32 @@ def parse_waiting_percentile(
     begin: float,
     end: float,
     progress_cb: Callable[[str], None] | None = None,
+    segment_starts: Sequence[float] = (),
 ) -> float | None:
     """Compute 95th percentile of waiting (vehicle count), trimming top 5% (ceiling) in [begin, end]."""
     if not path.exists() or end <= begin:
         return None
 
+    cutoffs = _segment_cutoffs(segment_starts)
     waiting_values: List[float] = []
     start_time = time.time()
     if path.suffix.lower() == ".csv":
-        with path.open("r", encoding="utf-8", newline="") as fp:
-            reader = csv.DictReader(fp, delimiter=";")
-            for idx, row in enumerate(reader, start=1):
-                time_value = _as_float(row.get("time")) or _as_float(row.get("timestep")) or 0.0
-                if time_value < begin or time_value > end:
-                    continue
-                waiting = _as_float(row.get("waiting"))
-                if waiting is not None and not math.isnan(waiting):
-                    waiting_values.append(waiting)
-                if progress_cb and idx % 50000 == 0:
-                    elapsed = time.time() - start_time
-                    progress_cb(
-                        f"[metrics-trace] waiting_p95 steps={idx} elapsed={elapsed:.1f}s file={path}"
-                    )
+        for idx, (segment, row) in enumerate(_iter_csv_segments(path), start=1):
+            time_value = _as_float(row.get("time")) or _as_float(row.get("timestep")) or 0.0
+            if time_value < begin or time_value > end:
+                continue
+            if time_value >= _cutoff_for(cutoffs, segment):
+                continue
+            waiting = _as_float(row.get("waiting"))
+            if waiting is not None and not math.isnan(waiting):
+                waiting_values.append(waiting)
+            if progress_cb and idx % 50000 == 0:
+                elapsed = time.time() - start_time
+                progress_cb(
+                    f"[metrics-trace] waiting_p95 steps={idx} elapsed={elapsed:.1f}s file={path}"
+                )
     else:
-        for idx, (_, elem) in enumerate(ET.iterparse(path, events=("end",)), start=1):
+        for idx, (segment, elem) in enumerate(_iter_xml_segments(path), start=1):
             tag = elem.tag.split("}")[-1]
             if tag != "step":
                 elem.clear()
@@ -392,7 +511,7 @@ def parse_waiting_percentile(
                 or _as_float(elem.attrib.get("timestep"))
                 or 0.0
             )
-            if time_value < begin or time_value > end:
+            if time_value < begin or time_value > end or time_value >= _cutoff_for(cutoffs, segment):
                 elem.clear()
                 continue
             waiting = _as_float(elem.attrib.get("waiting"))
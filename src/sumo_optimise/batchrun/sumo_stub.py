@@ -0,0 +1,223 @@
+"""Stand-in ``sumo`` executable used to benchmark the batch runner without SUMO.
+
+Invoked as ``sumo -c <config>``, it reads the output paths from the sumocfg,
+prints SUMO-style ``Step #`` progress lines (or replays a recorded stdout file)
+and writes pre-recorded summary/tripinfo CSVs at a configurable step rate. Records are emitted
+in time order (tripinfo on arrival), as SUMO does.
+
+Environment variables:
+
+* ``SUMO_STUB_REFERENCE_DIR``: directory holding ``vehicle_summary.csv``,
+  ``person_summary.csv``, ``vehicle_tripinfo.csv`` and ``person_tripinfo.csv``
+  (default: ``data/reference/csv outputs`` of a source checkout; installed
+  packages must set this or pass ``--reference-dir`` to the benchmark).
+* ``SUMO_STUB_STEP_RATE``: simulated steps per second; ``0`` replays as fast
+  as possible (default: ``0``).
+* ``SUMO_STUB_STDOUT``: optional recorded SUMO stdout to replay instead of the
+  synthesised progress lines.
+* ``SUMO_STUB_FAIL_AT_STEP``: kill the (non-resumed) run at this step to
+  exercise checkpoint resume; ``--save-state.*`` and ``--load-state`` are honoured.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+REFERENCE_DIR_ENV = "SUMO_STUB_REFERENCE_DIR"
+STEP_RATE_ENV = "SUMO_STUB_STEP_RATE"
+STDOUT_ENV = "SUMO_STUB_STDOUT"
+FAIL_AT_STEP_ENV = "SUMO_STUB_FAIL_AT_STEP"
+
+# Only present in a source checkout; see :func:`require_reference_dir`.
+DEFAULT_REFERENCE_DIR = Path(__file__).resolve().parents[3] / "data" / "reference" / "csv outputs"
+
+# sumocfg option -> reference CSV replayed into it.
+_OUTPUT_SOURCES = {
+    "summary-output": "vehicle_summary.csv",
+    "person-summary-output": "person_summary.csv",
+    "tripinfo-output": "vehicle_tripinfo.csv",
+    "personinfo-output": "person_tripinfo.csv",
+}
+
+
+def require_reference_dir(path: Path) -> Path:
+    """Return ``path`` if it is a directory; otherwise exit with a hint on how to point at one."""
+
+    if not path.is_dir():
+        raise SystemExit(
+            f"sumo stub reference directory not found: {path}. "
+            f"Set {REFERENCE_DIR_ENV} or pass --reference-dir to point at the recorded CSV outputs."
+        )
+    return path
+
+
+def _read_config(path: Path) -> Dict[str, str]:
+    root = ET.parse(path).getroot()
+    values: Dict[str, str] = {}
+    for section in root:
+        for option in section:
+            value = option.attrib.get("value")
+            if value is not None:
+                values[option.tag] = value
+    return values
+
+
+def _resolve_output(value: str, base: Path) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else base / path
+
+
+def _open_output(path: Path) -> TextIO:
+    if path.suffix == ".xml" or path.name.endswith(".xml.gz"):
+        raise SystemExit(f"sumo stub only replays CSV outputs: {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return path.open("w", encoding="utf-8", newline="")
+
+
+def _timed_rows(path: Path, time_column: str) -> tuple[str, List[tuple[float, str]]]:
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    if not lines:
+        return "", []
+    header = lines[0]
+    column = header.rstrip("\r\n").split(";").index(time_column)
+    rows: List[tuple[float, str]] = []
+    for line in lines[1:]:
+        try:
+            rows.append((float(line.split(";")[column]), line))
+        except (IndexError, ValueError):
+            continue
+    rows.sort(key=lambda item: item[0])
+    return header, rows
+
+
+def _step_line(step: int) -> str:
+    return (
+        f"Step #{step}.00 (1ms ~= 1000.00*RT, ~1000.00UPS, TraCI: 0ms, "
+        f"vehicles TOT {step} ACT 0 BUF 0)"
+    )
+
+
+def run(
+    config_path: Path,
+    *,
+    reference_dir: Path,
+    step_rate: float,
+    stdout_replay: Optional[Path],
+    output_overrides: Optional[Dict[str, str]] = None,
+    save_state_period: float = 0.0,
+    save_state_prefix: Optional[str] = None,
+    load_state: Optional[Path] = None,
+    fail_at_step: Optional[int] = None,
+) -> int:
+    require_reference_dir(reference_dir)
+    config = _read_config(config_path)
+    config.update(output_overrides or {})
+    base = config_path.parent
+    start_step = int(float(load_state.read_text(encoding="utf-8"))) if load_state is not None else 0
+
+    # option -> (open file, pending rows sorted by time)
+    streams: Dict[str, tuple[TextIO, List[tuple[float, str]]]] = {}
+    step_count = 0
+    for option, source in _OUTPUT_SOURCES.items():
+        time_column = "time" if option.endswith("summary-output") else "arrival"
+        header, rows = _timed_rows(reference_dir / source, time_column)
+        if option.endswith("summary-output") and rows:
+            step_count = max(step_count, int(rows[-1][0]) + 1)
+        if option not in config:
+            continue
+        fp = _open_output(_resolve_output(config[option], base))
+        fp.write(header)
+        streams[option] = (fp, [row for row in rows if row[0] >= start_step])
+    if "fcd-output" in config:
+        fcd_fp = _open_output(_resolve_output(config["fcd-output"], base))
+        fcd_fp.write("timestep_time;vehicle_id;vehicle_x;vehicle_y;vehicle_speed\n")
+        fcd_fp.close()
+
+    replay_lines: List[str] = []
+    if stdout_replay is not None:
+        replay_lines = stdout_replay.read_text(encoding="utf-8", errors="ignore").splitlines()
+        step_count = max(step_count, len(replay_lines))
+
+    interval = 1.0 / step_rate if step_rate > 0 else 0.0
+    next_tick = time.perf_counter()
+    cursors = {option: 0 for option in streams}
+    # SUMO saves at multiples of the period; the first one after a resume is past ``start_step``.
+    next_save = (start_step // save_state_period + 1) * save_state_period if save_state_period > 0 else 0.0
+    for step in range(start_step, step_count):
+        if fail_at_step is not None and load_state is None and step == fail_at_step:
+            # Simulate a killed process: no flush, no close, unterminated gzip members.
+            os._exit(1)
+        for option, (fp, rows) in streams.items():
+            cursor = cursors[option]
+            while cursor < len(rows) and rows[cursor][0] < step + 1:
+                fp.write(rows[cursor][1])
+                cursor += 1
+            cursors[option] = cursor
+        if save_state_period > 0 and save_state_prefix and step >= next_save:
+            while next_save <= step:
+                next_save += save_state_period
+            # Outputs written before a state is saved are on disk when the run is killed later.
+            for fp, _ in streams.values():
+                fp.flush()
+            state_path = Path(f"{save_state_prefix}_{step:.2f}.xbin")
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state_path.write_text(str(step), encoding="utf-8")
+        if replay_lines:
+            if step < len(replay_lines):
+                sys.stdout.write(replay_lines[step] + "\n")
+        else:
+            sys.stdout.write(_step_line(step) + "\r")
+        sys.stdout.flush()
+        if interval:
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    for fp, _ in streams.values():
+        fp.close()
+    sys.stdout.write("\nSimulation ended at time: %d.00\n" % step_count)
+    sys.stdout.flush()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SUMO stand-in for batch runner benchmarks")
+    parser.add_argument("-c", "--configuration-file", dest="config", type=Path, required=True)
+    parser.add_argument("--save-state.period", dest="save_state_period", type=float, default=0.0)
+    parser.add_argument("--save-state.prefix", dest="save_state_prefix")
+    parser.add_argument("--load-state", dest="load_state", type=Path)
+    for option in (*_OUTPUT_SOURCES, "fcd-output"):
+        parser.add_argument(f"--{option}", dest=option.replace("-", "_"))
+    args, _ = parser.parse_known_args(argv)
+
+    overrides = {
+        option: getattr(args, option.replace("-", "_"))
+        for option in (*_OUTPUT_SOURCES, "fcd-output")
+        if getattr(args, option.replace("-", "_")) is not None
+    }
+    stdout_replay = os.environ.get(STDOUT_ENV)
+    fail_at_step = os.environ.get(FAIL_AT_STEP_ENV)
+    return run(
+        args.config,
+        reference_dir=Path(os.environ.get(REFERENCE_DIR_ENV) or DEFAULT_REFERENCE_DIR),
+        step_rate=float(os.environ.get(STEP_RATE_ENV) or 0.0),
+        stdout_replay=Path(stdout_replay) if stdout_replay else None,
+        output_overrides=overrides,
+        save_state_period=args.save_state_period,
+        save_state_prefix=args.save_state_prefix,
+        load_state=args.load_state,
+        fail_at_step=int(fail_at_step) if fail_at_step else None,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,11 @@
 """Public API for the modular corridor pipeline implementation."""
 from .domain.models import OutputDirectoryTemplate, OutputFileTemplates, BuildTask
-from .pipeline import build_and_persist, build_corridor_artifacts, BuildOptions, BuildResult
+from .pipeline import build_and_persist, build_corridor_artifacts, build_many, BuildOptions, BuildResult
 
 __all__ = [
     "build_corridor_artifacts",
     "build_and_persist",
+    "build_many",
     "BuildOptions",
     "BuildResult",
     "OutputDirectoryTemplate",
@@ -46,6 +46,46 @@ def _build_parser(
     else:
         parser.set_defaults(run_netedit=False)
     parser.add_argument("--no-console-log", "-nl", action="store_true", help="Disable console logging")
+    parser.add_argument(
+        "--cache-dir",
+        "-cd",
+        type=Path,
+        help="Directory for the per-stage build cache; unchanged stages are reused across runs (default: disabled)",
+    )
+    parser.add_argument(
+        "--stage-workers",
+        "-sw",
+        type=int,
+        default=1,
+        help="Processes used to run independent build stages (emitters, person/vehicle routes) concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--stream-xml",
+        "-sx",
+        action="store_true",
+        help="Stream the PlainXML documents straight to disk instead of rendering them in memory",
+    )
+    parser.add_argument(
+        "--gzip-xml",
+        "-gz",
+        dest="compress_xml",
+        action="store_true",
+        help="Write gzip-compressed PlainXML documents (file names gain a .gz suffix)",
+    )
+    parser.add_argument(
+        "--gzip-routes",
+        "-gr",
+        dest="compress_routes",
+        action="store_true",
+        help="Write the routes document gzip-compressed (.rou.xml.gz); the sumocfg points at it",
+    )
+    parser.add_argument(
+        "--od-matrix",
+        "-od",
+        dest="write_od_matrix",
+        action="store_true",
+        help="Also write the person/vehicle OD matrices per demand segment as .npz (requires numpy)",
+    )
     parser.add_argument(
         "--output-root",
         "-or",
@@ -110,6 +150,33 @@ def _build_parser(
             default=3600.0,
             help="Simulation end time for person flows (seconds, default: 3600)",
         )
+        parser.add_argument(
+            "--demand-profile",
+            "-dp",
+            type=Path,
+            help="CSV of begin_s,end_s and scale (or ped_scale/veh_scale) windows replacing the single demand window",
+        )
+        parser.add_argument(
+            "--vehicle-routes",
+            "-vr",
+            dest="explicit_vehicle_routes",
+            action="store_true",
+            help="Emit explicit <route> edges per vehicle OD pair instead of letting SUMO route fromJunction/toJunction",
+        )
+        parser.add_argument(
+            "--pedestrian-walks",
+            "-pw",
+            dest="explicit_pedestrian_walks",
+            action="store_true",
+            help="Emit <walk edges> along the pedestrian graph's shortest path instead of <personTrip> per OD pair",
+        )
+        parser.add_argument(
+            "--validate-walks",
+            "-vw",
+            dest="validate_pedestrian_walks",
+            action="store_true",
+            help="Cross-check the emitted pedestrian walks against the assembled net.xml and log mismatches",
+        )
         parser.add_argument(
             "--generate-demand-templates",
             "-gt",
@@ -123,6 +190,10 @@ def _build_parser(
             veh_endpoint_demand=None,
             veh_junction_turn_weight=None,
             demand_sim_end=3600.0,
+            demand_profile=None,
+            explicit_vehicle_routes=False,
+            explicit_pedestrian_walks=False,
+            validate_pedestrian_walks=False,
             generate_demand_templates=False,
         )
 
@@ -214,6 +285,13 @@ def _build_options(
         demand=demand_options,
         generate_demand_templates=args.generate_demand_templates,
         network_input=args.network_input,
+        cache_dir=args.cache_dir,
+        stage_workers=args.stage_workers,
+        stream_xml=args.stream_xml,
+        compress_xml=args.compress_xml,
+        compress_routes=args.compress_routes,
+        write_od_matrix=args.write_od_matrix,
+        validate_pedestrian_walks=args.validate_pedestrian_walks,
     )
 
 
@@ -249,6 +327,9 @@ def _resolve_demand_options(args: argparse.Namespace) -> DemandOptions | None:
         ped_sat_scale=1.0,
         veh_unsat_scale=1.0,
         veh_sat_scale=1.0,
+        demand_profile_csv=args.demand_profile,
+        explicit_vehicle_routes=args.explicit_vehicle_routes,
+        explicit_pedestrian_walks=args.explicit_pedestrian_walks,
     )
 
 
@@ -0,0 +1,118 @@
+"""OD matrices for demand consumers that do not want to parse ``demandflow.rou.xml``."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from ..domain.models import EndpointDemandRow
+from .segments import DemandSegment
+
+OdTuple = Tuple[str, str, float, EndpointDemandRow]
+
+OD_MATRIX_KINDS = ("person", "vehicle")
+
+
+@dataclass(frozen=True)
+class OdMatrix:
+    """Unscaled OD flows of one demand kind over an endpoint index.
+
+    ``cells`` maps ``(origin index, destination index)`` into ``endpoints`` to
+    the flow per hour summed over all demand rows. Segment ``k`` emits
+    ``segments[k][2]`` times that flow between ``segments[k][0]`` and
+    ``segments[k][1]``.
+    """
+
+    endpoints: List[str]
+    cells: Dict[Tuple[int, int], float]
+    segments: List[DemandSegment]
+
+    def dense(self, scale: float = 1.0) -> List[List[float]]:
+        size = len(self.endpoints)
+        matrix = [[0.0] * size for _ in range(size)]
+        for (origin, destination), value in self.cells.items():
+            matrix[origin][destination] = value * scale
+        return matrix
+
+    def total(self) -> float:
+        return sum(self.cells.values())
+
+
+def build_od_matrix(flows: Iterable[OdTuple], segments: Sequence[DemandSegment]) -> OdMatrix:
+    """Collapse OD tuples into an :class:`OdMatrix` indexed by sorted endpoint ids."""
+
+    totals: Dict[Tuple[str, str], float] = {}
+    for origin, destination, value, _ in flows:
+        totals[(origin, destination)] = totals.get((origin, destination), 0.0) + value
+    endpoints = sorted({endpoint for pair in totals for endpoint in pair})
+    index = {endpoint: idx for idx, endpoint in enumerate(endpoints)}
+    cells = {(index[origin], index[destination]): value for (origin, destination), value in totals.items()}
+    return OdMatrix(endpoints=endpoints, cells=cells, segments=list(segments))
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("[DEMAND] numpy not installed; install with `pip install numpy` to write OD matrices")
+    return np
+
+
+def save_od_matrices(path: Path, matrices: Mapping[str, OdMatrix]) -> Path:
+    """Write ``matrices`` (keyed ``person``/``vehicle``) into one compressed ``.npz``.
+
+    Each kind contributes ``<kind>_endpoints``, the ``<kind>_unit`` matrix, the
+    per-segment ``<kind>_flows`` stack (segments x origins x destinations) and
+    ``<kind>_segment_begin/_end/_scale``.
+    """
+
+    np = _require_numpy()
+    arrays = {}
+    for kind, matrix in matrices.items():
+        unit = np.array(matrix.dense(), dtype=np.float64).reshape(len(matrix.endpoints), len(matrix.endpoints))
+        scales = np.array([scale for _, _, scale in matrix.segments], dtype=np.float64)
+        arrays[f"{kind}_endpoints"] = np.array(matrix.endpoints, dtype=str)
+        arrays[f"{kind}_unit"] = unit
+        arrays[f"{kind}_flows"] = scales[:, None, None] * unit
+        arrays[f"{kind}_segment_begin"] = np.array([begin for begin, _, _ in matrix.segments], dtype=np.float64)
+        arrays[f"{kind}_segment_end"] = np.array([end for _, end, _ in matrix.segments], dtype=np.float64)
+        arrays[f"{kind}_segment_scale"] = scales
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as fp:
+        np.savez_compressed(fp, **arrays)
+    return path
+
+
+def load_od_matrices(path: Path) -> Dict[str, OdMatrix]:
+    np = _require_numpy()
+    matrices: Dict[str, OdMatrix] = {}
+    with np.load(path) as data:
+        for kind in OD_MATRIX_KINDS:
+            if f"{kind}_endpoints" not in data:
+                continue
+            unit = data[f"{kind}_unit"]
+            origins, destinations = np.nonzero(unit)
+            matrices[kind] = OdMatrix(
+                endpoints=[str(endpoint) for endpoint in data[f"{kind}_endpoints"]],
+                cells={
+                    (int(origin), int(destination)): float(unit[origin, destination])
+                    for origin, destination in zip(origins, destinations)
+                },
+                segments=[
+                    (float(begin), float(end), float(scale))
+                    for begin, end, scale in zip(
+                        data[f"{kind}_segment_begin"], data[f"{kind}_segment_end"], data[f"{kind}_segment_scale"]
+                    )
+                ],
+            )
+    return matrices
+
+
+__all__ = [
+    "DemandSegment",
+    "OD_MATRIX_KINDS",
+    "OdMatrix",
+    "build_od_matrix",
+    "load_od_matrices",
+    "save_od_matrices",
+]
@@ -1,40 +1,78 @@
 """High-level helpers for personFlow generation."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 from ...domain.models import (
     Cluster,
     DemandOptions,
     Defaults,
     EndpointCatalog,
+    EndpointDemandRow,
     MainRoadConfig,
+    PersonFlowPattern,
 )
 from ...utils.logging import get_logger
+from ..od_matrix import OdMatrix, build_od_matrix
+from ..routes import RouteEntry
+from ..segments import DemandSegment, ProfileWindow, demand_segments
 from .demand_input import load_endpoint_demands, load_junction_turn_weights
 from .flow_propagation import compute_od_flows
-from .graph_builder import build_pedestrian_graph
+from .graph_builder import GraphType, build_pedestrian_graph
+from .identifier import canonical_ped_endpoint_id
 from .route_output import build_person_flow_entries
+from .walks import Walk, compute_pedestrian_walks
 
 LOG = get_logger()
 
 
+@dataclass(frozen=True)
+class PersonUnitOd:
+    """Propagated pedestrian OD flows at scale 1, independent of time windows and scales."""
+
+    pattern: PersonFlowPattern
+    od_flows: List[Tuple[str, str, float, EndpointDemandRow]]
+
+
 @dataclass(frozen=True)
 class PersonRouteResult:
-    entries: List[str]
+    unit_od: PersonUnitOd
+    segments: List[DemandSegment]
+    defaults: Defaults
+    breakpoints: Tuple[int, ...]
+    od_matrix: Optional[OdMatrix] = None
+    # Walks emitted as <walk edges="..."> (empty unless explicit walks were requested).
+    walks: Dict[Tuple[str, str], Walk] = field(default_factory=dict)
 
+    def iter_entries(self) -> Iterator[RouteEntry]:
+        """Yield the personFlow entries in ``begin`` order, rendering one segment at a time."""
 
-def prepare_person_flow_routes(
+        for idx, (begin_time, end_time, scale) in enumerate(self.segments):
+            scaled_flows = [
+                (origin, destination, value * scale, row)
+                for origin, destination, value, row in self.unit_od.od_flows
+            ]
+            for xml in build_person_flow_entries(
+                scaled_flows,
+                ped_pattern=self.unit_od.pattern,
+                begin_time=begin_time,
+                end_time=end_time,
+                segment_tag=f"seg{idx}",
+                endpoint_offset_m=self.defaults.ped_endpoint_offset_m,
+                breakpoints=self.breakpoints,
+                defaults=self.defaults,
+                walks=self.walks,
+            ):
+                yield RouteEntry(begin_time, xml)
+
+
+def compute_person_unit_od(
     *,
     options: DemandOptions,
-    main_road: MainRoadConfig,
-    defaults: Defaults,
-    clusters: Sequence[Cluster],
-    breakpoints: Sequence[int],
-    catalog: EndpointCatalog,
-) -> Optional[PersonRouteResult]:
-    """Generate the personFlow routes document if demand inputs are provided."""
+    graph: GraphType,
+) -> Optional[PersonUnitOd]:
+    """Load the pedestrian CSVs and propagate them over ``graph``, or return ``None`` without inputs."""
 
     ped_endpoint = options.ped_endpoint_csv
     ped_turn_weight_path = options.ped_junction_turn_weight_csv
@@ -46,6 +84,89 @@ def prepare_person_flow_routes(
     LOG.info("loading pedestrian junction turn-weight CSV: %s", ped_turn_weight_path)
     turn_weight_map = load_junction_turn_weights(ped_turn_weight_path)
 
+    LOG.info("propagating %d demand rows across pedestrian network", len(endpoint_rows))
+    od_flows = compute_od_flows(graph, turn_weight_map, endpoint_rows)
+    LOG.info("derived %d OD flows", len(od_flows))
+    return PersonUnitOd(pattern=pattern, od_flows=od_flows)
+
+
+def compute_person_walks(
+    unit_od: Optional[PersonUnitOd],
+    *,
+    options: Optional[DemandOptions],
+    graph: GraphType,
+    defaults: Defaults,
+    breakpoints: Sequence[int],
+) -> Dict[Tuple[str, str], Walk]:
+    """Return the walk per OD pair of ``unit_od``; empty unless explicit walks are requested."""
+
+    if unit_od is None or options is None or not options.explicit_pedestrian_walks:
+        return {}
+    walks = compute_pedestrian_walks(
+        graph,
+        ((origin, destination) for origin, destination, _, _ in unit_od.od_flows),
+        breakpoints=breakpoints,
+        defaults=defaults,
+    )
+    LOG.info("routed %d pedestrian walks on the pedestrian graph", len(walks))
+    return walks
+
+
+def render_person_flow_routes(
+    unit_od: Optional[PersonUnitOd],
+    *,
+    options: DemandOptions,
+    defaults: Defaults,
+    breakpoints: Sequence[int],
+    walks: Optional[Dict[Tuple[str, str], Walk]] = None,
+    profile: Optional[List[ProfileWindow]] = None,
+) -> Optional[PersonRouteResult]:
+    """Scale ``unit_od`` per demand segment; the personFlow entries render on iteration.
+
+    OD pairs found in ``walks`` are emitted as ``<walk>`` instead of ``<personTrip>``.
+    ``profile`` is an already loaded demand profile (see :func:`demand_segments`).
+    """
+
+    if unit_od is None:
+        return None
+    segments = demand_segments(options, kind="ped", profile=profile)
+    walks = walks or {}
+
+    od_matrix = build_od_matrix(
+        (
+            (
+                canonical_ped_endpoint_id(origin, breakpoints),
+                canonical_ped_endpoint_id(destination, breakpoints),
+                value,
+                row,
+            )
+            for origin, destination, value, row in unit_od.od_flows
+        ),
+        segments,
+    )
+    return PersonRouteResult(
+        unit_od=unit_od,
+        segments=segments,
+        defaults=defaults,
+        breakpoints=tuple(breakpoints),
+        od_matrix=od_matrix,
+        walks=dict(walks),
+    )
+
+
+def prepare_person_flow_routes(
+    *,
+    options: DemandOptions,
+    main_road: MainRoadConfig,
+    defaults: Defaults,
+    clusters: Sequence[Cluster],
+    breakpoints: Sequence[int],
+    catalog: EndpointCatalog,
+) -> Optional[PersonRouteResult]:
+    """Generate the personFlow routes document if demand inputs are provided."""
+
+    if not options.ped_endpoint_csv or not options.ped_junction_turn_weight_csv:
+        return None
     LOG.info("building pedestrian graph (nodes=%d, edges=%d)", len(breakpoints), len(breakpoints) - 1)
     graph = build_pedestrian_graph(
         main_road=main_road,
@@ -54,35 +175,18 @@ def prepare_person_flow_routes(
         breakpoints=breakpoints,
         catalog=catalog,
     )
-
-    LOG.info("propagating %d demand rows across pedestrian network", len(endpoint_rows))
-    od_flows = compute_od_flows(graph, turn_weight_map, endpoint_rows)
-    LOG.info("derived %d OD flows", len(od_flows))
-
-    unsat_end = options.warmup_seconds + options.unsat_seconds
-    sat_end = options.simulation_end_time
-    segments = [(0.0, unsat_end, options.ped_unsat_scale)]
-    if options.sat_seconds > 0:
-        segments.append((unsat_end, sat_end, options.ped_sat_scale))
-
-    entries: List[str] = []
-    for idx, (begin_time, end_time, scale) in enumerate(segments):
-        scaled_flows = [
-            (origin, destination, value * scale, row) for origin, destination, value, row in od_flows
-        ]
-        entries.extend(
-            build_person_flow_entries(
-                scaled_flows,
-                ped_pattern=pattern,
-                begin_time=begin_time,
-                end_time=end_time,
-                segment_tag=f"seg{idx}",
-                endpoint_offset_m=defaults.ped_endpoint_offset_m,
-                breakpoints=breakpoints,
-                defaults=defaults,
-            )
-        )
-    return PersonRouteResult(entries=entries)
+    unit_od = compute_person_unit_od(options=options, graph=graph)
+    walks = compute_person_walks(unit_od, options=options, graph=graph, defaults=defaults, breakpoints=breakpoints)
+    return render_person_flow_routes(
+        unit_od, options=options, defaults=defaults, breakpoints=breakpoints, walks=walks
+    )
 
 
-__all__ = ["PersonRouteResult", "prepare_person_flow_routes"]
+__all__ = [
+    "PersonRouteResult",
+    "PersonUnitOd",
+    "compute_person_unit_od",
+    "compute_person_walks",
+    "prepare_person_flow_routes",
+    "render_person_flow_routes",
+]
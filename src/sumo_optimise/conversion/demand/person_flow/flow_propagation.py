@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections import defaultdict, deque
-from typing import Deque, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from ...domain.models import (
     CardinalDirection,
@@ -14,13 +14,16 @@ from ...domain.models import (
 from ...utils.errors import DemandValidationError
 from .graph_builder import GraphType
 from .identifier import parse_main_ped_endpoint_id
+from .pedestrian_graph import as_pedestrian_graph
 
 EPS = 1e-6
 
 
-EdgeRef = Tuple[str, str, int]
+# (previous node, current node, edge), all integer ids of the PedestrianGraph.
+EdgeRef = Tuple[int, int, int]
 Directive = Tuple[CardinalDirection, PedestrianSide]
-StateKey = Tuple[str, Optional[EdgeRef], Optional[Directive]]
+StateKey = Tuple[int, Optional[EdgeRef], Optional[Directive]]
+Neighbor = Tuple[int, int]
 
 TurnWeightMap = Mapping[str, JunctionTurnWeights]
 
@@ -48,15 +51,19 @@ def _is_main_u_turn(origin: str, destination: str) -> bool:
     return origin_pos == dest_pos and origin_half != dest_half
 
 
+def _coord(graph: GraphType, node: int) -> Tuple[float, float]:
+    return graph.coord(node) if graph.has_coord(node) else (0.0, 0.0)
+
+
 def _edge_direction(
     graph: GraphType,
-    from_node: str,
-    to_node: str,
-    edge_data: Mapping[str, object],
+    from_node: int,
+    to_node: int,
+    edge: int,
 ) -> CardinalDirection:
-    orientation = edge_data.get("orientation")
-    fx, fy = graph.nodes[from_node].get("coord", (0.0, 0.0))
-    tx, ty = graph.nodes[to_node].get("coord", (0.0, 0.0))
+    orientation = graph.edge_orientations[edge]
+    fx, fy = _coord(graph, from_node)
+    tx, ty = _coord(graph, to_node)
     if orientation == "EW":
         return CardinalDirection.EAST if tx >= fx else CardinalDirection.WEST
     if orientation == "NS":
@@ -65,7 +72,7 @@ def _edge_direction(
 
 
 def _state_key(
-    node: str,
+    node: int,
     incoming: Optional[EdgeRef],
     directive: Optional[Directive] = None,
 ) -> StateKey:
@@ -88,14 +95,13 @@ def _incoming_travel_direction(
 ) -> Optional[CardinalDirection]:
     if incoming is None:
         return None
-    prev_node, node, key = incoming
-    edge_data = graph[prev_node][node][key]
-    return _edge_direction(graph, prev_node, node, edge_data)
+    prev_node, node, edge = incoming
+    return _edge_direction(graph, prev_node, node, edge)
 
 
 def _main_position_bounds(graph: GraphType) -> Optional[Tuple[int, int]]:
     positions: List[int] = []
-    for node in graph.nodes:
+    for node in graph.node_ids:
         parts = node.split(".")
         if len(parts) == 4 and parts[0] == "Node" and parts[1] == "Main":
             try:
@@ -142,14 +148,20 @@ def _graph_node_for_endpoint(
     return candidate
 
 
+def resolve_graph_node(graph: GraphType, endpoint_id: str) -> str:
+    """Return the graph node an endpoint id (or ``PedEnd.Main`` alias) stands for."""
+
+    return _graph_node_for_endpoint(graph, endpoint_id, _main_position_bounds(graph))
+
+
 def _distribute_with_turn_weights(
     graph: GraphType,
     *,
-    node: str,
-    neighbors: List[Tuple[str, int, Mapping[str, object]]],
+    node: int,
+    neighbors: List[Neighbor],
     incoming: Optional[EdgeRef],
     turn_weights: Optional[JunctionTurnWeights],
-) -> List[Tuple[str, int, float, Optional[Directive]]]:
+) -> List[Tuple[int, int, float, Optional[Directive]]]:
     if incoming is None:
         return _default_distributions(graph, node=node, neighbors=neighbors, incoming=None)
 
@@ -166,12 +178,12 @@ def _distribute_with_turn_weights(
             turn_weights=turn_weights,
         )
 
-    direction_candidates: Dict[CardinalDirection, List[Tuple[str, int, Mapping[str, object]]]] = defaultdict(list)
-    for neighbor, key_edge, edge_data in neighbors:
-        if incoming and neighbor == incoming[0] and key_edge == incoming[2] and node == incoming[1]:
+    direction_candidates: Dict[CardinalDirection, List[Neighbor]] = defaultdict(list)
+    for neighbor, edge in neighbors:
+        if edge == incoming[2]:
             continue  # block U-turns
-        direction = _edge_direction(graph, node, neighbor, edge_data)
-        direction_candidates[direction].append((neighbor, key_edge, edge_data))
+        direction = _edge_direction(graph, node, neighbor, edge)
+        direction_candidates[direction].append((neighbor, edge))
 
     direction_weights = _direction_weights_from_movements(
         direction_candidates=direction_candidates,
@@ -192,14 +204,14 @@ def _distribute_with_turn_weights(
         if total_fallback <= 0.0:
             return _default_distributions(graph, node=node, neighbors=neighbors, incoming=incoming)
         return [
-            (neighbor, key_edge, value / total_fallback, None)
-            for (neighbor, key_edge), value in fallback_direction_weights.items()
+            (neighbor, edge, value / total_fallback, None)
+            for (neighbor, edge), value in fallback_direction_weights.items()
             if value > 0.0
         ]
 
     return [
-        (neighbor, key_edge, value / total_weight, None)
-        for (neighbor, key_edge), value in direction_weights.items()
+        (neighbor, edge, value / total_weight, None)
+        for (neighbor, edge), value in direction_weights.items()
         if value > 0.0
     ]
 
@@ -260,12 +272,12 @@ def _default_pedestrian_movement_weights(approach: str) -> Dict[TurnMovement, fl
 
 def _direction_weights_from_movements(
     *,
-    direction_candidates: Dict[CardinalDirection, List[Tuple[str, int, Mapping[str, object]]]],
+    direction_candidates: Dict[CardinalDirection, List[Neighbor]],
     movement_weights: Dict[TurnMovement, float],
     approach: str,
     incoming_dir: CardinalDirection,
-) -> Dict[Tuple[str, int], float]:
-    direction_weights: Dict[Tuple[str, int], float] = defaultdict(float)
+) -> Dict[Neighbor, float]:
+    direction_weights: Dict[Neighbor, float] = defaultdict(float)
     through_candidates = direction_candidates.get(
         _movement_direction_for_pedestrian(incoming_dir, TurnMovement.THROUGH), []
     )
@@ -283,22 +295,21 @@ def _direction_weights_from_movements(
         if weight <= 0.0:
             continue
         share = weight / len(candidates)
-        for neighbor, key_edge, _ in candidates:
-            direction_weights[(neighbor, key_edge)] += share
+        for candidate in candidates:
+            direction_weights[candidate] += share
 
     if through_bonus > 0.0 and through_candidates:
         share = through_bonus / len(through_candidates)
-        for neighbor, key_edge, _ in through_candidates:
-            direction_weights[(neighbor, key_edge)] += share
+        for candidate in through_candidates:
+            direction_weights[candidate] += share
 
     return direction_weights
 
 
 def _approach_for_pedestrian(graph: GraphType, incoming: EdgeRef) -> str:
     prev_node, _, _ = incoming
-    prev_data = graph.nodes.get(prev_node, {})
-    node_type = str(prev_data.get("node_type", "")).lower()
-    if prev_node.startswith("PedEnd.Minor") or "minor" in node_type:
+    node_type = graph.node_types[prev_node].lower()
+    if graph.node_ids[prev_node].startswith("PedEnd.Minor") or "minor" in node_type:
         return "minor"
     return "main"
 
@@ -306,97 +317,103 @@ def _approach_for_pedestrian(graph: GraphType, incoming: EdgeRef) -> str:
 def _default_distributions(
     graph: GraphType,
     *,
-    node: str,
-    neighbors: List[Tuple[str, int, Mapping[str, object]]],
+    node: int,
+    neighbors: List[Neighbor],
     incoming: Optional[EdgeRef],
-) -> List[Tuple[str, int, float, Optional[Directive]]]:
-    filtered: List[Tuple[str, int, Mapping[str, object]]] = []
-    for neighbor, key_edge, edge_data in neighbors:
-        if incoming and neighbor == incoming[0] and key_edge == incoming[2] and node == incoming[1]:
-            continue
-        filtered.append((neighbor, key_edge, edge_data))
+) -> List[Tuple[int, int, float, Optional[Directive]]]:
+    filtered = [(neighbor, edge) for neighbor, edge in neighbors if not incoming or edge != incoming[2]]
     if not filtered:
         return []
     if incoming:
-        prev_node, current_node, incoming_key = incoming
-        incoming_data = graph[prev_node][current_node][incoming_key]
-        incoming_orientation = incoming_data.get("orientation")
-        incoming_side = incoming_data.get("side")
+        incoming_orientation = graph.edge_orientations[incoming[2]]
+        incoming_side = graph.edge_sides[incoming[2]]
         if incoming_orientation is not None:
             oriented = [
-                (neighbor, key_edge, edge_data)
-                for neighbor, key_edge, edge_data in filtered
-                if edge_data.get("orientation") == incoming_orientation
+                (neighbor, edge)
+                for neighbor, edge in filtered
+                if graph.edge_orientations[edge] == incoming_orientation
             ]
             if oriented:
                 filtered = oriented
                 if incoming_side is not None:
                     same_side = [
-                        (neighbor, key_edge, edge_data)
-                        for neighbor, key_edge, edge_data in filtered
-                        if edge_data.get("side") == incoming_side
+                        (neighbor, edge)
+                        for neighbor, edge in filtered
+                        if graph.edge_sides[edge] == incoming_side
                     ]
                     if same_side:
                         filtered = same_side
     if not filtered:
         return []
     share = 1.0 / len(filtered)
-    return [(neighbor, key_edge, share, None) for neighbor, key_edge, _ in filtered]
+    return [(neighbor, edge, share, None) for neighbor, edge in filtered]
 
 
-def _collect_neighbors(graph: GraphType, node: str) -> List[Tuple[str, int, Mapping[str, object]]]:
-    neighbors: List[Tuple[str, int, Mapping[str, object]]] = []
-    for neighbor in graph.neighbors(node):
-        edge_dict = graph[node][neighbor]
-        for key, data in edge_dict.items():
-            neighbors.append((neighbor, key, data))
-    return neighbors
+class _AbsorbingChain:
+    """Pedestrian walk compiled into an absorbing Markov chain.
 
+    States are ``(node, incoming edge, directive)`` keys. Each state's outgoing
+    shares are derived from the graph once; walkers stop at endpoints and dead
+    ends, which are the absorbing states. Absorption probabilities for all
+    origins are then solved together by eliminating the transient states, so
+    scaling by a demand row's flow is a plain multiply.
+    """
 
-def _propagate_single(
-    graph: GraphType,
-    turn_weight_map: TurnWeightMap,
-    *,
-    source: str,
-    amount: float,
-) -> Dict[str, float]:
-    queue: Deque[StateKey] = deque()
-    pending: MutableMapping[StateKey, float] = defaultdict(float)
-    results: Dict[str, float] = defaultdict(float)
-
-    start_key = _state_key(source, None, None)
-    pending[start_key] = amount
-    queue.append(start_key)
-
-    while queue:
-        key = queue.popleft()
-        node, incoming, directive = key
-        flow = pending.pop(key, 0.0)
-        if flow <= EPS:
-            continue
-
-        node_data = graph.nodes[node]
-        cluster_id = node_data.get("cluster_id")
-        is_endpoint = bool(node_data.get("is_endpoint"))
-
-        if (node != source and is_endpoint) or (node == source and incoming is not None and is_endpoint):
-            results[node] += flow
-            continue
-
-        neighbors = _collect_neighbors(graph, node)
+    def __init__(self, graph: GraphType, turn_weight_map: TurnWeightMap) -> None:
+        self._graph = graph
+        self._turn_weight_map = turn_weight_map
+        self._index: Dict[StateKey, int] = {}
+        self._sinks: List[Optional[str]] = []
+        self._successors: List[Dict[int, float]] = []
+
+    def _state(self, key: StateKey) -> int:
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        pending: Deque[StateKey] = deque([key])
+        self._register(key)
+        while pending:
+            current = pending.popleft()
+            sink, transitions = self._transitions(current)
+            successors: Dict[int, float] = {}
+            for next_key, share in transitions:
+                if next_key not in self._index:
+                    self._register(next_key)
+                    pending.append(next_key)
+                next_index = self._index[next_key]
+                successors[next_index] = successors.get(next_index, 0.0) + share
+            self._sinks[self._index[current]] = sink
+            self._successors[self._index[current]] = successors
+        return self._index[key]
+
+    def _register(self, key: StateKey) -> None:
+        self._index[key] = len(self._sinks)
+        self._sinks.append(None)
+        self._successors.append({})
+
+    def _transitions(self, key: StateKey) -> Tuple[Optional[str], List[Tuple[StateKey, float]]]:
+        graph = self._graph
+        node, incoming, _ = key
+        node_id = graph.node_ids[node]
+        cluster_id = graph.cluster_ids[node]
+        is_endpoint = graph.is_endpoint(node)
+
+        # Endpoints absorb every walker that arrives over an edge; the origin state has no incoming edge.
+        if is_endpoint and incoming is not None:
+            return node_id, []
+
+        neighbors = list(graph.neighbors(node))
         if not neighbors:
             # Dead-end: treat node as endpoint to absorb residual flow.
-            results[node] += flow
-            continue
+            return node_id, []
 
         if cluster_id and not is_endpoint:
-            junction_turn_weights = turn_weight_map.get(cluster_id)
             distributions = _distribute_with_turn_weights(
                 graph,
                 node=node,
                 neighbors=neighbors,
                 incoming=incoming,
-                turn_weights=junction_turn_weights,
+                turn_weights=self._turn_weight_map.get(cluster_id),
             )
             if not distributions:
                 distributions = _default_distributions(
@@ -414,45 +431,119 @@ def _propagate_single(
             )
 
         if not distributions:
-            results[node] += flow
-            continue
+            return node_id, []
+        return None, [
+            (_state_key(neighbor, (node, neighbor, edge), continuation), share)
+            for neighbor, edge, share, continuation in distributions
+        ]
 
-        for neighbor, key_edge, share, continuation in distributions:
-            next_flow = flow * share
-            if next_flow <= EPS:
+    def _arrival_order(self, start: int) -> List[str]:
+        """Absorbing nodes in the order a breadth-first walk from ``start`` reaches them."""
+
+        order: Dict[str, None] = {}
+        seen = {start}
+        queue: Deque[int] = deque([start])
+        while queue:
+            index = queue.popleft()
+            sink = self._sinks[index]
+            if sink is not None:
+                order.setdefault(sink, None)
                 continue
-            edge_ref: EdgeRef = (node, neighbor, key_edge)
-            next_key = _state_key(neighbor, edge_ref, continuation)
-            was_empty = next_key not in pending
-            pending[next_key] = pending.get(next_key, 0.0) + next_flow
-            if was_empty:
-                queue.append(next_key)
-
-    return results
+            for next_index in self._successors[index]:
+                if next_index not in seen:
+                    seen.add(next_index)
+                    queue.append(next_index)
+        return list(order)
+
+    def absorption(self, sources: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Return ``{source: {absorbing node: probability}}`` for walks starting at ``sources``."""
+
+        index = self._graph.index
+        starts = {source: self._state(_state_key(index[source], None, None)) for source in sources}
+
+        # Each transient state carries its shares towards other transient states and the
+        # probability mass it already sends into each absorbing node.
+        pending: Dict[int, Dict[int, float]] = {}
+        absorbed: Dict[int, Dict[str, float]] = {}
+        predecessors: Dict[int, Set[int]] = defaultdict(set)
+        for index, successors in enumerate(self._successors):
+            if self._sinks[index] is not None:
+                continue
+            pending[index] = {}
+            absorbed[index] = defaultdict(float)
+            for next_index, share in successors.items():
+                sink = self._sinks[next_index]
+                if sink is None:
+                    pending[index][next_index] = share
+                    predecessors[next_index].add(index)
+                else:
+                    absorbed[index][sink] += share
+
+        start_indices = set(starts.values())
+        for index in list(pending):
+            if index in start_indices:
+                continue
+            shares = pending.pop(index)
+            mass = absorbed.pop(index)
+            loop = shares.pop(index, 0.0)
+            predecessors[index].discard(index)
+            # Walkers circling back to a state leave it geometrically; a closed loop retains them.
+            scale = 1.0 / (1.0 - loop) if loop < 1.0 - EPS else 0.0
+            for next_index in shares:
+                predecessors[next_index].discard(index)
+            for previous in predecessors.pop(index):
+                weight = pending[previous].pop(index) * scale
+                previous_shares = pending[previous]
+                for next_index, share in shares.items():
+                    previous_shares[next_index] = previous_shares.get(next_index, 0.0) + weight * share
+                    predecessors[next_index].add(previous)
+                previous_mass = absorbed[previous]
+                for sink, share in mass.items():
+                    previous_mass[sink] += weight * share
+
+        results: Dict[str, Dict[str, float]] = {}
+        for source, start in starts.items():
+            sink = self._sinks[start]
+            if sink is not None:
+                results[source] = {sink: 1.0}
+                continue
+            mass = absorbed[start]
+            results[source] = {node: mass[node] for node in self._arrival_order(start) if node in mass}
+        return results
 
 
 def compute_od_flows(
-    graph: GraphType,
+    graph: GraphType | Any,
     turn_weight_map: TurnWeightMap,
     demands: Iterable[EndpointDemandRow],
 ) -> List[Tuple[str, str, float, EndpointDemandRow]]:
     """Compute OD flows for each demand row.
 
-    Returns a list of tuples (origin, destination, flow_per_hour, demand_row).
+    ``graph`` is a :class:`PedestrianGraph`; a NetworkX ``MultiGraph`` with the same
+    attributes is frozen first. Returns a list of tuples
+    (origin, destination, flow_per_hour, demand_row).
     """
 
+    graph = as_pedestrian_graph(graph)
+
     results: List[Tuple[str, str, float, EndpointDemandRow]] = []
     main_bounds = _main_position_bounds(graph)
 
+    rows: List[Tuple[EndpointDemandRow, str]] = []
     for row in demands:
         endpoint_id = row.endpoint_id
         graph_node = _graph_node_for_endpoint(graph, endpoint_id, main_bounds)
         if graph_node not in graph:
             raise DemandValidationError(f"endpoint {endpoint_id!r} not present in pedestrian graph")
-        flow_mag = abs(row.flow_per_hour)
-        if flow_mag <= EPS:
+        if abs(row.flow_per_hour) <= EPS:
             continue
-        raw_map = _propagate_single(graph, turn_weight_map, source=graph_node, amount=flow_mag)
+        rows.append((row, graph_node))
+
+    splits = _AbsorbingChain(graph, turn_weight_map).absorption(node for _, node in rows)
+    for row, graph_node in rows:
+        endpoint_id = row.endpoint_id
+        flow_mag = abs(row.flow_per_hour)
+        raw_map = {node: flow_mag * share for node, share in splits[graph_node].items()}
         if row.flow_per_hour >= 0:
             origin = endpoint_id
             for destination, value in raw_map.items():
@@ -474,4 +565,4 @@ def compute_od_flows(
     return results
 
 
-__all__ = ["compute_od_flows"]
+__all__ = ["compute_od_flows", "resolve_graph_node"]
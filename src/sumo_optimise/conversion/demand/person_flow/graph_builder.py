@@ -2,20 +2,63 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, Iterable, List, Sequence, Set, Tuple
-
-import networkx as nx
+from typing import Any, Dict, List, Sequence, Set, Tuple
 
 from ...builder.ids import cluster_id, main_node_id
 from ...domain.models import EndpointCatalog, PedestrianSide, Cluster, Defaults, MainRoadConfig
 from ...planner.geometry import build_main_carriageway_y
 from .identifier import minor_endpoint_id
+from .pedestrian_graph import EdgeRecord, PedestrianGraph, pack_pedestrian_graph
+
+GraphType = PedestrianGraph
+
+
+class _GraphBuilder:
+    """Mutable staging area mirroring the ``MultiGraph`` calls used while building."""
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._edges: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._adjacency: Dict[str, Dict[str, List[int]]] = {}
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._nodes
+
+    def add_node(self, node_id: str, **attrs: Any) -> None:
+        self._nodes.setdefault(node_id, {}).update(attrs)
+        self._adjacency.setdefault(node_id, {})
+
+    def add_edge(self, u: str, v: str, **attrs: Any) -> None:
+        for node_id in (u, v):
+            if node_id not in self._nodes:
+                self.add_node(node_id)
+        edge = len(self._edges)
+        self._edges.append((u, v, attrs))
+        self._adjacency[u].setdefault(v, []).append(edge)
+        if u != v:
+            self._adjacency[v].setdefault(u, []).append(edge)
 
-GraphType = nx.MultiGraph
+    def degree(self, node_id: str) -> int:
+        return sum(len(edges) for edges in self._adjacency[node_id].values())
+
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def set_endpoint(self, node_id: str) -> None:
+        self._nodes[node_id]["is_endpoint"] = True
+
+    def freeze(self) -> PedestrianGraph:
+        index = {node_id: idx for idx, node_id in enumerate(self._nodes)}
+        edges: List[EdgeRecord] = [(index[u], index[v], attrs) for u, v, attrs in self._edges]
+        adjacency = [
+            [(index[neighbour], edge) for neighbour, keyed in self._adjacency[node_id].items() for edge in keyed]
+            for node_id in self._nodes
+        ]
+        return pack_pedestrian_graph(list(self._nodes.items()), edges, adjacency)
 
 
 def _add_main_nodes(
-    graph: GraphType,
+    graph: _GraphBuilder,
     *,
     breakpoints: Sequence[int],
     y_north: float,
@@ -62,7 +105,7 @@ def _collect_minor_branches(clusters: Sequence[Cluster]) -> Dict[int, Set[str]]:
 
 
 def _add_minor_nodes(
-    graph: GraphType,
+    graph: _GraphBuilder,
     *,
     branches: Dict[int, Set[str]],
     defaults: Defaults,
@@ -96,20 +139,8 @@ def _add_minor_nodes(
                 )
 
 
-def _ensure_node(graph: GraphType, node_id: str) -> None:
-    if node_id not in graph:
-        graph.add_node(
-            node_id,
-            coord=(0.0, 0.0),
-            pos=None,
-            node_type="unknown",
-            cluster_id=None,
-            is_endpoint=True,
-        )
-
-
 def _add_main_correspondence_edges(
-    graph: GraphType,
+    graph: _GraphBuilder,
     *,
     breakpoints: Sequence[int],
 ) -> None:
@@ -121,6 +152,9 @@ def _add_main_correspondence_edges(
         node_e_n = main_node_id(east, "north")
         node_w_s = main_node_id(west, "south")
         node_e_s = main_node_id(east, "south")
+        # Walk rendering maps EW edges to SUMO edges by these positions.
+        for node_id, pos in ((node_w_n, west), (node_e_n, east), (node_w_s, west), (node_e_s, east)):
+            graph.add_node(node_id, pos=pos)
 
         graph.add_edge(
             node_w_n,
@@ -139,7 +173,7 @@ def _add_main_correspondence_edges(
 
 
 def _add_minor_connectors(
-    graph: GraphType,
+    graph: _GraphBuilder,
     *,
     branches: Dict[int, Set[str]],
     defaults: Defaults,
@@ -184,7 +218,7 @@ def _movement_to_side(movement: str) -> PedestrianSide | None:
 
 
 def _add_crosswalks_from_catalog(
-    graph: GraphType,
+    graph: _GraphBuilder,
     *,
     catalog: EndpointCatalog,
     y_north: float,
@@ -225,9 +259,9 @@ def build_pedestrian_graph(
     breakpoints: Sequence[int],
     catalog: EndpointCatalog,
 ) -> GraphType:
-    """Build a MultiGraph capturing pedestrian endpoints and connectors."""
+    """Build the pedestrian graph capturing endpoints and connectors."""
 
-    graph: GraphType = nx.MultiGraph()
+    graph = _GraphBuilder()
     y_north, y_south = build_main_carriageway_y(main_road)
 
     _add_main_nodes(graph, breakpoints=breakpoints, y_north=y_north, y_south=y_south)
@@ -238,11 +272,11 @@ def build_pedestrian_graph(
     _add_crosswalks_from_catalog(graph, catalog=catalog, y_north=y_north, y_south=y_south)
 
     # Mark nodes with degree <= 1 as endpoints if not already flagged.
-    for node, degree in graph.degree():
-        if degree <= 1:
-            graph.nodes[node]["is_endpoint"] = True
+    for node in graph.nodes():
+        if graph.degree(node) <= 1:
+            graph.set_endpoint(node)
 
-    return graph
+    return graph.freeze()
 
 
 __all__ = ["build_pedestrian_graph", "GraphType"]
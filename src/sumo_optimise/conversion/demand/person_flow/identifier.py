@@ -1,7 +1,7 @@
 """Shared helpers for demand-side pedestrian endpoint identifiers."""
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 
 from ...domain.models import PedestrianSide
 
@@ -61,4 +61,34 @@ def parse_main_ped_endpoint_id(endpoint_id: str) -> Optional[Tuple[str, str]]:
     return pos_token, half
 
 
-__all__ = ["minor_endpoint_id", "parse_minor_endpoint_id", "parse_main_ped_endpoint_id"]
+def canonical_ped_endpoint_id(node_id: str, breakpoints: Sequence[int]) -> str:
+    """Map a main-road corner node at either corridor end to its ``PedEnd.Main`` alias."""
+
+    tokens = node_id.split(".")
+    if len(tokens) == 4 and tokens[0] == "Node" and tokens[1] == "Main":
+        try:
+            pos = int(tokens[2])
+        except ValueError:
+            return node_id
+        if not breakpoints:
+            return node_id
+        if pos == breakpoints[0]:
+            anchor = "W_end"
+        elif pos == breakpoints[-1]:
+            anchor = "E_end"
+        else:
+            return node_id
+        half = tokens[3]
+        if half not in {"N", "S"}:
+            return node_id
+        sidewalk = "N_sidewalk" if half == "N" else "S_sidewalk"
+        return f"PedEnd.Main.{anchor}.{sidewalk}"
+    return node_id
+
+
+__all__ = [
+    "canonical_ped_endpoint_id",
+    "minor_endpoint_id",
+    "parse_minor_endpoint_id",
+    "parse_main_ped_endpoint_id",
+]
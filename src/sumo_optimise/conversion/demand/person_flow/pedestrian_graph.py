@@ -0,0 +1,170 @@
+"""Compact, array-backed pedestrian graph.
+
+Nodes are integers ``0..n-1``. Per-node and per-edge attributes live in parallel
+columns: ``array`` buffers for numeric data and tuples for labels. Adjacency is
+stored CSR-style, so ``offsets[i]:offsets[i + 1]`` slices ``adjacent_nodes`` and
+``adjacent_edges`` for node ``i``. Neighbour order matches the insertion order a
+NetworkX ``MultiGraph`` would report, which keeps propagation results stable.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ...domain.models import PedestrianSide
+
+NodeRecord = Tuple[str, Mapping[str, Any]]
+EdgeRecord = Tuple[int, int, Mapping[str, Any]]
+
+
+@dataclass(frozen=True, eq=False)
+class PedestrianGraph:
+    """Frozen pedestrian graph with integer node ids and CSR adjacency."""
+
+    node_ids: Tuple[str, ...]
+    xs: array
+    ys: array
+    positions: Tuple[Optional[int], ...]
+    node_types: Tuple[str, ...]
+    cluster_ids: Tuple[Optional[str], ...]
+    endpoint_flags: bytes
+    node_sides: Tuple[Optional[PedestrianSide], ...]
+    edge_u: array
+    edge_v: array
+    edge_orientations: Tuple[Optional[str], ...]
+    edge_sides: Tuple[Optional[PedestrianSide], ...]
+    edge_lengths: array
+    offsets: array
+    adjacent_nodes: array
+    adjacent_edges: array
+    index: Dict[str, int] = field(repr=False)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.index
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_u)
+
+    def neighbors(self, node: int) -> Iterator[Tuple[int, int]]:
+        """Yield ``(neighbour, edge)`` pairs for ``node``; parallel edges appear once each."""
+
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return zip(self.adjacent_nodes[start:end], self.adjacent_edges[start:end])
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def coord(self, node: int) -> Tuple[float, float]:
+        return self.xs[node], self.ys[node]
+
+    def has_coord(self, node: int) -> bool:
+        return not (math.isnan(self.xs[node]) or math.isnan(self.ys[node]))
+
+    def is_endpoint(self, node: int) -> bool:
+        return bool(self.endpoint_flags[node])
+
+    def endpoint_ids(self) -> List[str]:
+        return [node_id for node_id, flag in zip(self.node_ids, self.endpoint_flags) if flag]
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.edge_u, self.edge_v)
+
+    @classmethod
+    def from_networkx(cls, graph: Any) -> "PedestrianGraph":
+        """Freeze a NetworkX ``MultiGraph`` using the pedestrian attribute names."""
+
+        nodes: List[NodeRecord] = list(graph.nodes(data=True))
+        index = {node_id: idx for idx, (node_id, _) in enumerate(nodes)}
+        edges: List[EdgeRecord] = []
+        edge_ids: Dict[Tuple[str, str, Any], int] = {}
+        adjacency: List[List[Tuple[int, int]]] = [[] for _ in nodes]
+        for node, neighbours in graph.adj.items():
+            for neighbour, keyed in neighbours.items():
+                for key, data in keyed.items():
+                    edge = edge_ids.get((neighbour, node, key))
+                    if edge is None:
+                        edge = len(edges)
+                        edge_ids[(node, neighbour, key)] = edge
+                        edges.append((index[node], index[neighbour], data))
+                    adjacency[index[node]].append((index[neighbour], edge))
+        return pack_pedestrian_graph(nodes, edges, adjacency)
+
+    def to_networkx(self) -> Any:
+        """Export to a NetworkX ``MultiGraph``; intended for debugging only."""
+
+        import networkx as nx
+
+        graph = nx.MultiGraph()
+        for idx, node_id in enumerate(self.node_ids):
+            graph.add_node(
+                node_id,
+                coord=self.coord(idx) if self.has_coord(idx) else None,
+                pos=self.positions[idx],
+                node_type=self.node_types[idx],
+                cluster_id=self.cluster_ids[idx],
+                is_endpoint=self.is_endpoint(idx),
+                side=self.node_sides[idx],
+            )
+        for edge, (u, v) in enumerate(self.edges()):
+            graph.add_edge(
+                self.node_ids[u],
+                self.node_ids[v],
+                orientation=self.edge_orientations[edge],
+                side=self.edge_sides[edge],
+                length=self.edge_lengths[edge],
+            )
+        return graph
+
+
+def pack_pedestrian_graph(
+    nodes: Sequence[NodeRecord],
+    edges: Sequence[EdgeRecord],
+    adjacency: Sequence[Sequence[Tuple[int, int]]],
+) -> PedestrianGraph:
+    """Build a :class:`PedestrianGraph` from attribute records and ordered adjacency lists."""
+
+    coords = [data.get("coord") for _, data in nodes]
+    offsets = array("l", [0])
+    adjacent_nodes = array("l")
+    adjacent_edges = array("l")
+    for neighbours in adjacency:
+        for neighbour, edge in neighbours:
+            adjacent_nodes.append(neighbour)
+            adjacent_edges.append(edge)
+        offsets.append(len(adjacent_nodes))
+    return PedestrianGraph(
+        node_ids=tuple(node_id for node_id, _ in nodes),
+        xs=array("d", (float(coord[0]) if coord is not None else math.nan for coord in coords)),
+        ys=array("d", (float(coord[1]) if coord is not None else math.nan for coord in coords)),
+        positions=tuple(data.get("pos") for _, data in nodes),
+        node_types=tuple(str(data.get("node_type", "")) for _, data in nodes),
+        cluster_ids=tuple(data.get("cluster_id") for _, data in nodes),
+        endpoint_flags=bytes(bool(data.get("is_endpoint")) for _, data in nodes),
+        node_sides=tuple(data.get("side") for _, data in nodes),
+        edge_u=array("l", (u for u, _, _ in edges)),
+        edge_v=array("l", (v for _, v, _ in edges)),
+        edge_orientations=tuple(data.get("orientation") for _, _, data in edges),
+        edge_sides=tuple(data.get("side") for _, _, data in edges),
+        edge_lengths=array("d", (float(data.get("length", 0.0)) for _, _, data in edges)),
+        offsets=offsets,
+        adjacent_nodes=adjacent_nodes,
+        adjacent_edges=adjacent_edges,
+        index={node_id: idx for idx, (node_id, _) in enumerate(nodes)},
+    )
+
+
+def as_pedestrian_graph(graph: Any) -> PedestrianGraph:
+    """Return ``graph`` as a :class:`PedestrianGraph`, freezing NetworkX graphs on the way."""
+
+    if isinstance(graph, PedestrianGraph):
+        return graph
+    return PedestrianGraph.from_networkx(graph)
+
+
+__all__ = ["PedestrianGraph", "as_pedestrian_graph", "pack_pedestrian_graph"]
@@ -230,8 +230,13 @@ def build_person_flow_entries(
     endpoint_offset_m: float,
     breakpoints: Sequence[int],
     defaults: Defaults,
+    walks: Mapping[Tuple[str, str], Sequence[str]] | None = None,
 ) -> List[str]:
-    """Return the list of <personFlow> XML fragments for the supplied OD flows."""
+    """Return the list of <personFlow> XML fragments for the supplied OD flows.
+
+    Pairs found in ``walks`` get a ``<walk edges="...">`` along that edge
+    sequence instead of a ``<personTrip>`` the intermodal router has to solve.
+    """
 
     resolver = EndpointPlacementResolver(
         breakpoints=breakpoints,
@@ -253,11 +258,19 @@ def build_person_flow_entries(
         depart_pos = _clamp_position(depart.length, endpoint_offset_m, at_start=depart.is_start)
         arrival_pos = _clamp_position(arrive.length, endpoint_offset_m, at_start=arrive.is_start)
         pattern_attr = _format_pattern_attribute(ped_pattern, value)
+        walk = walks.get(pair_key) if walks else None
+        if walk:
+            stage = f'    <walk edges="{" ".join(walk)}" arrivalPos="{arrival_pos:.2f}"/>'
+        else:
+            stage = (
+                f'    <personTrip from="{depart.edge_id}" to="{arrive.edge_id}" '
+                f'arrivalPos="{arrival_pos:.2f}"/>'
+            )
 
         entry_lines = [
             f'  <personFlow id="{pf_id}" begin="{begin_time:.2f}" end="{end_time:.2f}" '
             f'departPos="{depart_pos:.2f}" {pattern_attr}>',
-            f'    <personTrip from="{depart.edge_id}" to="{arrive.edge_id}" arrivalPos="{arrival_pos:.2f}"/>',
+            stage,
             "  </personFlow>",
         ]
         entries.append("\n".join(entry_lines))
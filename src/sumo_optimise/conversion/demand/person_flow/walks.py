@@ -0,0 +1,164 @@
+"""Explicit pedestrian walks computed on the demand-side pedestrian graph.
+
+Each OD pair is routed along the shortest path (by edge length) of the
+:class:`PedestrianGraph` and mapped onto SUMO edge ids using the ``pos`` the
+graph builder stores on every main-road node: the north sidewalk runs
+along the eastbound main edge, the south sidewalk along the westbound one, and
+a minor connector along the minor edge its endpoint departs from. Crosswalks
+map to no edge; SUMO walks the junction's crossing between two consecutive
+walk edges on its own.
+"""
+from __future__ import annotations
+
+import heapq
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from xml.etree import ElementTree as ET
+
+from ...builder.ids import main_edge_id
+from ...domain.models import Defaults, PedestrianSide
+from .flow_propagation import resolve_graph_node
+from .identifier import parse_minor_endpoint_id
+from .pedestrian_graph import PedestrianGraph
+from .route_output import EndpointPlacementResolver
+
+Walk = Tuple[str, ...]
+
+_PEDESTRIAN = "pedestrian"
+
+
+def _shortest_path_tree(graph: PedestrianGraph, source: int) -> Dict[int, Optional[Tuple[int, int]]]:
+    """Dijkstra from ``source``; maps each reached node to its ``(parent, edge)`` (``None`` at the root)."""
+
+    parents: Dict[int, Optional[Tuple[int, int]]] = {source: None}
+    best = {source: 0.0}
+    settled: Set[int] = set()
+    heap = [(0.0, source)]
+    while heap:
+        dist, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        for neighbour, edge in graph.neighbors(node):
+            candidate = dist + graph.edge_lengths[edge]
+            if neighbour not in best or candidate < best[neighbour]:
+                best[neighbour] = candidate
+                parents[neighbour] = (node, edge)
+                heapq.heappush(heap, (candidate, neighbour))
+    return parents
+
+
+def _trace(parents: Dict[int, Optional[Tuple[int, int]]], target: int) -> Optional[List[int]]:
+    if target not in parents:
+        return None
+    edges: List[int] = []
+    step = parents[target]
+    while step is not None:
+        node, edge = step
+        edges.append(edge)
+        step = parents[node]
+    edges.reverse()
+    return edges
+
+
+def _main_position(graph: PedestrianGraph, node: int) -> int:
+    pos = graph.positions[node]
+    if pos is None:
+        raise ValueError(f"pedestrian graph node {graph.node_ids[node]} has no main-road position")
+    return pos
+
+
+def _sumo_edge(graph: PedestrianGraph, edge: int, resolver: EndpointPlacementResolver) -> Optional[str]:
+    u, v = graph.edge_u[edge], graph.edge_v[edge]
+    if graph.edge_orientations[edge] == "EW":
+        west, east = sorted((_main_position(graph, u), _main_position(graph, v)))
+        if graph.edge_sides[edge] == PedestrianSide.NORTH_SIDE:
+            return main_edge_id("EB", west, east)
+        return main_edge_id("WB", east, west)
+    for node in (u, v):
+        node_id = graph.node_ids[node]
+        if parse_minor_endpoint_id(node_id):
+            return resolver.resolve_depart(node_id).edge_id
+    return None
+
+
+def compute_pedestrian_walks(
+    graph: PedestrianGraph,
+    pairs: Iterable[Tuple[str, str]],
+    *,
+    breakpoints: Sequence[int],
+    defaults: Defaults,
+) -> Dict[Tuple[str, str], Walk]:
+    """Return the SUMO edge sequence for each ``(origin, destination)`` pair.
+
+    The walk starts on the origin's depart edge and ends on the destination's
+    arrival edge, so it lines up with the ``departPos``/``arrivalPos`` the
+    personFlow emits. Pairs without a path on the graph are left out.
+    """
+
+    resolver = EndpointPlacementResolver(breakpoints=breakpoints, defaults=defaults)
+    trees: Dict[int, Dict[int, Optional[Tuple[int, int]]]] = {}
+    walks: Dict[Tuple[str, str], Walk] = {}
+    for origin, destination in pairs:
+        if (origin, destination) in walks:
+            continue
+        source = graph.index[resolve_graph_node(graph, origin)]
+        target = graph.index[resolve_graph_node(graph, destination)]
+        if source not in trees:
+            trees[source] = _shortest_path_tree(graph, source)
+        path = _trace(trees[source], target)
+        if path is None:
+            continue
+        edges = [resolver.resolve_depart(origin).edge_id]
+        for edge in path:
+            edge_id = _sumo_edge(graph, edge, resolver)
+            if edge_id is not None:
+                edges.append(edge_id)
+        edges.append(resolver.resolve_arrival(destination).edge_id)
+        walks[(origin, destination)] = tuple(
+            edge_id for idx, edge_id in enumerate(edges) if idx == 0 or edge_id != edges[idx - 1]
+        )
+    return walks
+
+
+def _allows_pedestrians(lane: ET.Element) -> bool:
+    allow = lane.get("allow")
+    if allow is not None:
+        return _PEDESTRIAN in allow.split() or "all" in allow.split()
+    return _PEDESTRIAN not in (lane.get("disallow") or "").split()
+
+
+def check_walks_against_net(net_path: Path, walks: Dict[Tuple[str, str], Walk]) -> List[str]:
+    """Cross-check ``walks`` against an assembled ``net.xml``.
+
+    Every walk edge must exist with a lane pedestrians may use, and consecutive
+    edges must meet at a junction. Returns one message per violation.
+    """
+
+    junctions: Dict[str, Tuple[str, str]] = {}
+    walkable: Set[str] = set()
+    for _, element in ET.iterparse(str(net_path)):
+        if element.tag != "edge":
+            continue
+        if element.get("function") is None:
+            edge_id = element.get("id", "")
+            junctions[edge_id] = (element.get("from", ""), element.get("to", ""))
+            if any(_allows_pedestrians(lane) for lane in element.iter("lane")):
+                walkable.add(edge_id)
+        element.clear()
+
+    problems: List[str] = []
+    for (origin, destination), walk in sorted(walks.items()):
+        label = f"{origin} -> {destination}"
+        for edge_id in walk:
+            if edge_id not in junctions:
+                problems.append(f"{label}: edge {edge_id} is missing from the net")
+            elif edge_id not in walkable:
+                problems.append(f"{label}: edge {edge_id} has no pedestrian lane")
+        for prev, edge_id in zip(walk, walk[1:]):
+            if prev in junctions and edge_id in junctions and not set(junctions[prev]) & set(junctions[edge_id]):
+                problems.append(f"{label}: edges {prev} and {edge_id} do not share a junction")
+    return problems
+
+
+__all__ = ["Walk", "check_walks_against_net", "compute_pedestrian_walks"]
@@ -1,47 +1,88 @@
 """Helpers for combining pedestrian and vehicle route fragments."""
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence
+import heapq
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Iterable, Iterator, Sequence, Union
+
+_ROUTES_HEADER = (
+    '<routes xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"',
+    '        xsi:noNamespaceSchemaLocation="http://sumo.dlr.de/xsd/routes_file.xsd">',
+)
+
+
+@dataclass(frozen=True)
+class RouteEntry:
+    """One rendered ``<flow>``/``<personFlow>`` fragment with its numeric ``begin``."""
+
+    begin: float
+    xml: str
+
+
+RouteFragment = Union[RouteEntry, str]
+
+
+def _parse_begin(fragment: str) -> float:
+    """Extract the begin= value of a bare fragment rendered outside the route results."""
+
+    marker = ' begin="'
+    start = fragment.find(marker)
+    if start == -1:
+        return 0.0
+    start += len(marker)
+    end = fragment.find('"', start)
+    if end == -1:
+        return 0.0
+    try:
+        return float(fragment[start:end])
+    except ValueError:
+        return 0.0
+
+
+def _ordered(fragments: Iterable[RouteFragment]) -> Iterable[RouteEntry]:
+    if not isinstance(fragments, Sequence):
+        # Lazily rendered route results yield their segments in time order;
+        # pass them through so no stream is ever held whole.
+        return fragments
+    entries = [
+        fragment if isinstance(fragment, RouteEntry) else RouteEntry(_parse_begin(fragment), fragment)
+        for fragment in fragments
+    ]
+    if any(prev.begin > entry.begin for prev, entry in zip(entries, entries[1:])):
+        entries.sort(key=attrgetter("begin"))
+    return entries
+
+
+def iter_routes_document(
+    *,
+    person_entries: Iterable[RouteFragment] | None,
+    vehicle_entries: Iterable[RouteFragment] | None,
+) -> Iterator[str]:
+    """Yield the routes document line by line, merging both streams by departure.
+
+    Each stream is ordered by ``begin``, so a k-way merge sorts the document
+    without materialising it; iterators (such as a route result's
+    ``iter_entries()``) are consumed as they render. Vehicle flows precede
+    person flows that begin at the same time.
+    """
+
+    yield from _ROUTES_HEADER
+    merged = heapq.merge(_ordered(vehicle_entries or ()), _ordered(person_entries or ()), key=attrgetter("begin"))
+    for entry in merged:
+        yield entry.xml
+    yield "</routes>"
 
 
 def render_routes_document(
     *,
-    person_entries: Sequence[str] | None,
-    vehicle_entries: Sequence[str] | None,
+    person_entries: Iterable[RouteFragment] | None,
+    vehicle_entries: Iterable[RouteFragment] | None,
 ) -> str | None:
-    fragments: List[str] = []
-    if vehicle_entries:
-        fragments.extend(vehicle_entries)
-    if person_entries:
-        fragments.extend(person_entries)
-    if not fragments:
+    lines = list(iter_routes_document(person_entries=person_entries, vehicle_entries=vehicle_entries))
+    if len(lines) == len(_ROUTES_HEADER) + 1:
         return None
-
-    def _begin_time(fragment: str) -> float:
-        """Extract the begin= value so SUMO sees routes sorted by departure."""
-
-        marker = ' begin="'
-        start = fragment.find(marker)
-        if start == -1:
-            return 0.0
-        start += len(marker)
-        end = fragment.find('"', start)
-        if end == -1:
-            return 0.0
-        try:
-            return float(fragment[start:end])
-        except ValueError:
-            return 0.0
-
-    fragments.sort(key=_begin_time)
-
-    lines = [
-        '<routes xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"',
-        '        xsi:noNamespaceSchemaLocation="http://sumo.dlr.de/xsd/routes_file.xsd">',
-        *fragments,
-        "</routes>",
-    ]
     return "\n".join(lines) + "\n"
 
 
-__all__ = ["render_routes_document"]
+__all__ = ["RouteEntry", "iter_routes_document", "render_routes_document"]
@@ -0,0 +1,187 @@
+"""Demand time segments: the unsaturated/saturated windows or a multiplier profile.
+
+A profile CSV (UTF-8, header required) lists time windows in seconds from the
+start of the simulation together with multipliers for the unit OD flows::
+
+    begin_s,end_s,ped_scale,veh_scale
+    0,900,0.4,0.6
+    900,1800,0.4,0.8
+
+A single ``scale`` column applies to both kinds; ``ped_scale``/``veh_scale``
+override it. Windows must be ordered and must not overlap; gaps carry no
+demand. Windows are clipped to the simulation end, and windows that begin at
+or after it are dropped.
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import List, Optional, TextIO, Tuple
+
+from ..domain.models import DemandOptions
+from ..utils.errors import DemandValidationError
+from ..utils.logging import get_logger
+
+LOG = get_logger()
+
+# (begin, end, scale) of one emitted demand window.
+DemandSegment = Tuple[float, float, float]
+ProfileSource = TextIO | Path
+
+_BEGIN_COLUMN = "begin_s"
+_END_COLUMN = "end_s"
+_SCALE_COLUMN = "scale"
+_KIND_SCALE_COLUMNS = {"ped": "ped_scale", "veh": "veh_scale"}
+
+
+@dataclass(frozen=True)
+class ProfileWindow:
+    begin: float
+    end: float
+    ped_scale: float
+    veh_scale: float
+
+    def scale(self, kind: str) -> float:
+        return self.ped_scale if kind == "ped" else self.veh_scale
+
+
+def _parse_float(raw: Optional[str], column: str, index: int, errors: List[str]) -> Optional[float]:
+    token = (raw or "").strip()
+    if not token:
+        errors.append(f"row {index}: {column} is required")
+        return None
+    try:
+        return float(token)
+    except ValueError:
+        errors.append(f"row {index}: {column} must be numeric (got {token!r})")
+        return None
+
+
+def load_demand_profile(source: ProfileSource, *, simulation_end_time: Optional[float] = None) -> List[ProfileWindow]:
+    """Parse a demand profile CSV into ordered :class:`ProfileWindow` entries.
+
+    With ``simulation_end_time``, windows are clipped to it so no flow begins
+    after the simulation ends.
+    """
+
+    if hasattr(source, "read"):
+        stream, should_close = source, False
+    else:
+        stream, should_close = Path(source).open("r", encoding="utf-8-sig", newline=""), True
+    errors: List[str] = []
+    windows: List[ProfileWindow] = []
+    try:
+        reader = csv.DictReader(stream)
+        header = {cell.strip() for cell in (reader.fieldnames or [])}
+        missing = {_BEGIN_COLUMN, _END_COLUMN} - header
+        if missing:
+            errors.append(f"header must contain {', '.join(sorted(missing))}")
+        columns = {
+            kind: column if column in header else _SCALE_COLUMN for kind, column in _KIND_SCALE_COLUMNS.items()
+        }
+        if _SCALE_COLUMN not in header and not set(_KIND_SCALE_COLUMNS.values()) <= header:
+            errors.append("header must contain 'scale' or both 'ped_scale' and 'veh_scale'")
+        if errors:
+            raise DemandValidationError(f"invalid demand profile: {'; '.join(errors)}")
+
+        for index, raw_row in enumerate(reader, start=2):
+            row = {(key or "").strip(): value for key, value in raw_row.items()}
+            begin = _parse_float(row.get(_BEGIN_COLUMN), _BEGIN_COLUMN, index, errors)
+            end = _parse_float(row.get(_END_COLUMN), _END_COLUMN, index, errors)
+            ped = _parse_float(row.get(columns["ped"]), columns["ped"], index, errors)
+            veh = _parse_float(row.get(columns["veh"]), columns["veh"], index, errors)
+            if begin is None or end is None or ped is None or veh is None:
+                continue
+            if end <= begin:
+                errors.append(f"row {index}: end_s must be greater than begin_s")
+                continue
+            if ped < 0 or veh < 0:
+                errors.append(f"row {index}: scales must be non-negative")
+                continue
+            if windows and begin < windows[-1].end:
+                errors.append(f"row {index}: window starts before the previous one ends")
+                continue
+            windows.append(ProfileWindow(begin=begin, end=end, ped_scale=ped, veh_scale=veh))
+    finally:
+        if should_close:
+            stream.close()
+
+    if errors:
+        raise DemandValidationError(f"invalid demand profile: {'; '.join(errors)}")
+    if simulation_end_time is not None:
+        return _clip_windows(windows, simulation_end_time)
+    return windows
+
+
+def _clip_windows(windows: List[ProfileWindow], simulation_end_time: float) -> List[ProfileWindow]:
+    dropped = sum(1 for window in windows if window.begin >= simulation_end_time)
+    clipped = sum(1 for window in windows if window.begin < simulation_end_time < window.end)
+    if dropped or clipped:
+        LOG.warning(
+            "[DEMAND] demand profile runs past the simulation end (%.2f s): dropped %d and clipped %d window(s)",
+            simulation_end_time,
+            dropped,
+            clipped,
+        )
+    return [
+        replace(window, end=min(window.end, simulation_end_time))
+        for window in windows
+        if window.begin < simulation_end_time
+    ]
+
+
+def profile_segments(windows: List[ProfileWindow], kind: str) -> List[DemandSegment]:
+    """Collapse ``windows`` into segments for ``kind``.
+
+    Zero-scale windows emit nothing, and touching windows with the same scale
+    become one segment, so a flat stretch of a 96-slot day costs one flow per
+    OD pair instead of one per slot.
+    """
+
+    segments: List[DemandSegment] = []
+    for window in windows:
+        scale = window.scale(kind)
+        if scale <= 0:
+            continue
+        if segments and segments[-1][1] == window.begin and segments[-1][2] == scale:
+            segments[-1] = (segments[-1][0], window.end, scale)
+        else:
+            segments.append((window.begin, window.end, scale))
+    return segments
+
+
+def demand_segments(
+    options: DemandOptions, *, kind: str, profile: Optional[List[ProfileWindow]] = None
+) -> List[DemandSegment]:
+    """Return the segments ``kind`` (``ped``/``veh``) is emitted over.
+
+    ``profile`` takes windows the caller already loaded (the pipeline parses
+    the profile once per build); otherwise ``options.demand_profile_csv`` is
+    read here. Without a profile this is the unsaturated window (warm-up
+    included) and, if configured, the saturated one.
+    """
+
+    if profile is not None:
+        return profile_segments(profile, kind)
+    if options.demand_profile_csv is not None:
+        windows = load_demand_profile(options.demand_profile_csv, simulation_end_time=options.simulation_end_time)
+        return profile_segments(windows, kind)
+    if kind == "ped":
+        unsat_scale, sat_scale = options.ped_unsat_scale, options.ped_sat_scale
+    else:
+        unsat_scale, sat_scale = options.veh_unsat_scale, options.veh_sat_scale
+    unsat_end = options.warmup_seconds + options.unsat_seconds
+    segments: List[DemandSegment] = [(0.0, unsat_end, unsat_scale)]
+    if options.sat_seconds > 0:
+        segments.append((unsat_end, options.simulation_end_time, sat_scale))
+    return segments
+
+
+__all__ = [
+    "DemandSegment",
+    "ProfileWindow",
+    "demand_segments",
+    "load_demand_profile",
+    "profile_segments",
+]
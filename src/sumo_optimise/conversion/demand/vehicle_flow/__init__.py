@@ -1,8 +1,8 @@
 """Vehicle demand routing orchestration."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Sequence
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 from ...domain.models import (
     Cluster,
@@ -11,34 +11,83 @@ from ...domain.models import (
     EndpointCatalog,
     EndpointDemandRow,
     MainRoadConfig,
+    NetworkEdge,
+    PersonFlowPattern,
+    VehicleConnection,
 )
 from ...utils.logging import get_logger
+from ..od_matrix import OdMatrix, build_od_matrix
+from ..routes import RouteEntry
+from ..segments import DemandSegment, ProfileWindow, demand_segments
 from .demand_input import load_vehicle_endpoint_demands, load_vehicle_turn_weights
 from .flow_propagation import compute_vehicle_od_flows
-from .reachability import VehicleOdFlowRecord, evaluate_vehicle_od_reachability
-from .route_output import build_vehicle_flow_entries
+from .reachability import Route, VehicleOdFlowRecord, evaluate_vehicle_od_reachability
+from .route_output import build_vehicle_flow_entries, build_vehicle_route_entries
 from .topology import build_vehicle_network
 
 LOG = get_logger()
 
 
+@dataclass(frozen=True)
+class VehicleUnitOd:
+    """Reachable vehicle OD flows at scale 1, independent of time windows and scales."""
+
+    pattern: PersonFlowPattern
+    reachable_flows: List[Tuple[str, str, float, EndpointDemandRow]]
+    unreachable_od_pairs: List[VehicleOdFlowRecord]
+    routes: Dict[Tuple[str, str], Route] = field(default_factory=dict)
+
+
 @dataclass(frozen=True)
 class VehicleRouteResult:
-    entries: List[str]
+    unit_od: VehicleUnitOd
+    segments: List[DemandSegment]
     unreachable_od_pairs: List[VehicleOdFlowRecord]
+    od_matrix: Optional[OdMatrix] = None
+    explicit_routes: bool = False
 
+    def iter_entries(self) -> Iterator[RouteEntry]:
+        """Yield the route and flow entries in ``begin`` order, rendering one segment at a time."""
 
-def prepare_vehicle_routes(
+        unit_od = self.unit_od
+        routed_pairs: Dict[Tuple[str, str], Route] = {}
+        if self.explicit_routes:
+            routed_pairs = {
+                (origin, destination): unit_od.routes[(origin, destination)]
+                for origin, destination, _, _ in unit_od.reachable_flows
+                if (origin, destination) in unit_od.routes
+            }
+            # Route definitions precede every flow that references them.
+            for xml in build_vehicle_route_entries(routed_pairs):
+                yield RouteEntry(float("-inf"), xml)
+        for idx, (begin_time, end_time, scale) in enumerate(self.segments):
+            scaled = [
+                (origin, destination, value * scale, row)
+                for origin, destination, value, row in unit_od.reachable_flows
+            ]
+            for xml in build_vehicle_flow_entries(
+                scaled,
+                vehicle_pattern=unit_od.pattern,
+                begin_time=begin_time,
+                end_time=end_time,
+                segment_tag=f"seg{idx}",
+                routed_pairs=routed_pairs,
+            ):
+                yield RouteEntry(begin_time, xml)
+
+
+def compute_vehicle_unit_od(
     *,
     options: DemandOptions,
-    main_road: MainRoadConfig,
-    defaults: Defaults,
-    clusters: Sequence[Cluster],
     breakpoints: Sequence[int],
-    catalog: EndpointCatalog,
-    edges_xml: str,
-    connections_xml: str,
-) -> VehicleRouteResult | None:
+    clusters: Sequence[Cluster],
+    edges_xml: Optional[str] = None,
+    connections_xml: Optional[str] = None,
+    edges: Optional[Sequence[NetworkEdge]] = None,
+    connections: Optional[Sequence[VehicleConnection]] = None,
+) -> VehicleUnitOd | None:
+    """Load the vehicle CSVs, propagate them and drop OD pairs the network cannot route."""
+
     veh_endpoint = options.veh_endpoint_csv
     veh_turn_weights = options.veh_junction_turn_weight_csv
     if not veh_endpoint or not veh_turn_weights:
@@ -52,6 +101,8 @@ def prepare_vehicle_routes(
         od_flows,
         edges_xml=edges_xml,
         connections_xml=connections_xml,
+        edges=edges,
+        connections=connections,
     )
     if reachability.unreachable:
         LOG.warning(
@@ -67,31 +118,63 @@ def prepare_vehicle_routes(
                 _describe_row(record.row),
             )
 
-    unsat_end = options.warmup_seconds + options.unsat_seconds
-    sat_end = options.simulation_end_time
-    segments = [(0.0, unsat_end, options.veh_unsat_scale)]
-    if options.sat_seconds > 0:
-        segments.append((unsat_end, sat_end, options.veh_sat_scale))
-
     reachable_flows = [
         (rec.origin, rec.destination, rec.value, rec.row) for rec in reachability.reachable
     ]
-    entries: List[str] = []
-    for idx, (begin_time, end_time, scale) in enumerate(segments):
-        scaled = [
-            (origin, destination, value * scale, row)
-            for origin, destination, value, row in reachable_flows
-        ]
-        entries.extend(
-            build_vehicle_flow_entries(
-                scaled,
-                vehicle_pattern=pattern,
-                begin_time=begin_time,
-                end_time=end_time,
-                segment_tag=f"seg{idx}",
-            )
-        )
-    return VehicleRouteResult(entries=entries, unreachable_od_pairs=reachability.unreachable)
+    return VehicleUnitOd(
+        pattern=pattern,
+        reachable_flows=reachable_flows,
+        unreachable_od_pairs=reachability.unreachable,
+        routes=reachability.routes,
+    )
+
+
+def render_vehicle_routes(
+    unit_od: Optional[VehicleUnitOd],
+    *,
+    options: DemandOptions,
+    profile: Optional[List[ProfileWindow]] = None,
+) -> VehicleRouteResult | None:
+    """Scale ``unit_od`` per demand segment; the vehicle flow entries render on iteration.
+
+    ``profile`` is an already loaded demand profile (see :func:`demand_segments`).
+    """
+
+    if unit_od is None:
+        return None
+    segments = demand_segments(options, kind="veh", profile=profile)
+    return VehicleRouteResult(
+        unit_od=unit_od,
+        segments=segments,
+        unreachable_od_pairs=unit_od.unreachable_od_pairs,
+        od_matrix=build_od_matrix(unit_od.reachable_flows, segments),
+        explicit_routes=options.explicit_vehicle_routes,
+    )
+
+
+def prepare_vehicle_routes(
+    *,
+    options: DemandOptions,
+    main_road: MainRoadConfig,
+    defaults: Defaults,
+    clusters: Sequence[Cluster],
+    breakpoints: Sequence[int],
+    catalog: EndpointCatalog,
+    edges_xml: Optional[str] = None,
+    connections_xml: Optional[str] = None,
+    edges: Optional[Sequence[NetworkEdge]] = None,
+    connections: Optional[Sequence[VehicleConnection]] = None,
+) -> VehicleRouteResult | None:
+    unit_od = compute_vehicle_unit_od(
+        options=options,
+        breakpoints=breakpoints,
+        clusters=clusters,
+        edges_xml=edges_xml,
+        connections_xml=connections_xml,
+        edges=edges,
+        connections=connections,
+    )
+    return render_vehicle_routes(unit_od, options=options)
 
 
 def _describe_row(row: EndpointDemandRow) -> str:
@@ -104,4 +187,10 @@ def _describe_row(row: EndpointDemandRow) -> str:
     return ", ".join(tokens)
 
 
-__all__ = ["prepare_vehicle_routes", "VehicleRouteResult"]
+__all__ = [
+    "VehicleRouteResult",
+    "VehicleUnitOd",
+    "compute_vehicle_unit_od",
+    "prepare_vehicle_routes",
+    "render_vehicle_routes",
+]
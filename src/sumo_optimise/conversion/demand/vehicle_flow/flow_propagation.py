@@ -1,9 +1,9 @@
 """Propagate vehicle endpoint demand across the linear corridor."""
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Deque, Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from ...domain.models import CardinalDirection, EndpointDemandRow, JunctionTurnWeights, TurnMovement
 from ...utils.errors import DemandValidationError
@@ -42,6 +42,8 @@ def compute_vehicle_od_flows(
             f"missing vehicle turn-weight rows for: {missing_list}"
         )
 
+    table = _TransferTable(network, turn_weights)
+    propagated: Dict[Tuple[str, float], Dict[str, float]] = {}
     results: List[Tuple[str, str, float, EndpointDemandRow]] = []
     for row in rows:
         canonical_id = canonicalize_vehicle_endpoint(
@@ -56,7 +58,10 @@ def compute_vehicle_od_flows(
         if not initial_states:
             raise DemandValidationError(f"unsupported vehicle endpoint identifier: {row.endpoint_id}")
 
-        od_map = _propagate(initial_states, amount, network=network, turn_weights=turn_weights)
+        od_map = propagated.get((canonical_id, amount))
+        if od_map is None:
+            od_map = table.propagate(initial_states, amount)
+            propagated[(canonical_id, amount)] = od_map
         if row.flow_per_hour >= 0:
             for destination, value in od_map.items():
                 if value <= 0.0 or destination == canonical_id:
@@ -97,38 +102,54 @@ def _initial_states(endpoint_id: str, network: VehicleNetwork) -> List[VehicleSt
     return []
 
 
-def _propagate(
-    initial_states: List[VehicleState],
-    amount: float,
-    *,
-    network: VehicleNetwork,
-    turn_weights: VehicleTurnMap,
-) -> Dict[str, float]:
-    queue: Deque[Tuple[VehicleState, float]] = deque((state, amount) for state in initial_states)
-    od_map: Dict[str, float] = defaultdict(float)
+# One compiled step out of a state: (share, destination endpoint, next state).
+_TransferStep = Tuple[float, Optional[str], Optional[VehicleState]]
 
-    while queue:
-        state, flow = queue.popleft()
-        if flow <= 0.0:
-            continue
 
-        shares = _compute_shares(state, network=network, turn_weights=turn_weights)
-        if not shares:
-            continue
+class _TransferTable:
+    """Per-cluster, per-approach share table for the linear corridor.
 
-        for direction, share in shares.items():
-            portion = flow * share
-            if portion <= 0.0:
-                continue
-            destination = _destination_for(state.pos, direction, network)
-            if destination is not None:
-                od_map[destination] += portion
-                continue
-            next_state = _advance_state(state, direction, network)
-            if next_state is not None:
-                queue.append((next_state, portion))
-
-    return od_map
+    Each state's shares, exits and onward state are derived once. Propagating a
+    row then walks the eastbound and westbound chains in lock step, carrying a
+    running product of shares; the multiplications happen in the same order as
+    the original queue walk, so OD values are bit-for-bit unchanged.
+    """
+
+    def __init__(self, network: VehicleNetwork, turn_weights: VehicleTurnMap) -> None:
+        self._network = network
+        self._turn_weights = turn_weights
+        self._steps: Dict[VehicleState, Tuple[_TransferStep, ...]] = {}
+
+    def steps(self, state: VehicleState) -> Tuple[_TransferStep, ...]:
+        steps = self._steps.get(state)
+        if steps is None:
+            network = self._network
+            shares = _compute_shares(state, network=network, turn_weights=self._turn_weights)
+            steps = tuple(
+                (share, _destination_for(state.pos, direction, network), _advance_state(state, direction, network))
+                for direction, share in shares.items()
+            )
+            self._steps[state] = steps
+        return steps
+
+    def propagate(self, initial_states: List[VehicleState], amount: float) -> Dict[str, float]:
+        od_map: Dict[str, float] = defaultdict(float)
+        frontier: List[Tuple[VehicleState, float]] = [(state, amount) for state in initial_states]
+        while frontier:
+            advanced: List[Tuple[VehicleState, float]] = []
+            for state, flow in frontier:
+                if flow <= 0.0:
+                    continue
+                for share, destination, next_state in self.steps(state):
+                    portion = flow * share
+                    if portion <= 0.0:
+                        continue
+                    if destination is not None:
+                        od_map[destination] += portion
+                    elif next_state is not None:
+                        advanced.append((next_state, portion))
+            frontier = advanced
+        return od_map
 
 
 def _compute_shares(
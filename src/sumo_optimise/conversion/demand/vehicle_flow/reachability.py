@@ -2,14 +2,15 @@
 from __future__ import annotations
 
 from collections import defaultdict, deque
-from dataclasses import dataclass
-from typing import Deque, Dict, List, Sequence, Set, Tuple
+from dataclasses import dataclass, field
+from typing import Deque, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 from xml.etree import ElementTree as ET
 
-from ...domain.models import EndpointDemandRow
+from ...domain.models import EndpointDemandRow, NetworkEdge, VehicleConnection
 from ...utils.errors import DemandValidationError
 
 VehicleOdTuple = Tuple[str, str, float, EndpointDemandRow]
+Route = Tuple[str, ...]
 
 
 @dataclass(frozen=True)
@@ -28,6 +29,8 @@ class VehicleOdReachabilityReport:
 
     reachable: List[VehicleOdFlowRecord]
     unreachable: List[VehicleOdFlowRecord]
+    # Edge sequence per reachable OD pair; pairs without one (origin == destination) are absent.
+    routes: Dict[Tuple[str, str], Route] = field(default_factory=dict)
 
 
 class VehicleConnectionGraph:
@@ -42,53 +45,114 @@ class VehicleConnectionGraph:
         self._edge_nodes = edge_nodes
         self._transitions = transitions
         self._edges_from_node = edges_from_node
+        self._reachable: Dict[str, FrozenSet[str]] = {}
+        self._routes: Dict[str, Dict[str, Route]] = {}
 
     @classmethod
     def from_xml(cls, edges_xml: str, connections_xml: str) -> VehicleConnectionGraph:
-        edge_nodes = _parse_edge_nodes(edges_xml)
+        return cls._build(_parse_edge_nodes(edges_xml), _parse_edge_transitions(connections_xml))
+
+    @classmethod
+    def from_network(
+        cls,
+        edges: Sequence[NetworkEdge],
+        connections: Sequence[VehicleConnection],
+    ) -> VehicleConnectionGraph:
+        """Build the graph from the emitters' records without re-parsing their XML."""
+
+        edge_nodes = {edge.id: (edge.from_node, edge.to_node) for edge in edges}
+        transitions: Dict[str, Set[str]] = defaultdict(set)
+        for connection in connections:
+            transitions[connection.from_edge].add(connection.to_edge)
+        return cls._build(edge_nodes, transitions)
+
+    @classmethod
+    def _build(
+        cls,
+        edge_nodes: Dict[str, Tuple[str, str]],
+        transitions: Dict[str, Set[str]],
+    ) -> VehicleConnectionGraph:
         edges_from_node = _edges_from_node(edge_nodes)
-        transitions = _parse_edge_transitions(connections_xml)
         _apply_default_transitions(transitions, edge_nodes, edges_from_node)
         return cls(edge_nodes, transitions, edges_from_node)
 
     def has_path(self, origin: str, destination: str) -> bool:
-        if origin == destination:
-            return True
-        starts = self._edges_from_node.get(origin)
-        if not starts:
-            return False
-        visited: Set[str] = set()
-        queue: Deque[str] = deque(starts)
+        return origin == destination or destination in self.reachable_nodes(origin)
+
+    def reachable_nodes(self, origin: str) -> FrozenSet[str]:
+        """Nodes reached by any edge sequence leaving ``origin``; one traversal per origin."""
+
+        reached = self._reachable.get(origin)
+        if reached is None:
+            reached = frozenset(self._routes_from(origin))
+            self._reachable[origin] = reached
+        return reached
+
+    def route(self, origin: str, destination: str) -> Optional[Route]:
+        """Fewest-edge route from ``origin`` to ``destination``, or ``None`` if there is none."""
+
+        return self._routes_from(origin).get(destination)
+
+    def _routes_from(self, origin: str) -> Dict[str, Route]:
+        routes = self._routes.get(origin)
+        if routes is not None:
+            return routes
+        # Breadth-first over edges in sorted order so ties resolve the same way every run.
+        parents: Dict[str, Optional[str]] = {}
+        queue: Deque[str] = deque()
+        for edge_id in sorted(self._edges_from_node.get(origin, ())):
+            parents[edge_id] = None
+            queue.append(edge_id)
+        routes = {}
         while queue:
             edge_id = queue.popleft()
-            if edge_id in visited:
-                continue
-            visited.add(edge_id)
-            nodes = self._edge_nodes.get(edge_id)
-            if not nodes:
+            edge_nodes = self._edge_nodes.get(edge_id)
+            if not edge_nodes:
                 continue
-            _, to_node = nodes
-            if to_node == destination:
-                return True
-            for next_edge in self._transitions.get(edge_id, ()):
-                if next_edge not in visited:
+            if edge_nodes[1] not in routes:
+                routes[edge_nodes[1]] = _trace(parents, edge_id)
+            for next_edge in sorted(self._transitions.get(edge_id, ())):
+                if next_edge not in parents:
+                    parents[next_edge] = edge_id
                     queue.append(next_edge)
-        return False
+        self._routes[origin] = routes
+        return routes
+
+
+def _trace(parents: Dict[str, Optional[str]], edge_id: str) -> Route:
+    edges: List[str] = []
+    current: Optional[str] = edge_id
+    while current is not None:
+        edges.append(current)
+        current = parents[current]
+    return tuple(reversed(edges))
 
 
 def evaluate_vehicle_od_reachability(
     flows: Sequence[VehicleOdTuple],
     *,
-    edges_xml: str,
-    connections_xml: str,
+    edges_xml: Optional[str] = None,
+    connections_xml: Optional[str] = None,
+    edges: Optional[Sequence[NetworkEdge]] = None,
+    connections: Optional[Sequence[VehicleConnection]] = None,
 ) -> VehicleOdReachabilityReport:
-    """Split OD flows into reachable/unreachable buckets for downstream filtering."""
+    """Split OD flows into reachable/unreachable buckets for downstream filtering.
+
+    Pass the emitters' ``edges``/``connections`` records when available; the
+    XML strings are only parsed as a fallback.
+    """
 
     if not flows:
         return VehicleOdReachabilityReport(reachable=[], unreachable=[])
-    graph = VehicleConnectionGraph.from_xml(edges_xml, connections_xml)
+    if edges is not None and connections is not None:
+        graph = VehicleConnectionGraph.from_network(edges, connections)
+    elif edges_xml is not None and connections_xml is not None:
+        graph = VehicleConnectionGraph.from_xml(edges_xml, connections_xml)
+    else:
+        raise DemandValidationError("reachability checks need either network records or edges/connections XML")
     reachable: List[VehicleOdFlowRecord] = []
     unreachable: List[VehicleOdFlowRecord] = []
+    routes: Dict[Tuple[str, str], Route] = {}
     for origin, destination, value, row in flows:
         record = VehicleOdFlowRecord(
             origin=origin,
@@ -98,9 +162,12 @@ def evaluate_vehicle_od_reachability(
         )
         if graph.has_path(origin, destination):
             reachable.append(record)
+            route = graph.route(origin, destination)
+            if route is not None:
+                routes[(origin, destination)] = route
         else:
             unreachable.append(record)
-    return VehicleOdReachabilityReport(reachable=reachable, unreachable=unreachable)
+    return VehicleOdReachabilityReport(reachable=reachable, unreachable=unreachable, routes=routes)
 
 
 def _parse_edge_nodes(xml_text: str) -> Dict[str, Tuple[str, str]]:
@@ -162,6 +229,8 @@ def _apply_default_transitions(
 
 
 __all__ = [
+    "Route",
+    "VehicleConnectionGraph",
     "VehicleOdFlowRecord",
     "VehicleOdReachabilityReport",
     "evaluate_vehicle_od_reachability",
@@ -2,12 +2,25 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Iterable, List, Tuple
+from typing import Collection, Iterable, List, Mapping, Sequence, Tuple
 
 from ...domain.models import EndpointDemandRow, PersonFlowPattern
 from ...utils.errors import DemandValidationError
 
 
+def vehicle_route_id(origin: str, destination: str) -> str:
+    return f"vr_{origin}__{destination}"
+
+
+def build_vehicle_route_entries(routes: Mapping[Tuple[str, str], Sequence[str]]) -> List[str]:
+    """Return one shared ``<route>`` per OD pair, referenced by flows via :func:`vehicle_route_id`."""
+
+    return [
+        f'  <route id="{vehicle_route_id(origin, destination)}" edges="{" ".join(edges)}"/>'
+        for (origin, destination), edges in routes.items()
+    ]
+
+
 def build_vehicle_flow_entries(
     flows: Iterable[Tuple[str, str, float, EndpointDemandRow]],
     *,
@@ -15,7 +28,10 @@ def build_vehicle_flow_entries(
     begin_time: float,
     end_time: float,
     segment_tag: str | None = None,
+    routed_pairs: Collection[Tuple[str, str]] = (),
 ) -> List[str]:
+    """Render ``<flow>`` entries; pairs in ``routed_pairs`` use their shared route instead of junctions."""
+
     counter_by_pair = defaultdict(int)
     entries: List[str] = []
     for origin, destination, value, row in flows:
@@ -27,9 +43,13 @@ def build_vehicle_flow_entries(
         seg = f"{segment_tag}__" if segment_tag else ""
         flow_id = f"vf_{origin}__{destination}__{seg}{seq}"
         attr = _format_pattern_attribute(vehicle_pattern, value)
+        if pair_key in routed_pairs:
+            placement = f'route="{vehicle_route_id(origin, destination)}"'
+        else:
+            placement = f'fromJunction="{origin}" toJunction="{destination}"'
         entry = (
             f'  <flow id="{flow_id}" begin="{begin_time:.2f}" end="{end_time:.2f}" '
-            f'fromJunction="{origin}" toJunction="{destination}" '
+            f"{placement} "
             f'departLane="best_prob" departSpeed="max" {attr}/>'
         )
         entries.append(entry)
@@ -45,4 +65,4 @@ def _format_pattern_attribute(pattern: PersonFlowPattern, value: float) -> str:
     raise DemandValidationError(f"unsupported vehicle flow pattern {pattern}")
 
 
-__all__ = ["build_vehicle_flow_entries"]
+__all__ = ["build_vehicle_flow_entries", "build_vehicle_route_entries", "vehicle_route_id"]
@@ -4,11 +4,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from html import escape
 from pathlib import Path
-from typing import Dict, Iterable, Mapping, Optional, Tuple
-
-import networkx as nx
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
 
 from .person_flow.identifier import parse_main_ped_endpoint_id
+from .person_flow.pedestrian_graph import PedestrianGraph, as_pedestrian_graph
 
 LABEL_ROTATION_DEG = -45.0
 LABEL_DELTA = 10.0
@@ -42,14 +41,20 @@ class _Bounds:
 
 
 def render_pedestrian_network_image(
-    graph: Optional[nx.MultiGraph],
+    graph: Optional[PedestrianGraph | Any],
     endpoint_ids: Iterable[str],
     junction_ids: Iterable[str],
     output_path: Path,
 ) -> Optional[NetworkVisualizationResult]:
-    """Render the pedestrian graph as an SVG diagram with rotated labels."""
+    """Render the pedestrian graph as an SVG diagram with rotated labels.
+
+    ``graph`` may also be a NetworkX ``MultiGraph``; it is frozen first.
+    """
 
-    if graph is None or graph.number_of_nodes() == 0:
+    if graph is None:
+        return None
+    graph = as_pedestrian_graph(graph)
+    if len(graph) == 0:
         return None
 
     positions = _collect_positions(graph)
@@ -92,16 +97,16 @@ def render_pedestrian_network_image(
     )
 
 
-def _collect_positions(graph: nx.MultiGraph) -> Dict[str, Tuple[float, float]]:
+def _collect_positions(graph: PedestrianGraph) -> Dict[str, Tuple[float, float]]:
     positions: Dict[str, Tuple[float, float]] = {}
-    for node, data in graph.nodes(data=True):
-        coord = data.get("coord")
-        if coord is None:
-            continue
-        positions[node] = (float(coord[0]), float(coord[1]))
+    for idx, node in enumerate(graph.node_ids):
+        if graph.has_coord(idx):
+            positions[node] = graph.coord(idx)
+
+    if len(positions) != len(graph):
+        import networkx as nx
 
-    if len(positions) != graph.number_of_nodes():
-        layout = nx.spring_layout(graph, seed=42)
+        layout = nx.spring_layout(graph.to_networkx(), seed=42)
         for node, coord in layout.items():
             positions.setdefault(node, (float(coord[0]), float(coord[1])))
 
@@ -172,21 +177,19 @@ def _map_endpoint_aliases(
 
 
 def _compute_junction_labels(
-    graph: nx.MultiGraph,
+    graph: PedestrianGraph,
     junction_ids: Iterable[str],
     positions: Mapping[str, Tuple[float, float]],
 ) -> Dict[str, Tuple[float, float]]:
     primary: Dict[str, Tuple[float, float, int]] = {}
     fallback: Dict[str, Tuple[float, float, int]] = {}
-    for node, data in graph.nodes(data=True):
-        cluster_id = data.get("cluster_id")
+    for node, cluster_id, node_type in zip(graph.node_ids, graph.cluster_ids, graph.node_types):
         coord = positions.get(node)
         if not cluster_id or coord is None:
             continue
         total_x, total_y, count = fallback.get(cluster_id, (0.0, 0.0, 0))
         fallback[cluster_id] = (total_x + coord[0], total_y + coord[1], count + 1)
 
-        node_type = str(data.get("node_type", ""))
         if node_type.startswith("main"):
             p_x, p_y, p_count = primary.get(cluster_id, (0.0, 0.0, 0))
             primary[cluster_id] = (p_x + coord[0], p_y + coord[1], p_count + 1)
@@ -204,8 +207,16 @@ def _compute_junction_labels(
     return label_positions
 
 
+def _edges_in_adjacency_order(graph: PedestrianGraph) -> Iterable[Tuple[int, int]]:
+    # Walk the CSR rows so each edge is drawn once, from its first-listed endpoint.
+    for u in range(len(graph)):
+        for v, _ in graph.neighbors(u):
+            if v >= u:
+                yield u, v
+
+
 def _render_svg(
-    graph: nx.MultiGraph,
+    graph: PedestrianGraph,
     positions: Mapping[str, Tuple[float, float]],
     bounds: _Bounds,
     endpoint_nodes: set[str],
@@ -227,16 +238,17 @@ def _render_svg(
     ]
 
     # Draw edges first so nodes appear on top.
-    for u, v in graph.edges():
-        x1, y1 = to_svg_coord(*positions[u])
-        x2, y2 = to_svg_coord(*positions[v])
+    node_ids = graph.node_ids
+    for u, v in _edges_in_adjacency_order(graph):
+        x1, y1 = to_svg_coord(*positions[node_ids[u]])
+        x2, y2 = to_svg_coord(*positions[node_ids[v]])
         elements.append(
             f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" '
             'stroke="#94a3b8" stroke-width="1.5" stroke-linecap="round" />'
         )
 
     # Draw nodes with category-specific styling.
-    for node in graph.nodes:
+    for node, node_type in zip(node_ids, graph.node_types):
         x, y = to_svg_coord(*positions[node])
         radius = 4.0
         fill = "#cbd5f5"
@@ -244,10 +256,8 @@ def _render_svg(
         if node in endpoint_nodes:
             fill = "#fb923c"
             radius = 5.0
-        else:
-            node_type = str(graph.nodes[node].get("node_type", ""))
-            if node_type.startswith("main"):
-                fill = "#2563eb"
+        elif node_type.startswith("main"):
+            fill = "#2563eb"
         elements.append(
             f'<circle cx="{x}" cy="{y}" r="{radius}" fill="{fill}" stroke="{stroke}" stroke-width="0.75" />'
         )
@@ -4,7 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from ..utils.constants import (
     CONNECTIONS_FILE_NAME,
@@ -13,6 +13,7 @@ from ..utils.constants import (
     MANIFEST_NAME,
     NETWORK_FILE_NAME,
     NODES_FILE_NAME,
+    OD_MATRIX_FILE_NAME,
     OUTPUT_DIR_PREFIX,
     PED_ENDPOINT_TEMPLATE_NAME,
     PED_JUNCTION_TEMPLATE_NAME,
@@ -45,6 +46,7 @@ class OutputFileTemplates:
     connections: str = field(default=CONNECTIONS_FILE_NAME, metadata={"path": True})
     tll: str = field(default=TLL_FILE_NAME, metadata={"path": True})
     routes: str = field(default=ROUTES_FILE_NAME, metadata={"path": True})
+    od_matrix: str = field(default=OD_MATRIX_FILE_NAME, metadata={"path": True})
     sumocfg: str = field(default=SUMO_CONFIG_FILE_NAME, metadata={"path": True})
     network: str = field(default=NETWORK_FILE_NAME, metadata={"path": True})
     pedestrian_network: str = field(default=PED_NETWORK_IMAGE_NAME, metadata={"path": True})
@@ -156,16 +158,16 @@ class JunctionConfig:
 
 @dataclass(frozen=True)
 class SignalPhaseDef:
-    duration_s: int
+    duration_s: float
     allow_movements: List[str]
 
 
 @dataclass(frozen=True)
 class SignalProfileDef:
     id: str
-    cycle_s: int
-    ped_early_cutoff_s: int
-    yellow_duration_s: int
+    cycle_s: float
+    ped_early_cutoff_s: float
+    yellow_duration_s: float
     phases: List[SignalPhaseDef]
     kind: EventKind
 
@@ -234,6 +236,26 @@ class ControlledConnection:
     link_index: int
 
 
+@dataclass(frozen=True)
+class NetworkEdge:
+    """Structured view of an emitted ``<edge>`` (``lanes`` excludes the sidewalk)."""
+
+    id: str
+    from_node: str
+    to_node: str
+    lanes: int
+
+
+@dataclass(frozen=True)
+class VehicleConnection:
+    """Structured view of an emitted vehicle ``<connection>``."""
+
+    from_edge: str
+    to_edge: str
+    from_lane: int
+    to_lane: int
+
+
 @dataclass(frozen=True)
 class ConnectionsRenderResult:
     """Rendered XML and signal metadata for vehicle connections and crossings."""
@@ -241,6 +263,9 @@ class ConnectionsRenderResult:
     xml: str
     links: List[SignalLink]
     controlled_connections: List[ControlledConnection]
+    connections: List[VehicleConnection] = field(default_factory=list)
+    # Ordered <connection>/<crossing> records (each with ``to_xml()``) for streaming.
+    elements: List[Any] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -388,6 +413,12 @@ class DemandOptions:
     ped_sat_scale: float = 1.0
     veh_unsat_scale: float = 1.0
     veh_sat_scale: float = 1.0
+    # Time-series multipliers replacing the unsat/sat windows (see ``demand.segments``).
+    demand_profile_csv: Optional[Path] = None
+    # Emit one shared <route> per vehicle OD pair instead of fromJunction/toJunction.
+    explicit_vehicle_routes: bool = False
+    # Emit <walk edges="..."> along the pedestrian graph instead of <personTrip>.
+    explicit_pedestrian_walks: bool = False
 
 
 @dataclass(frozen=True)
@@ -413,6 +444,14 @@ class BuildOptions:
     generate_demand_templates: bool = False
     network_input: Optional[Path] = None
     extra_context: Optional[Dict[str, object]] = None
+    cache_dir: Optional[Path] = None
+    stage_workers: int = 1
+    stream_xml: bool = False
+    compress_xml: bool = False
+    compress_routes: bool = False
+    write_od_matrix: bool = False
+    # Cross-check emitted pedestrian walks against the assembled net.xml.
+    validate_pedestrian_walks: bool = False
 
 
 class BuildTask(str, Enum):
@@ -444,6 +483,16 @@ class BuildResult:
     sumocfg_path: Optional[Path] = None
     defaults: Optional[Defaults] = None
     run_id: Optional[str] = None
+    # With ``BuildOptions.stream_xml`` the *_xml fields are empty and each document
+    # is a picklable callable returning its lines, keyed nodes/edges/connections/tll
+    # (and demand when routes were generated).
+    xml_streams: Optional[Dict[str, Callable[[], Iterable[str]]]] = None
+    # Unscaled OD matrices keyed ``person``/``vehicle`` (see ``demand.od_matrix``).
+    od_matrices: Optional[Dict[str, Any]] = None
+    # SUMO edge sequence per pedestrian OD pair emitted as a <walk>.
+    pedestrian_walks: Optional[Dict[Tuple[str, str], Tuple[str, ...]]] = None
+    # Pickle bytes this build added to the stage cache (``BuildOptions.cache_dir``).
+    cache_bytes_written: int = 0
 
 
 @dataclass
@@ -1,15 +1,22 @@
 """Conflict table loader for traffic-light movement interactions."""
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from ..utils.logging import get_logger
+from ..utils.memo import StageCache, code_fingerprint, digest_file, digest_json
 
 LOG = get_logger()
 
 _CARDINAL_SEQUENCE = ["NB", "EB", "SB", "WB"]
+_CONFLICT_TABLE_PATH = Path(__file__).resolve().parents[1] / "data" / "conflict_table(prototype).txt"
+# Bump when the compiled representation (``ConflictMatrix._matrix``) changes.
+_COMPILED_FORMAT = 1
+CACHE_DIR_ENV = "SUMO_OPTIMISE_CACHE_DIR"
 
 
 @dataclass(frozen=True)
@@ -30,13 +37,27 @@ class ConflictMatrix:
             self._matrix[key] = (entry.state_a, entry.state_b)
             reverse_key = (entry.movement_b, entry.movement_a)
             self._matrix[reverse_key] = (entry.state_b, entry.state_a)
+        # Resolved relations per concrete token pair; movement tokens repeat across programs.
+        self._resolved: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    @classmethod
+    def from_compiled(cls, matrix: Dict[Tuple[str, str], Tuple[str, str]]) -> "ConflictMatrix":
+        instance = cls([])
+        instance._matrix = dict(matrix)
+        return instance
 
     def relation(self, movement_a: str, movement_b: str) -> Tuple[str, str]:
         """Return (state_for_a, state_for_b) using 'P' if unknown."""
 
         if movement_a == movement_b:
             return "P", "P"
+        key = (movement_a, movement_b)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolved[key] = self._lookup(movement_a, movement_b)
+        return resolved
 
+    def _lookup(self, movement_a: str, movement_b: str) -> Tuple[str, str]:
         variants_a = _token_variants(movement_a)
         variants_b = _token_variants(movement_b)
         for variant_a in variants_a:
@@ -191,15 +212,50 @@ def _parse_conflict_file(path: Path) -> ConflictMatrix:
     return ConflictMatrix(expanded_entries)
 
 
-def load_conflict_matrix() -> ConflictMatrix:
-    """Load the conflict matrix from the prototype table on disk."""
+def _compiled_cache() -> Optional[StageCache]:
+    root = os.environ.get(CACHE_DIR_ENV)
+    if not root:
+        return None
+    return StageCache(Path(root))
+
+
+def load_conflict_matrix(path: Optional[Path] = None) -> ConflictMatrix:
+    """Load the conflict matrix from the prototype table on disk.
 
-    data_dir = Path(__file__).resolve().parents[1] / "data"
-    path = data_dir / "conflict_table(prototype).txt"
+    When ``$SUMO_OPTIMISE_CACHE_DIR`` is set, the expanded table is cached there
+    as a pickle keyed by the source file's hash and the code fingerprint, so the
+    text is only parsed when it (or the parser) changes. Without it nothing is
+    written to disk.
+    """
+
+    path = path or _CONFLICT_TABLE_PATH
     if not path.exists():
         LOG.warning("[TLS] conflict-table file %s not found; defaulting to empty matrix", path)
         return ConflictMatrix([])
-    return _parse_conflict_file(path)
-
-
-GLOBAL_CONFLICT_MATRIX = load_conflict_matrix()
+    cache = _compiled_cache()
+    if cache is None:
+        return _parse_conflict_file(path)
+    key = digest_json([_COMPILED_FORMAT, code_fingerprint(), digest_file(path)])
+    hit, compiled = cache.load("conflict_table", key)
+    if hit:
+        return ConflictMatrix.from_compiled(compiled)
+    matrix = _parse_conflict_file(path)
+    try:
+        cache.store("conflict_table", key, matrix._matrix)
+    except OSError as exc:
+        LOG.debug("[TLS] conflict-table cache not written: %s", exc)
+    return matrix
+
+
+@lru_cache(maxsize=1)
+def get_conflict_matrix() -> ConflictMatrix:
+    """Process-wide conflict matrix, loaded on first use."""
+
+    return load_conflict_matrix()
+
+
+def __getattr__(name: str) -> ConflictMatrix:
+    # ``GLOBAL_CONFLICT_MATRIX`` used to be built at import time; keep it as a lazy alias.
+    if name == "GLOBAL_CONFLICT_MATRIX":
+        return get_conflict_matrix()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
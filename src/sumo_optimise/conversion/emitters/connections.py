@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 from ..builder.ids import (
     cluster_id,
@@ -27,6 +27,7 @@ from ..domain.models import (
     SignalLink,
     SideMinor,
     SnapRule,
+    VehicleConnection,
 )
 from ..planner.crossings import decide_midblock_side_for_collision
 from ..planner.lanes import find_neighbor_segments, pick_lanes_for_segment
@@ -100,6 +101,8 @@ class LinkEmissionCollector:
         self._order = 0
         self.connections: List[ConnectionRecord] = []
         self.crossings: List[CrossingRecord] = []
+        # De-duplicated vehicle connections in emission order; filled by finalize().
+        self.emitted_connections: List[VehicleConnection] = []
 
     def _next_order(self) -> int:
         value = self._order
@@ -151,6 +154,14 @@ class LinkEmissionCollector:
         )
 
     def finalize(self) -> Tuple[List[str], List[SignalLink], List[ControlledConnection]]:
+        elements, metadata, controlled_connections = self.finalize_elements()
+        return [element.to_xml() for element in elements], metadata, controlled_connections
+
+    def finalize_elements(
+        self,
+    ) -> Tuple[List[Union[ConnectionRecord, CrossingRecord]], List[SignalLink], List[ControlledConnection]]:
+        """Like :meth:`finalize` but return the ordered records instead of their XML lines."""
+
         ordered_connections = sorted(self.connections, key=lambda rec: rec.order)
         unique_connections: List[ConnectionRecord] = []
         seen_keys: Set[Tuple[str, str, int, int]] = set()
@@ -164,6 +175,15 @@ class LinkEmissionCollector:
                 continue
             seen_keys.add(key)
             unique_connections.append(record)
+        self.emitted_connections = [
+            VehicleConnection(
+                from_edge=record.from_edge,
+                to_edge=record.to_edge,
+                from_lane=record.from_lane,
+                to_lane=record.to_lane,
+            )
+            for record in unique_connections
+        ]
 
         ordered_crossings = sorted(self.crossings, key=lambda rec: rec.order)
 
@@ -238,14 +258,9 @@ class LinkEmissionCollector:
 
         metadata.sort(key=lambda item: (item.tl_id, item.slot_index))
 
-        items: List[Tuple[int, str]] = []
-        for record in unique_connections:
-            items.append((record.order, record.to_xml()))
-        for record in ordered_crossings:
-            items.append((record.order, record.to_xml()))
-
-        lines = [line for _, line in sorted(items, key=lambda pair: pair[0])]
-        return lines, metadata, controlled_connections
+        elements: List[Union[ConnectionRecord, CrossingRecord]] = [*unique_connections, *ordered_crossings]
+        elements.sort(key=lambda record: record.order)
+        return elements, metadata, controlled_connections
 
 
 def _cardinal_to_orientation(cardinal: str) -> Optional[int]:
@@ -814,6 +829,21 @@ def get_main_edges_east_side(breakpoints: List[int], pos: int) -> Tuple[Optional
     return (main_edge_id("EB", pos, east), main_edge_id("WB", east, pos))
 
 
+def iter_connections_xml(elements: Iterable[Union[ConnectionRecord, CrossingRecord]]) -> Iterator[str]:
+    """Yield the connections document for ``elements`` line by line (without line terminators)."""
+
+    yield "<connections>"
+    for element in elements:
+        yield element.to_xml()
+    yield "</connections>"
+
+
+def render_connections_document(elements: Sequence[Union[ConnectionRecord, CrossingRecord]]) -> str:
+    lines = list(iter_connections_xml(elements))
+    LOG.info("rendered connections (%d lines)", len(lines))
+    return "\n".join(lines) + "\n"
+
+
 def render_connections_xml(
     defaults: Defaults,
     clusters: List[Cluster],
@@ -821,7 +851,15 @@ def render_connections_xml(
     snap_rule: SnapRule,
     main_road: MainRoadConfig,
     lane_overrides: Dict[str, List[LaneOverride]],
+    *,
+    materialize: bool = True,
 ) -> ConnectionsRenderResult:
+    """Emit connections and crossings for the corridor.
+
+    With ``materialize=False`` the returned ``xml`` is left empty; the ordered
+    records in ``elements`` can be streamed with :func:`iter_connections_xml`.
+    """
+
     width = defaults.ped_crossing_width_m
     collector = LinkEmissionCollector()
     absorbed_pos: Set[int] = set()
@@ -1215,8 +1253,11 @@ def render_connections_xml(
                 lane_plan=_pick_lane_plan(cfg, "SB", s_count),
             )
 
-    inner_lines, metadata, controlled = collector.finalize()
-    all_lines = ["<connections>", *inner_lines, "</connections>"]
-    xml = "\n".join(all_lines) + "\n"
-    LOG.info("rendered connections (%d lines)", len(all_lines))
-    return ConnectionsRenderResult(xml=xml, links=metadata, controlled_connections=controlled)
+    elements, metadata, controlled = collector.finalize_elements()
+    return ConnectionsRenderResult(
+        xml=render_connections_document(elements) if materialize else "",
+        links=metadata,
+        controlled_connections=controlled,
+        connections=collector.emitted_connections,
+        elements=elements,
+    )
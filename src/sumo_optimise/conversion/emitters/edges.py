@@ -1,10 +1,10 @@
 """PlainXML edge emission."""
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Sequence
 
 from ..builder.ids import main_edge_id, main_node_id, minor_edge_id, minor_end_node_id
-from ..domain.models import Cluster, Defaults, LaneOverride, MainRoadConfig
+from ..domain.models import Cluster, Defaults, LaneOverride, MainRoadConfig, NetworkEdge
 from ..planner.lanes import pick_lanes_for_segment
 from ..planner.snap import kmh_to_mps
 from ..utils.errors import InvalidConfigurationError
@@ -28,23 +28,49 @@ def render_edges_xml(
     breakpoints: List[int],
     lane_overrides: Dict[str, List[LaneOverride]],
 ) -> str:
+    edges = collect_edges(main_road, clusters, breakpoints, lane_overrides)
+    return render_edges_document(edges, defaults)
+
+
+def render_edges_document(edges: Sequence[NetworkEdge], defaults: Defaults) -> str:
+    lines = list(iter_edges_xml(edges, defaults))
+    LOG.info("rendered edges (%d lines)", len(lines))
+    return "\n".join(lines) + "\n"
+
+
+def iter_edges_xml(edges: Iterable[NetworkEdge], defaults: Defaults) -> Iterator[str]:
+    """Yield the edges document for ``edges`` line by line (without line terminators)."""
+
     speed_mps = kmh_to_mps(defaults.speed_kmh)
     sidewalk_width = defaults.sidewalk_width_m if defaults.sidewalk_width_m is not None else 3.0
 
-    lines: List[str] = []
-    lines.append("<edges>")
-
-    def _emit_edge(edge_id: str, from_node: str, to_node: str, lanes: int) -> None:
-        total_lanes = lanes + 1  # include sidewalk at index 0
-        lines.append(
-            f'  <edge id="{edge_id}" '
-            f'from="{from_node}" to="{to_node}" '
+    yield "<edges>"
+    for edge in edges:
+        total_lanes = edge.lanes + 1  # include sidewalk at index 0
+        yield (
+            f'  <edge id="{edge.id}" '
+            f'from="{edge.from_node}" to="{edge.to_node}" '
             f'numLanes="{total_lanes}" speed="{speed_mps:.3f}">'
         )
-        lines.append(f'    <lane index="0" allow="pedestrian" width="{sidewalk_width:.2f}"/>')
-        for idx in range(lanes):
-            lines.append(f'    <lane index="{idx + 1}" disallow="pedestrian"/>')
-        lines.append("  </edge>")
+        yield f'    <lane index="0" allow="pedestrian" width="{sidewalk_width:.2f}"/>'
+        for idx in range(edge.lanes):
+            yield f'    <lane index="{idx + 1}" disallow="pedestrian"/>'
+        yield "  </edge>"
+    yield "</edges>"
+
+
+def collect_edges(
+    main_road: MainRoadConfig,
+    clusters: List[Cluster],
+    breakpoints: List[int],
+    lane_overrides: Dict[str, List[LaneOverride]],
+) -> List[NetworkEdge]:
+    """Return the corridor edges, in document order, as :class:`NetworkEdge` records."""
+
+    edges: List[NetworkEdge] = []
+
+    def _emit_edge(edge_id: str, from_node: str, to_node: str, lanes: int) -> None:
+        edges.append(NetworkEdge(id=edge_id, from_node=from_node, to_node=to_node, lanes=lanes))
 
     for west, east in zip(breakpoints[:-1], breakpoints[1:]):
         lanes_eb = pick_lanes_for_segment("EB", west, east, main_road.lanes, lane_overrides)
@@ -93,7 +119,4 @@ def render_edges_xml(
                     tpl.minor_lanes_departure,
                 )
 
-    lines.append("</edges>")
-    xml = "\n".join(lines) + "\n"
-    LOG.info("rendered edges (%d lines)", len(lines))
-    return xml
+    return edges
@@ -1,7 +1,7 @@
 """PlainXML node emission."""
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 from ..builder.ids import cluster_id, main_node_id, minor_end_node_id
 from ..domain.models import BreakpointInfo, Cluster, Defaults, EventKind, MainRoadConfig, SideMinor
@@ -18,11 +18,24 @@ def render_nodes_xml(
     breakpoints: List[int],
     reason_by_pos: Dict[int, BreakpointInfo],
 ) -> str:
+    lines = list(iter_nodes_xml(main_road, defaults, clusters, breakpoints, reason_by_pos))
+    LOG.info("rendered nodes (%d lines)", len(lines))
+    return "\n".join(lines) + "\n"
+
+
+def iter_nodes_xml(
+    main_road: MainRoadConfig,
+    defaults: Defaults,
+    clusters: List[Cluster],
+    breakpoints: List[int],
+    reason_by_pos: Dict[int, BreakpointInfo],
+) -> Iterator[str]:
+    """Yield the nodes document line by line (without line terminators)."""
+
     y_north, y_south = build_main_carriageway_y(main_road)
     grid_max = breakpoints[-1] if breakpoints else 0
 
-    lines: List[str] = []
-    lines.append("<nodes>")
+    yield "<nodes>"
 
     signalised_positions = {
         cluster.pos_m
@@ -55,8 +68,8 @@ def render_nodes_xml(
         return " ".join(f'{name}="{value}"' for name, value in attrs)
 
     for x in breakpoints:
-        lines.append(f"  <node {_attrs_for_main('north', x, y_north)}/>")
-        lines.append(f"  <node {_attrs_for_main('south', x, y_south)}/>")
+        yield f"  <node {_attrs_for_main('north', x, y_north)}/>"
+        yield f"  <node {_attrs_for_main('south', x, y_south)}/>"
 
     for pos in breakpoints:
         if pos in (0, grid_max):
@@ -79,7 +92,7 @@ def render_nodes_xml(
         if not keep_clear:
             attrs.append(("keepClear", "false"))
         attr_text = " ".join(f'{name}="{value}"' for name, value in attrs)
-        lines.append(f"  <join {attr_text}/>  <!-- reasons: {reasons_text} -->")
+        yield f"  <join {attr_text}/>  <!-- reasons: {reasons_text} -->"
 
     for cluster in clusters:
         pos = cluster.pos_m
@@ -102,9 +115,6 @@ def render_nodes_xml(
                     ("fringe", "outer"),
                 ]
                 attr_text = " ".join(f'{name}="{value}"' for name, value in attrs)
-                lines.append(f"  <node {attr_text}/>  <!-- minor dead_end ({ns}), offset={offset_m} from y=0 -->")
+                yield f"  <node {attr_text}/>  <!-- minor dead_end ({ns}), offset={offset_m} from y=0 -->"
 
-    lines.append("</nodes>")
-    xml = "\n".join(lines) + "\n"
-    LOG.info("rendered nodes (%d lines)", len(lines))
-    return xml
+    yield "</nodes>"
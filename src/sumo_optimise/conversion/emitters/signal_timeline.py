@@ -0,0 +1,216 @@
+"""Run-length signal timelines over one cycle.
+
+A timeline is a list of ``(start, end, state)`` runs covering ``[0, cycle)`` in
+order, with adjacent runs in different states. Times may be ints or floats;
+integer inputs keep integer arithmetic throughout, so integer programs render
+exactly as before. All operations work on run boundaries, never per second.
+"""
+from __future__ import annotations
+
+from typing import Callable, Collection, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+Seconds = Union[int, float]
+Run = Tuple[Seconds, Seconds, str]
+Timeline = List[Run]
+
+_T = TypeVar("_T")
+_GREEN = ("G", "g")
+
+
+def _snap(value: Seconds) -> Seconds:
+    # Float phase arithmetic accumulates rounding noise; keep boundaries on a microsecond grid.
+    return value if isinstance(value, int) else round(value, 6)
+
+
+def _spans(start: Seconds, length: Seconds, cycle: Seconds) -> List[Tuple[Seconds, Seconds]]:
+    """Split the circular interval ``[start, start + length)`` into linear spans."""
+
+    if length <= 0:
+        return []
+    if length >= cycle:
+        return [(0, cycle)]
+    start = _snap(start % cycle)
+    end = _snap(start + length)
+    if end <= cycle:
+        return [(start, end)]
+    return [(start, cycle), (0, _snap(end - cycle))]
+
+
+def _overwrite(segments: List[Tuple[Seconds, Seconds, _T]], start: Seconds, end: Seconds, value: _T) -> List[Tuple[Seconds, Seconds, _T]]:
+    result: List[Tuple[Seconds, Seconds, _T]] = []
+    for seg_start, seg_end, seg_value in segments:
+        if seg_end <= start or seg_start >= end:
+            result.append((seg_start, seg_end, seg_value))
+            continue
+        if seg_start < start:
+            result.append((seg_start, start, seg_value))
+        if seg_end > end:
+            result.append((end, seg_end, seg_value))
+    result.append((start, end, value))
+    result.sort(key=lambda seg: seg[0])
+    return result
+
+
+def paint_phases(cycle: Seconds, durations: Sequence[Seconds]) -> List[Tuple[Seconds, Seconds, Optional[int]]]:
+    """Lay phases out back to back from ``t=0``, wrapping modulo ``cycle``.
+
+    Returns segments tagged with the index of the phase that covers them (later
+    phases overwrite earlier ones); uncovered time is tagged ``None``.
+    """
+
+    segments: List[Tuple[Seconds, Seconds, Optional[int]]] = [(0, cycle, None)]
+    cursor: Seconds = 0
+    for index, duration in enumerate(durations):
+        for start, end in _spans(cursor, duration, cycle):
+            segments = _overwrite(segments, start, end, index)
+        cursor = _snap((cursor + duration) % cycle)
+    return segments
+
+
+def build_timeline(segments: Iterable[Tuple[Seconds, Seconds, _T]], state_of: Callable[[_T], str]) -> Timeline:
+    """Map tagged segments to states and merge equal neighbours."""
+
+    runs: Timeline = []
+    for start, end, tag in segments:
+        state = state_of(tag)
+        if runs and runs[-1][2] == state:
+            runs[-1] = (runs[-1][0], end, state)
+        else:
+            runs.append((start, end, state))
+    return runs
+
+
+def _relabel(timeline: Timeline, cycle: Seconds, spans: Iterable[Tuple[Seconds, Seconds]], state: str) -> Timeline:
+    tagged: List[Tuple[Seconds, Seconds, str]] = list(timeline)
+    for start, length in spans:
+        for span_start, span_end in _spans(start, length, cycle):
+            tagged = _overwrite(tagged, span_start, span_end, state)
+    return build_timeline(tagged, lambda value: value)
+
+
+def _length(run: Run) -> Seconds:
+    return run[1] - run[0]
+
+
+def apply_yellow(timeline: Timeline, cycle: Seconds, yellow: Seconds) -> Timeline:
+    """Turn the last ``yellow`` seconds of every green block that is followed by red into ``y``.
+
+    A block is a circular sequence of ``G``/``g`` runs, so greens spanning several
+    phases (or the cycle wrap) are treated as one.
+    """
+
+    if yellow <= 0 or not any(run[2] == "r" for run in timeline):
+        return timeline
+    count = len(timeline)
+    spans: List[Tuple[Seconds, Seconds]] = []
+    for index, run in enumerate(timeline):
+        if run[2] not in _GREEN or timeline[(index + 1) % count][2] != "r":
+            continue
+        block: Seconds = 0
+        back = index
+        while timeline[back][2] in _GREEN:
+            block += _length(timeline[back])
+            back = (back - 1) % count
+        length = min(yellow, block)
+        spans.append((_snap(run[1] - length), length))
+    return _relabel(timeline, cycle, spans, "y")
+
+
+def apply_ped_cutoff(timeline: Timeline, cycle: Seconds, cutoff: Seconds) -> Timeline:
+    """Switch the last ``cutoff`` seconds of each ``G`` run that is followed by ``r`` to ``r``.
+
+    This reproduces the original per-second sweep. That sweep ran from ``t=0``
+    and looked at the (already trimmed) state at ``t=0`` when it reached the
+    end of the cycle. A green that wraps the cycle and whose head is no longer
+    than ``cutoff`` is therefore trimmed a second time from its new end.
+    """
+
+    if cutoff <= 0 or len(timeline) < 2:
+        return timeline
+    count = len(timeline)
+    wraps = count > 2 and timeline[0][2] == "G" and timeline[-1][2] == "G"
+    spans: List[Tuple[Seconds, Seconds]] = []
+    for index, run in enumerate(timeline):
+        if run[2] != "G" or timeline[(index + 1) % count][2] != "r":
+            continue
+        if wraps and index == count - 1:
+            continue
+        length = _length(run)
+        if wraps and index == 0:
+            head, tail = length, _length(timeline[-1])
+            first = min(cutoff, head + tail)
+            spans.append((_snap(run[1] - first), first))
+            if cutoff >= head and head + tail > cutoff:
+                second = min(cutoff, head + tail - cutoff)
+                spans.append((_snap(cycle - (cutoff - head) - second), second))
+            continue
+        trimmed = min(cutoff, length)
+        spans.append((_snap(run[1] - trimmed), trimmed))
+    return _relabel(timeline, cycle, spans, "r")
+
+
+def green_spans(timelines: Iterable[Timeline]) -> List[Tuple[Seconds, Seconds]]:
+    """Union of the ``G``/``g`` runs of ``timelines`` as sorted, merged spans."""
+
+    spans = sorted((run[0], run[1]) for timeline in timelines for run in timeline if run[2] in _GREEN)
+    merged: List[Tuple[Seconds, Seconds]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def overlaps(timeline: Timeline, state: str, spans: Sequence[Tuple[Seconds, Seconds]]) -> bool:
+    """True if a ``state`` run of ``timeline`` shares a non-empty interval with ``spans``."""
+
+    return any(
+        min(run[1], end) > max(run[0], start)
+        for run in timeline
+        if run[2] == state
+        for start, end in spans
+    )
+
+
+def to_phases(timelines: Sequence[Timeline], cycle: Seconds) -> List[Tuple[Seconds, str]]:
+    """Combine per-movement timelines into ``(duration, state string)`` phases.
+
+    Equal neighbouring states are merged, and so are the first and last phase
+    when they match across the cycle wrap.
+    """
+
+    if not timelines or cycle <= 0:
+        return []
+    boundaries: Collection[Seconds] = sorted({run[0] for timeline in timelines for run in timeline} | {cycle})
+    cursors = [0] * len(timelines)
+    phases: List[Tuple[Seconds, str]] = []
+    previous: Seconds = 0
+    for boundary in boundaries:
+        if boundary <= previous:
+            continue
+        chars = []
+        for idx, timeline in enumerate(timelines):
+            while timeline[cursors[idx]][1] <= previous:
+                cursors[idx] += 1
+            chars.append(timeline[cursors[idx]][2])
+        state = "".join(chars)
+        duration = _snap(boundary - previous)
+        if phases and phases[-1][1] == state:
+            phases[-1] = (_snap(phases[-1][0] + duration), state)
+        else:
+            phases.append((duration, state))
+        previous = boundary
+    if len(phases) >= 2 and phases[0][1] == phases[-1][1]:
+        phases = [(_snap(phases[0][0] + phases[-1][0]), phases[0][1])] + phases[1:-1]
+    return phases
+
+
+def format_seconds(value: Seconds) -> str:
+    """Render a duration without a trailing ``.0`` for whole seconds."""
+
+    if isinstance(value, int):
+        return str(value)
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.3f}".rstrip("0").rstrip(".")
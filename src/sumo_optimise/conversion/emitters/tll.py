@@ -4,7 +4,7 @@ from __future__ import annotations
 import re
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Mapping, MutableMapping, Sequence, Set
+from typing import Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence, Set, Tuple
 
 from ..builder.ids import cluster_id
 from ..domain.models import (
@@ -19,7 +19,19 @@ from ..domain.models import (
     SnapRule,
 )
 from ..utils.logging import get_logger
-from .conflict_table import GLOBAL_CONFLICT_MATRIX
+from .conflict_table import get_conflict_matrix
+from .signal_timeline import (
+    Seconds,
+    Timeline,
+    apply_ped_cutoff,
+    apply_yellow,
+    build_timeline,
+    format_seconds,
+    green_spans,
+    overlaps,
+    paint_phases,
+    to_phases,
+)
 
 LOG = get_logger()
 
@@ -452,30 +464,59 @@ def _normalize_conflict_state(token_a: str, token_b: str, state: str) -> str:
     return "P"
 
 
-def _state_from_markers(markers: Sequence[str]) -> str:
-    if not markers:
-        return "G"
-    if "S" in markers:
-        return "r"
-    if "Y" in markers:
-        return "g"
-    return "G"
-
-
-def _evaluate_conflicts(tokens: Sequence[str]) -> Dict[str, str]:
+# Normalised conflict markers ordered by severity, so a phase row reduces with max().
+_MARKER_CODES = {"P": 0, "Y": 1, "S": 2}
+_STATE_BY_CODE = ("G", "g", "r")
+_UNRESOLVED = 0xFF
+
+
+class _ConflictTable:
+    """Dense conflict lookup over the movement tokens of one signal program.
+
+    Tokens are interned to small integers and the normalised marker of token
+    ``i`` against token ``j`` is kept in ``codes[i * n + j]``. Cells are filled
+    on first use, so only pairs that share a phase are looked up (and warned
+    about) in the conflict matrix.
+    """
+
+    def __init__(self, tokens: Iterable[str]) -> None:
+        self.tokens: List[str] = list(dict.fromkeys(tokens))
+        self.index: Dict[str, int] = {token: idx for idx, token in enumerate(self.tokens)}
+        self._size = len(self.tokens)
+        self._codes = bytearray([_UNRESOLVED]) * (self._size * self._size)
+        self._matrix = get_conflict_matrix()
+
+    def _fill(self, a: int, b: int) -> None:
+        token_a, token_b = self.tokens[a], self.tokens[b]
+        state_a, state_b = self._matrix.relation(token_a, token_b)
+        self._codes[a * self._size + b] = _MARKER_CODES[_normalize_conflict_state(token_a, token_b, state_a)]
+        self._codes[b * self._size + a] = _MARKER_CODES[_normalize_conflict_state(token_b, token_a, state_b)]
+
+    def evaluate(self, tokens: Sequence[str]) -> Dict[str, str]:
+        """Return the signal state of each token when ``tokens`` are released together."""
+
+        members = list(dict.fromkeys(self.index[token] for token in tokens))
+        codes = self._codes
+        size = self._size
+        for pos, a in enumerate(members):
+            row = a * size
+            for b in members[pos + 1 :]:
+                if codes[row + b] == _UNRESOLVED:
+                    self._fill(a, b)
+        states: Dict[str, str] = {}
+        for a in members:
+            row = a * size
+            worst = max((codes[row + b] for b in members if b != a), default=0)
+            states[self.tokens[a]] = _STATE_BY_CODE[worst]
+        return states
+
+
+def _evaluate_conflicts(tokens: Sequence[str], table: _ConflictTable | None = None) -> Dict[str, str]:
     if not tokens:
         return {}
-    severity: Dict[str, List[str]] = defaultdict(list)
-    unique_tokens: List[str] = []
-    for token in tokens:
-        if token not in unique_tokens:
-            unique_tokens.append(token)
-    for idx, token_a in enumerate(unique_tokens):
-        for token_b in unique_tokens[idx + 1 :]:
-            state_a, state_b = GLOBAL_CONFLICT_MATRIX.relation(token_a, token_b)
-            severity[token_a].append(_normalize_conflict_state(token_a, token_b, state_a))
-            severity[token_b].append(_normalize_conflict_state(token_b, token_a, state_b))
-    return {token: _state_from_markers(severity.get(token, [])) for token in unique_tokens}
+    if table is None:
+        table = _ConflictTable(tokens)
+    return table.evaluate(tokens)
 
 
 def _reduce_states(states: Sequence[str]) -> str:
@@ -572,62 +613,43 @@ def _apply_midblock_overrides(
 
 
 def _apply_tail_substitution(
-    states: MutableMapping[str, List[str]],
+    timelines: MutableMapping[str, Timeline],
     *,
-    yellow: int,
-    ped_cutoff: int,
+    cycle: Seconds,
+    yellow: Seconds,
+    ped_cutoff: Seconds,
 ) -> None:
     if yellow <= 0 and ped_cutoff <= 0:
         return
-
-    cycle = len(next(iter(states.values()))) if states else 0
-    if cycle == 0:
+    if not timelines or cycle <= 0:
         return
 
-    vehicle_green: List[bool] = [False] * cycle
+    vehicle_green = []
     if ped_cutoff > 0:
-        for movement, timeline in states.items():
-            if movement.startswith(PEDESTRIAN_PREFIX):
-                continue
-            for idx, state in enumerate(timeline):
-                if state in ("G", "g"):
-                    vehicle_green[idx] = True
+        vehicle_green = green_spans(
+            timeline for movement, timeline in timelines.items() if not movement.startswith(PEDESTRIAN_PREFIX)
+        )
 
-    for movement, timeline in states.items():
+    for movement, timeline in timelines.items():
         if movement.startswith(PEDESTRIAN_PREFIX):
             if ped_cutoff <= 0:
                 continue
             # Only trim pedestrian phases that actually overlap a vehicle green; purely
             # pedestrian windows (common for two-stage halves) should retain their full duration.
-            overlaps_vehicle = any(vehicle_green[idx] and timeline[idx] == "G" for idx in range(cycle))
-            if not overlaps_vehicle:
+            if not overlaps(timeline, "G", vehicle_green):
                 continue
-            for idx in range(cycle):
-                nxt = timeline[(idx + 1) % cycle]
-                if timeline[idx] == "G" and nxt == "r":
-                    for back in range(ped_cutoff):
-                        pos = (idx - back) % cycle
-                        if timeline[pos] != "G":
-                            break
-                        timeline[pos] = "r"
+            timelines[movement] = apply_ped_cutoff(timeline, cycle, ped_cutoff)
             continue
 
         if yellow <= 0:
             continue
-        for idx in range(cycle):
-            nxt = timeline[(idx + 1) % cycle]
-            if timeline[idx] in ("G", "g") and nxt == "r":
-                for back in range(yellow):
-                    pos = (idx - back) % cycle
-                    if timeline[pos] not in ("G", "g"):
-                        break
-                    timeline[pos] = "y"
+        timelines[movement] = apply_yellow(timeline, cycle, yellow)
 
 
 def _build_timelines(
     program: _TlProgram,
     links: Sequence[SignalLink],
-) -> Dict[str, List[str]]:
+) -> Dict[str, Timeline]:
     profile = program.profile
     cycle = profile.cycle_s
     if cycle <= 0:
@@ -645,28 +667,28 @@ def _build_timelines(
             continue
         movements_by_base[base].append(movement)
         halves_by_base[base].update(movement_halves.get(movement, set()))
-    movement_states: Dict[str, List[str]] = {
-        movement: ["r"] * cycle for movement in movements
-    }
+    phase_states: List[Dict[str, str]] = []
 
     catalog = MovementCatalog(movements)
 
-    available_movements = list(movements)
-    time_cursor = 0
-
-    for idx, phase in enumerate(profile.phases):
-        phase_tokens = _expand_phase_tokens(
+    tokens_by_phase = [
+        _expand_phase_tokens(
             phase.allow_movements,
             catalog,
             profile_id=getattr(profile, "id", None),
             phase_index=idx,
             tl_id=program.tl_id,
         )
+        for idx, phase in enumerate(profile.phases)
+    ]
+    conflicts = _ConflictTable(token.canonical for phase_tokens in tokens_by_phase for token in phase_tokens)
+
+    for phase, phase_tokens in zip(profile.phases, tokens_by_phase):
         midblock_ped_allow = (
             _midblock_ped_allowances(phase.allow_movements) if program.is_midblock else set()
         )
         canonical_order = [token.canonical for token in phase_tokens]
-        token_states = _evaluate_conflicts(canonical_order)
+        token_states = _evaluate_conflicts(canonical_order, conflicts)
 
         movement_phase_states: Dict[str, List[str]] = defaultdict(list)
         movement_granted_halves: Dict[str, Set[str]] = defaultdict(set)
@@ -731,72 +753,76 @@ def _build_timelines(
                         if phase_state.get(name) != "r":
                             phase_state[name] = "G"
 
-        for offset in range(phase.duration_s):
-            slot = (time_cursor + offset) % cycle
-            for movement in movements:
-                movement_states[movement][slot] = phase_state.get(movement, "r")
-        time_cursor = (time_cursor + phase.duration_s) % cycle
+        phase_states.append(phase_state)
 
+    segments = paint_phases(cycle, [phase.duration_s for phase in profile.phases])
+    timelines: Dict[str, Timeline] = {
+        movement: build_timeline(
+            segments,
+            lambda index, movement=movement: "r" if index is None else phase_states[index].get(movement, "r"),
+        )
+        for movement in movements
+    }
     _apply_tail_substitution(
-        movement_states,
+        timelines,
+        cycle=cycle,
         yellow=profile.yellow_duration_s,
         ped_cutoff=profile.ped_early_cutoff_s,
     )
 
-    return movement_states
+    return timelines
 
 
 def _timelines_to_phases(
     movements: Sequence[str],
-    timelines: Mapping[str, List[str]],
-) -> List[tuple[int, str]]:
-    if not movements:
-        return []
-
-    cycle = len(next(iter(timelines.values()))) if timelines else 0
-    if cycle == 0:
+    timelines: Mapping[str, Timeline],
+    cycle: Seconds,
+) -> List[Tuple[Seconds, str]]:
+    if not movements or not timelines:
         return []
+    return to_phases([timelines[mv] for mv in movements], cycle)
 
-    ordered_timelines = [timelines[mv] for mv in movements]
-    phases: List[tuple[int, str]] = []
-    current_state: str | None = None
-    current_duration = 0
-
-    for second in range(cycle):
-        state = "".join(timeline[second] for timeline in ordered_timelines)
-        if current_state is None:
-            current_state = state
-            current_duration = 1
-            continue
-        if state == current_state:
-            current_duration += 1
-        else:
-            phases.append((current_duration, current_state))
-            current_state = state
-            current_duration = 1
 
-    if current_state is not None:
-        phases.append((current_duration, current_state))
+# Everything _build_timelines reads from a program except its id and offset.
+_ProgramSignature = Tuple[str, str, Tuple[str, ...], bool, bool, bool]
 
-    # Merge adjacent duplicates after wrap-around
-    if len(phases) >= 2 and phases[0][1] == phases[-1][1]:
-        merged_duration = phases[0][0] + phases[-1][0]
-        phases = [(merged_duration, phases[0][1])] + phases[1:-1]
 
-    return phases
+def _program_signature(program: _TlProgram, links: Sequence[SignalLink]) -> _ProgramSignature:
+    profile = program.profile
+    return (
+        profile.kind.value,
+        profile.id,
+        tuple(link.movement for link in links),
+        program.refuge_island_on_main,
+        program.two_stage_tll_control,
+        program.is_midblock,
+    )
 
 
-def _render_tl_logic(program: _TlProgram, links: Sequence[SignalLink]) -> List[str]:
-    timelines = _build_timelines(program, links)
-    movements = [link.movement for link in links]
-    phases = _timelines_to_phases(movements, timelines)
+def _render_tl_logic(
+    program: _TlProgram,
+    links: Sequence[SignalLink],
+    memo: MutableMapping[_ProgramSignature, List[Tuple[Seconds, str]]] | None = None,
+) -> List[str]:
+    """Render one ``<tlLogic>``; with ``memo``, identical programs reuse their phase list."""
+
+    signature = _program_signature(program, links)
+    phases = memo.get(signature) if memo is not None else None
+    if phases is None:
+        timelines = _build_timelines(program, links)
+        movements = [link.movement for link in links]
+        phases = _timelines_to_phases(movements, timelines, program.profile.cycle_s)
+        if memo is not None:
+            memo[signature] = phases
+    else:
+        LOG.debug("[TLS] %s reuses the phases of an identical program (profile=%s)", program.tl_id, program.profile.id)
 
     lines: List[str] = []
     lines.append(
         f'    <tlLogic id="{program.tl_id}" type="static" programID="0" offset="{program.offset}">'  # noqa: E501
     )
     for duration, state in phases:
-        lines.append(f'        <phase duration="{duration}" state="{state}"/>')
+        lines.append(f'        <phase duration="{format_seconds(duration)}" state="{state}"/>')
     lines.append("    </tlLogic>")
     return lines
 
@@ -815,33 +841,60 @@ def render_tll_xml(
 ) -> str:
     """Render a ``1-generated.tll.xml`` document with deterministic ordering."""
 
+    lines = iter_tll_xml(
+        defaults=defaults,
+        clusters=clusters,
+        breakpoints=breakpoints,
+        snap_rule=snap_rule,
+        main_road=main_road,
+        lane_overrides=lane_overrides,
+        signal_profiles_by_kind=signal_profiles_by_kind,
+        connection_links=connection_links,
+        controlled_connections=controlled_connections,
+    )
+    return "\n".join(lines) + "\n"
+
+
+def iter_tll_xml(
+    *,
+    defaults: Defaults,
+    clusters: Sequence[Cluster],
+    breakpoints: Sequence[int],
+    snap_rule: SnapRule,
+    main_road: MainRoadConfig,
+    lane_overrides: Sequence[LaneOverride],
+    signal_profiles_by_kind: Dict[str, Dict[str, SignalProfileDef]],
+    connection_links: Sequence[SignalLink],
+    controlled_connections: Sequence[ControlledConnection],
+) -> Iterator[str]:
+    """Yield the tlLogics document line by line (without line terminators)."""
+
     _ = (defaults, breakpoints, snap_rule, main_road, lane_overrides)
 
     programs = _collect_programs(clusters, signal_profiles_by_kind)
     links_by_tl = _group_links_by_tl(connection_links)
     controlled_by_tl = _group_controlled_connections(controlled_connections)
 
-    lines: List[str] = [
+    yield (
         '<tlLogics version="1.20" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
         'xsi:noNamespaceSchemaLocation="http://sumo.dlr.de/xsd/tllogic_file.xsd">'
-    ]
+    )
 
+    phases_by_signature: Dict[_ProgramSignature, List[Tuple[Seconds, str]]] = {}
     for tl_id in sorted(links_by_tl):
         if tl_id not in programs:
             continue
         program = programs[tl_id]
-        tl_lines = _render_tl_logic(program, links_by_tl[tl_id])
-        lines.extend(tl_lines)
+        yield from _render_tl_logic(program, links_by_tl[tl_id], phases_by_signature)
 
     for tl_id in sorted(controlled_by_tl):
         if tl_id not in programs:
             continue
         for conn in controlled_by_tl[tl_id]:
-            lines.append(
+            yield (
                 f'    <connection from="{conn.from_edge}" to="{conn.to_edge}" '
                 f'fromLane="{conn.from_lane}" toLane="{conn.to_lane}" '
                 f'tl="{conn.tl_id}" linkIndex="{conn.link_index}"/>'
             )
 
-    lines.append("</tlLogics>")
-    return "\n".join(lines)
+    yield "</tlLogics>"
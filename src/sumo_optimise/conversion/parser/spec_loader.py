@@ -6,7 +6,7 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from jsonschema import Draft7Validator  # type: ignore
 
@@ -36,6 +36,7 @@ from ..utils.errors import (
 )
 from ..utils.movements import canonical_lane_label
 from ..utils.logging import get_logger
+from ..utils.memo import digest_json
 
 LOG = get_logger()
 
@@ -69,15 +70,57 @@ def load_json_file(json_path: Path) -> Dict:
     return spec_json
 
 
+# Process-wide validation caches. Schema dicts returned by load_schema_file are
+# shared between builds and must be treated as read-only. Each schema file keeps
+# one (stamp, schema, digest) entry, replaced when the file changes.
+_SCHEMA_FILES: Dict[Path, Tuple[Tuple[int, int], Dict, str]] = {}
+_VALIDATORS: Dict[str, Draft7Validator] = {}
+_VALIDATED_SPECS: Set[Tuple[str, str]] = set()
+_VALIDATED_SPECS_LIMIT = 4096
+
+
+def clear_validation_caches() -> None:
+    _SCHEMA_FILES.clear()
+    _VALIDATORS.clear()
+    _VALIDATED_SPECS.clear()
+
+
 def load_schema_file(schema_path: Path) -> Dict:
-    if not schema_path.exists():
-        raise SchemaFileNotFound(f"Schema not found: {schema_path}")
+    """Load a schema, re-reading the file only when its mtime or size changed."""
+
+    try:
+        stat = schema_path.stat()
+    except FileNotFoundError:
+        raise SchemaFileNotFound(f"Schema not found: {schema_path}") from None
+    cache_key = schema_path.resolve()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _SCHEMA_FILES.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
     with schema_path.open("r", encoding="utf-8") as f:
         schema_json = json.load(f)
+    _SCHEMA_FILES[cache_key] = (stamp, schema_json, digest_json(schema_json))
     LOG.info("loaded Schema: %s", schema_path)
     return schema_json
 
 
+def _schema_digest(schema_json: Dict) -> str:
+    """Digest recorded when the schema file was loaded; other dicts are hashed per call."""
+
+    for _, loaded, digest in _SCHEMA_FILES.values():
+        if loaded is schema_json:
+            return digest
+    return digest_json(schema_json)
+
+
+def _validator_for(schema_json: Dict, schema_key: str) -> Draft7Validator:
+    validator = _VALIDATORS.get(schema_key)
+    if validator is None:
+        validator = Draft7Validator(schema_json)
+        _VALIDATORS[schema_key] = validator
+    return validator
+
+
 def _format_json_path(path_iterable) -> str:
     parts: List[str] = ["root"]
     for p in path_iterable:
@@ -89,9 +132,19 @@ def _format_json_path(path_iterable) -> str:
 
 
 def validate_json_schema(spec_json: Dict, schema_json: Dict) -> None:
-    validator = Draft7Validator(schema_json)
+    """Validate ``spec_json``; the compiled validator and passing specs are cached per process."""
+
+    schema_key = _schema_digest(schema_json)
+    validated_key = (schema_key, digest_json(spec_json))
+    if validated_key in _VALIDATED_SPECS:
+        LOG.info("schema validation: PASSED (cached)")
+        return
+    validator = _validator_for(schema_json, schema_key)
     errors = sorted(validator.iter_errors(spec_json), key=lambda e: (list(e.path), list(e.schema_path)))
     if not errors:
+        if len(_VALIDATED_SPECS) >= _VALIDATED_SPECS_LIMIT:
+            _VALIDATED_SPECS.clear()
+        _VALIDATED_SPECS.add(validated_key)
         LOG.info("schema validation: PASSED")
         return
     LOG.error("[SCH] schema validation: FAILED (count=%d)", len(errors))
@@ -160,6 +213,13 @@ def parse_signal_ref(obj: Optional[Dict]) -> Optional[SignalRef]:
     return SignalRef(profile_id=str(obj["profile_id"]), offset_s=int(obj["offset_s"]))
 
 
+def _seconds(value) -> int | float:
+    """Whole seconds stay ``int``; fractional signal timings are kept as ``float``."""
+
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
 def parse_signal_profiles(spec_json: Dict) -> Dict[str, Dict[str, SignalProfileDef]]:
     profiles_by_kind: Dict[str, Dict[str, SignalProfileDef]] = {
         EventKind.TEE.value: {},
@@ -171,7 +231,7 @@ def parse_signal_profiles(spec_json: Dict) -> Dict[str, Dict[str, SignalProfileD
 
     def add_profile(kind: str, p: Dict, idx: int) -> None:
         pid = str(p["id"])
-        cycle = int(p["cycle_s"])
+        cycle = _seconds(p["cycle_s"])
         ped_early_cutoff_raw = p.get("ped_early_cutoff_s")
         if ped_early_cutoff_raw is None:
             scope = "midblock crossings" if kind == EventKind.XWALK_MIDBLOCK.value else "intersections"
@@ -180,7 +240,7 @@ def parse_signal_profiles(spec_json: Dict) -> Dict[str, Dict[str, SignalProfileD
             )
             ped_early_cutoff = 0
         else:
-            ped_early_cutoff = int(ped_early_cutoff_raw)
+            ped_early_cutoff = _seconds(ped_early_cutoff_raw)
         yellow_duration_raw = p.get("yellow_duration_s")
         if yellow_duration_raw is None:
             errors.append(
@@ -188,13 +248,13 @@ def parse_signal_profiles(spec_json: Dict) -> Dict[str, Dict[str, SignalProfileD
             )
             yellow_duration = 0
         else:
-            yellow_duration = int(yellow_duration_raw)
+            yellow_duration = _seconds(yellow_duration_raw)
         movement_re = MIDBLOCK_MOVEMENT_RE if kind == EventKind.XWALK_MIDBLOCK.value else INTERSECTION_MOVEMENT_RE
         phases_data = p.get("phases", [])
         phases: List[SignalPhaseDef] = []
         sum_dur = 0
         for ph in phases_data:
-            dur = int(ph["duration_s"])
+            dur = _seconds(ph["duration_s"])
             amv_list = list(ph.get("allow_movements", []))
             bad = [m for m in amv_list if not movement_re.match(str(m))]
             if bad:
@@ -228,7 +288,7 @@ def parse_signal_profiles(spec_json: Dict) -> Dict[str, Dict[str, SignalProfileD
                 f"profile={pid} kind={kind} cycle_s={cycle} value={yellow_duration}"
             )
         effective_cycle = sum_dur
-        if effective_cycle != cycle:
+        if abs(effective_cycle - cycle) > 1e-6:
             errors.append(
                 "[VAL] E302 cycle mismatch in profile="
                 f"{pid} kind={kind}: sum(phases)={sum_dur} != cycle_s={cycle}"
@@ -2,23 +2,35 @@
 from __future__ import annotations
 
 import shutil
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import astuple, dataclass
+from functools import partial
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 from .builder.ids import cluster_id
 from .checks.semantics import validate_semantics
 from .demand.catalog import build_endpoint_catalog
-from .demand.person_flow import PersonRouteResult, prepare_person_flow_routes
+from .demand.od_matrix import save_od_matrices
+from .demand.person_flow import (
+    PersonRouteResult,
+    compute_person_unit_od,
+    compute_person_walks,
+    render_person_flow_routes,
+)
 from .demand.person_flow.graph_builder import build_pedestrian_graph
+from .demand.person_flow.identifier import canonical_ped_endpoint_id
 from .demand.person_flow.templates import write_demand_templates
-from .demand.routes import render_routes_document
-from .demand.vehicle_flow import VehicleRouteResult, prepare_vehicle_routes
+from .demand.person_flow.walks import check_walks_against_net
+from .demand.routes import RouteEntry, iter_routes_document, render_routes_document
+from .demand.segments import ProfileWindow, load_demand_profile
+from .demand.vehicle_flow import VehicleRouteResult, compute_vehicle_unit_od, render_vehicle_routes
 from .demand.visualization import render_pedestrian_network_image
-from .domain.models import BuildOptions, BuildResult, BuildTask, EndpointCatalog
-from .emitters.connections import render_connections_xml
-from .emitters.edges import render_edges_xml
-from .emitters.nodes import render_nodes_xml
-from .emitters.tll import render_tll_xml
+from .domain.models import BuildOptions, BuildResult, BuildTask, DemandOptions, EndpointCatalog
+from .emitters.connections import iter_connections_xml, render_connections_document, render_connections_xml
+from .emitters.edges import collect_edges, iter_edges_xml, render_edges_document
+from .emitters.nodes import iter_nodes_xml, render_nodes_xml
+from .emitters.tll import iter_tll_xml, render_tll_xml
 from .parser.spec_loader import (
     build_clusters,
     load_json_file,
@@ -35,49 +47,37 @@ from .sumo_integration.netconvert import run_two_step_netconvert
 from .sumo_integration.netedit import launch_netedit
 from .sumo_integration.sumo_gui import launch_sumo_gui
 from .utils.io import (
+    BuildArtifacts,
+    XmlPayload,
+    compressed_path,
     ensure_output_directory,
     persist_routes,
     persist_xml,
     write_manifest,
     write_sumocfg,
 )
+from .utils.json_patch import apply_json_patch
 from .utils.logging import configure_logger, get_logger
+from .utils.memo import StageCache, digest_file, digest_json
 
 LOG = get_logger()
 
 
-def build_corridor_artifacts(spec_path: Path, options: BuildOptions) -> BuildResult:
-    spec_json = load_json_file(spec_path)
-    schema_json = load_schema_file(options.schema_path)
-    validate_json_schema(spec_json, schema_json)
+@dataclass(frozen=True)
+class _Stage:
+    deps: Tuple[str, ...]
+    fn: Callable[..., Any]
+    persist: bool = True
 
-    snap_rule = parse_snap_rule(spec_json)
-    defaults = parse_defaults(spec_json)
-    main_road = parse_main_road(spec_json)
-    signal_profiles_by_kind = parse_signal_profiles(spec_json)
 
-    validate_semantics(
-        spec_json=spec_json,
-        snap_rule=snap_rule,
-        main_road=main_road,
-        signal_profiles_by_kind=signal_profiles_by_kind,
-    )
-
-    layout_events = parse_layout_events(spec_json, snap_rule, main_road)
-    clusters = build_clusters(layout_events)
+def _lane_plan(main_road, clusters, snap_rule):
     lane_overrides = compute_lane_overrides(main_road, clusters, snap_rule)
     breakpoints, reason_by_pos = collect_breakpoints_and_reasons(main_road, clusters, lane_overrides, snap_rule)
+    return lane_overrides, breakpoints, reason_by_pos
 
-    endpoint_catalog = build_endpoint_catalog(
-        defaults=defaults,
-        main_road=main_road,
-        clusters=clusters,
-        breakpoints=breakpoints,
-        lane_overrides=lane_overrides,
-        snap_rule=snap_rule,
-    )
 
-    junction_ids = sorted(
+def _junction_ids(clusters) -> list[str]:
+    return sorted(
         {
             cluster_id(cluster.pos_m)
             for cluster in clusters
@@ -85,111 +85,472 @@ def build_corridor_artifacts(spec_path: Path, options: BuildOptions) -> BuildRes
         }
     )
 
-    ped_endpoint_ids: list[str] | None = None
-    veh_endpoint_ids: list[str] | None = None
-    ped_graph = None
-    if options.generate_demand_templates:
-        ped_graph = build_pedestrian_graph(
-            main_road=main_road,
-            defaults=defaults,
-            clusters=clusters,
-            breakpoints=breakpoints,
-            catalog=endpoint_catalog,
-        )
-        ped_endpoint_ids = sorted(
-            {
-                _canonical_endpoint_id(node_id, breakpoints)
-            for node_id, data in ped_graph.nodes(data=True)
-            if data.get("is_endpoint")
-            }
-        )
-        veh_endpoint_ids = _vehicle_template_ids(endpoint_catalog, breakpoints)
-
-    nodes_xml = render_nodes_xml(main_road, defaults, clusters, breakpoints, reason_by_pos)
-    edges_xml = render_edges_xml(main_road, defaults, clusters, breakpoints, lane_overrides)
-    connections_result = render_connections_xml(
-        defaults,
-        clusters,
-        breakpoints,
-        snap_rule,
-        main_road,
-        lane_overrides,
-    )
-    tll_xml = render_tll_xml(
+
+def _ped_endpoint_ids(ped_graph, breakpoints) -> list[str]:
+    return sorted({canonical_ped_endpoint_id(node_id, breakpoints) for node_id in ped_graph.endpoint_ids()})
+
+
+_NODES_DEPS = ("main_road", "defaults", "clusters", "breakpoints", "reason_by_pos")
+_TLL_DEPS = (
+    "defaults",
+    "clusters",
+    "breakpoints",
+    "snap_rule",
+    "main_road",
+    "lane_overrides",
+    "signal_profiles",
+    "connections",
+)
+
+
+def _tll_kwargs(defaults, clusters, breakpoints, snap_rule, main_road, lane_overrides, profiles, connections):
+    return dict(
         defaults=defaults,
         clusters=clusters,
         breakpoints=breakpoints,
         snap_rule=snap_rule,
         main_road=main_road,
         lane_overrides=lane_overrides,
-        signal_profiles_by_kind=signal_profiles_by_kind,
-        connection_links=connections_result.links,
-        controlled_connections=connections_result.controlled_connections,
+        signal_profiles_by_kind=profiles,
+        connection_links=connections.links,
+        controlled_connections=connections.controlled_connections,
     )
 
-    demand_xml = None
-    person_routes: PersonRouteResult | None = None
-    vehicle_routes: VehicleRouteResult | None = None
-    if options.demand:
-        person_routes = prepare_person_flow_routes(
-            options=options.demand,
-            main_road=main_road,
+
+# Build DAG. Sources are the spec sections and the demand inputs; a stage's cache
+# key is derived from the digests of its transitive sources, so editing one
+# section only recomputes the stages downstream of it (e.g. signal_profiles ->
+# tll_xml). ``persist=False`` marks stages that are cheaper to recompute than to
+# unpickle.
+_STAGES: Dict[str, _Stage] = {
+    "snap_rule": _Stage(("spec.snap",), lambda snap: parse_snap_rule({"snap": snap}), persist=False),
+    "defaults": _Stage(("spec.defaults",), lambda d: parse_defaults({"defaults": d}), persist=False),
+    "main_road": _Stage(("spec.main_road",), lambda mr: parse_main_road({"main_road": mr}), persist=False),
+    "signal_profiles": _Stage(
+        ("spec.signal_profiles",),
+        lambda sp: parse_signal_profiles({"signal_profiles": sp}),
+        persist=False,
+    ),
+    "clusters": _Stage(
+        ("spec.layout", "snap_rule", "main_road"),
+        lambda layout, snap_rule, main_road: build_clusters(
+            parse_layout_events({"layout": layout}, snap_rule, main_road)
+        ),
+        persist=False,
+    ),
+    "junction_ids": _Stage(("clusters",), _junction_ids, persist=False),
+    "lane_plan": _Stage(("main_road", "clusters", "snap_rule"), _lane_plan),
+    "lane_overrides": _Stage(("lane_plan",), lambda plan: plan[0], persist=False),
+    "breakpoints": _Stage(("lane_plan",), lambda plan: plan[1], persist=False),
+    "reason_by_pos": _Stage(("lane_plan",), lambda plan: plan[2], persist=False),
+    "endpoint_catalog": _Stage(
+        ("defaults", "main_road", "clusters", "breakpoints", "lane_overrides", "snap_rule"),
+        lambda defaults, main_road, clusters, breakpoints, lane_overrides, snap_rule: build_endpoint_catalog(
             defaults=defaults,
+            main_road=main_road,
             clusters=clusters,
             breakpoints=breakpoints,
-            catalog=endpoint_catalog,
-        )
-        vehicle_routes = prepare_vehicle_routes(
-            options=options.demand,
+            lane_overrides=lane_overrides,
+            snap_rule=snap_rule,
+        ),
+    ),
+    "ped_graph": _Stage(
+        ("main_road", "defaults", "clusters", "breakpoints", "endpoint_catalog"),
+        lambda main_road, defaults, clusters, breakpoints, catalog: build_pedestrian_graph(
             main_road=main_road,
             defaults=defaults,
             clusters=clusters,
             breakpoints=breakpoints,
-            catalog=endpoint_catalog,
-            edges_xml=edges_xml,
-            connections_xml=connections_result.xml,
-        )
-        demand_xml = render_routes_document(
-            person_entries=person_routes.entries if person_routes else None,
-            vehicle_entries=vehicle_routes.entries if vehicle_routes else None,
-        )
+            catalog=catalog,
+        ),
+    ),
+    "ped_endpoint_ids": _Stage(("ped_graph", "breakpoints"), _ped_endpoint_ids, persist=False),
+    "veh_endpoint_ids": _Stage(
+        ("endpoint_catalog", "breakpoints"),
+        lambda catalog, breakpoints: _vehicle_template_ids(catalog, breakpoints),
+        persist=False,
+    ),
+    "nodes_xml": _Stage(_NODES_DEPS, render_nodes_xml),
+    "edges": _Stage(("main_road", "clusters", "breakpoints", "lane_overrides"), collect_edges),
+    "edges_xml": _Stage(("edges", "defaults"), render_edges_document),
+    "connections": _Stage(
+        ("defaults", "clusters", "breakpoints", "snap_rule", "main_road", "lane_overrides"),
+        partial(render_connections_xml, materialize=False),
+    ),
+    "connections_xml": _Stage(
+        ("connections",),
+        lambda connections: render_connections_document(connections.elements),
+    ),
+    "tll_xml": _Stage(_TLL_DEPS, lambda *args: render_tll_xml(**_tll_kwargs(*args))),
+    # Propagation is keyed on the demand CSVs only; the time windows and scales
+    # enter at render time, so scale sweeps reuse the cached unit OD.
+    "person_od": _Stage(
+        ("demand.ped.od", "ped_graph"),
+        lambda demand, ped_graph: compute_person_unit_od(options=demand, graph=ped_graph),
+    ),
+    # Keyed on the walks flag alone; without it this stage is an empty mapping.
+    "person_walks": _Stage(
+        ("person_od", "demand.ped.walks", "ped_graph", "defaults", "breakpoints"),
+        lambda unit_od, demand, ped_graph, defaults, breakpoints: compute_person_walks(
+            unit_od, options=demand, graph=ped_graph, defaults=defaults, breakpoints=breakpoints
+        ),
+    ),
+    "person_routes": _Stage(
+        ("person_od", "person_walks", "demand.ped", "demand.profile", "defaults", "breakpoints"),
+        lambda unit_od, walks, demand, profile, defaults, breakpoints: render_person_flow_routes(
+            unit_od, options=demand, defaults=defaults, breakpoints=breakpoints, walks=walks, profile=profile
+        ),
+    ),
+    "vehicle_od": _Stage(
+        ("demand.veh.od", "breakpoints", "clusters", "edges", "connections"),
+        lambda demand, breakpoints, clusters, edges, connections: compute_vehicle_unit_od(
+            options=demand,
+            breakpoints=breakpoints,
+            clusters=clusters,
+            edges=edges,
+            connections=connections.connections,
+        ),
+    ),
+    "vehicle_routes": _Stage(
+        ("vehicle_od", "demand.veh", "demand.profile"),
+        lambda unit_od, demand, profile: render_vehicle_routes(unit_od, options=demand, profile=profile),
+    ),
+}
+
+
+class _BuildGraph:
+    """Lazily evaluates :data:`_STAGES`, consulting the memo cache for persisted stages.
+
+    Keys only depend on source digests, so a cache hit never evaluates the
+    stage's dependencies.
+    """
+
+    def __init__(self, sources: Dict[str, Tuple[Any, str]], cache: StageCache) -> None:
+        self._sources = sources
+        self._cache = cache
+        self._keys: Dict[str, str] = {}
+        self._values: Dict[str, Any] = {}
+        self.computed: list[str] = []
+
+    def key(self, name: str) -> str:
+        if name in self._sources:
+            return self._sources[name][1]
+        if name not in self._keys:
+            stage = _STAGES[name]
+            self._keys[name] = self._cache.key(name, [self.key(dep) for dep in stage.deps])
+        return self._keys[name]
+
+    def _lookup(self, name: str) -> bool:
+        """Resolve ``name`` from the sources, this build or the cache; False on a miss."""
+
+        if name in self._sources or name in self._values:
+            return True
+        stage = _STAGES[name]
+        key = self.key(name)
+        hit, value = self._cache.recall(name, key)
+        if not hit and stage.persist and self._cache.enabled:
+            hit, value = self._cache.load(name, key)
+        if hit:
+            self._cache.remember(name, key, value)
+            self._values[name] = value
+        return hit
+
+    def _finish(self, name: str, value: Any) -> None:
+        key = self.key(name)
+        self.computed.append(name)
+        if _STAGES[name].persist and self._cache.enabled:
+            self._cache.store(name, key, value)
+        self._cache.remember(name, key, value)
+        self._values[name] = value
+
+    def value(self, name: str) -> Any:
+        if name in self._sources:
+            return self._sources[name][0]
+        if not self._lookup(name):
+            stage = _STAGES[name]
+            self._finish(name, stage.fn(*(self.value(dep) for dep in stage.deps)))
+        return self._values[name]
+
+    def _plan(self, name: str, todo: list[str]) -> None:
+        if name in todo or self._lookup(name):
+            return
+        for dep in _STAGES[name].deps:
+            self._plan(dep, todo)
+        todo.append(name)
+
+    def resolve(self, names: Sequence[str], executor: Optional[Executor] = None) -> None:
+        """Evaluate ``names``; with an executor, independent persisted stages run concurrently.
+
+        Persisted stages (the emitters and route builders) are submitted to the
+        executor as soon as their dependencies are available; the cheap
+        ``persist=False`` stages run inline.
+        """
+
+        if executor is None:
+            for name in names:
+                self.value(name)
+            return
+        remaining: list[str] = []
+        for name in names:
+            self._plan(name, remaining)
+        running: Dict[Future, str] = {}
+        while remaining or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name in list(remaining):
+                    stage = _STAGES[name]
+                    if not all(dep in self._sources or dep in self._values for dep in stage.deps):
+                        continue
+                    remaining.remove(name)
+                    args = [self.value(dep) for dep in stage.deps]
+                    if stage.persist:
+                        running[executor.submit(_run_stage, name, args)] = name
+                    else:
+                        self._finish(name, stage.fn(*args))
+                        progressed = True
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._finish(running.pop(future), future.result())
+
+
+def _run_stage(name: str, args: Sequence[Any]) -> Any:
+    return _STAGES[name].fn(*args)
+
+
+def _demand_od_digest(options: Optional[DemandOptions], *, kind: str) -> str:
+    """Digest of the demand CSVs that feed OD propagation."""
+
+    if options is None:
+        return "none"
+    if kind == "ped":
+        files = (options.ped_endpoint_csv, options.ped_junction_turn_weight_csv)
+    else:
+        files = (options.veh_endpoint_csv, options.veh_junction_turn_weight_csv)
+    return digest_json([digest_file(path) if path is not None else None for path in files])
+
+
+def _demand_window_digest(options: Optional[DemandOptions], *, kind: str) -> str:
+    """Digest of the segment windows and scales applied when rendering routes."""
+
+    if options is None:
+        return "none"
+    if kind == "ped":
+        scales = (options.ped_unsat_scale, options.ped_sat_scale)
+    else:
+        scales = (options.veh_unsat_scale, options.veh_sat_scale)
+    return digest_json(
+        [
+            options.simulation_end_time,
+            options.warmup_seconds,
+            options.unsat_seconds,
+            options.sat_seconds,
+            scales,
+            options.explicit_vehicle_routes if kind == "veh" else None,
+        ]
+    )
+
+
+def _build_sources(spec_json: Dict, options: BuildOptions) -> Dict[str, Tuple[Any, str]]:
+    sources: Dict[str, Tuple[Any, str]] = {}
+    for section in ("snap", "defaults", "main_road", "signal_profiles", "layout"):
+        value = spec_json.get(section)
+        sources[f"spec.{section}"] = (value, digest_json(value))
+    for kind in ("ped", "veh"):
+        sources[f"demand.{kind}.od"] = (options.demand, _demand_od_digest(options.demand, kind=kind))
+        sources[f"demand.{kind}"] = (options.demand, _demand_window_digest(options.demand, kind=kind))
+    walks = bool(options.demand and options.demand.explicit_pedestrian_walks)
+    sources["demand.ped.walks"] = (options.demand, digest_json(walks))
+    profile = _demand_profile(options.demand)
+    windows = None if profile is None else [astuple(window) for window in profile]
+    sources["demand.profile"] = (profile, digest_json(windows))
+    return sources
+
+
+def _demand_profile(options: Optional[DemandOptions]) -> Optional[list[ProfileWindow]]:
+    """Parse the demand profile once per build; both route stages share the windows."""
+
+    if options is None or options.demand_profile_csv is None:
+        return None
+    return load_demand_profile(options.demand_profile_csv, simulation_end_time=options.simulation_end_time)
+
+
+def _route_stages(demand: DemandOptions) -> list[str]:
+    """Route stages to resolve; without pedestrian CSVs the pedestrian graph is never built."""
+
+    if demand.ped_endpoint_csv and demand.ped_junction_turn_weight_csv:
+        return ["person_routes", "vehicle_routes"]
+    return ["vehicle_routes"]
+
+
+def _route_results(
+    graph: _BuildGraph, stages: Sequence[str]
+) -> Tuple[Optional[PersonRouteResult], Optional[VehicleRouteResult]]:
+    person_routes = graph.value("person_routes") if "person_routes" in stages else None
+    return person_routes, graph.value("vehicle_routes")
+
+
+def _route_entries(
+    person_routes: Optional[PersonRouteResult], vehicle_routes: Optional[VehicleRouteResult]
+) -> Dict[str, Optional[Iterator[RouteEntry]]]:
+    """Fresh entry iterators over both results; entries render per segment as they are consumed."""
+
+    return dict(
+        person_entries=person_routes.iter_entries() if person_routes else None,
+        vehicle_entries=vehicle_routes.iter_entries() if vehicle_routes else None,
+    )
+
+
+def _has_route_entries(*results: Optional[PersonRouteResult | VehicleRouteResult]) -> bool:
+    """Whether any result yields an entry; stops rendering at the first one."""
+
+    return any(result is not None and next(result.iter_entries(), None) is not None for result in results)
+
+
+def _iter_routes_lines(
+    person_routes: Optional[PersonRouteResult], vehicle_routes: Optional[VehicleRouteResult]
+) -> Iterator[str]:
+    return iter_routes_document(**_route_entries(person_routes, vehicle_routes))
+
+
+def build_corridor_artifacts(spec_path: Path, options: BuildOptions) -> BuildResult:
+    spec_json = load_json_file(spec_path)
+    schema_json = load_schema_file(options.schema_path)
+    cache = StageCache(options.cache_dir)
+    if options.stage_workers <= 1:
+        return _build_from_json(spec_json, schema_json, options, cache)
+    with ProcessPoolExecutor(max_workers=options.stage_workers) as executor:
+        return _build_from_json(spec_json, schema_json, options, cache, executor)
+
+
+def build_routes_document(
+    spec_path: Path, options: BuildOptions, *, cache: Optional[StageCache] = None
+) -> Optional[str]:
+    """Render only the routes document for ``options.demand``.
+
+    Only the stages the person/vehicle routes depend on are evaluated; the
+    PlainXML emitters are skipped. Returns ``None`` without demand. Pass
+    ``cache`` to read its counters afterwards; it defaults to a cache on
+    ``options.cache_dir``.
+    """
+
+    if not options.demand:
+        return None
+    cache = cache or StageCache(options.cache_dir)
+    graph = _validated_graph(load_json_file(spec_path), load_schema_file(options.schema_path), options, cache)
+    stages = _route_stages(options.demand)
+    graph.resolve(stages)
+    return render_routes_document(**_route_entries(*_route_results(graph, stages)))
+
+
+def _validated_graph(spec_json: Dict, schema_json: Dict, options: BuildOptions, cache: StageCache) -> _BuildGraph:
+    validate_json_schema(spec_json, schema_json)
+    graph = _BuildGraph(_build_sources(spec_json, options), cache)
+
+    validate_semantics(
+        spec_json=spec_json,
+        snap_rule=graph.value("snap_rule"),
+        main_road=graph.value("main_road"),
+        signal_profiles_by_kind=graph.value("signal_profiles"),
+    )
+    return graph
+
+
+def _build_from_json(
+    spec_json: Dict,
+    schema_json: Dict,
+    options: BuildOptions,
+    cache: StageCache,
+    executor: Optional[Executor] = None,
+) -> BuildResult:
+    cache_bytes_before = cache.bytes_written
+    graph = _validated_graph(spec_json, schema_json, options, cache)
+
+    if options.stream_xml:
+        targets = list(dict.fromkeys([*_NODES_DEPS, "edges", *_TLL_DEPS, "junction_ids"]))
+    else:
+        targets = ["nodes_xml", "edges_xml", "connections_xml", "tll_xml", "connections", "junction_ids", "defaults"]
+    if options.generate_demand_templates:
+        targets += ["ped_graph", "ped_endpoint_ids", "veh_endpoint_ids"]
+    if options.demand:
+        targets += _route_stages(options.demand)
+    graph.resolve(targets, executor)
+
+    ped_endpoint_ids: list[str] | None = None
+    veh_endpoint_ids: list[str] | None = None
+    ped_graph = None
+    if options.generate_demand_templates:
+        ped_graph = graph.value("ped_graph")
+        ped_endpoint_ids = graph.value("ped_endpoint_ids")
+        veh_endpoint_ids = graph.value("veh_endpoint_ids")
+
+    connections_result = graph.value("connections")
+
+    xml_streams = _xml_streams(graph) if options.stream_xml else None
+    demand_xml = None
+    od_matrices = None
+    pedestrian_walks = None
+    if options.demand:
+        person_routes, vehicle_routes = _route_results(graph, _route_stages(options.demand))
+        if xml_streams is None:
+            demand_xml = render_routes_document(**_route_entries(person_routes, vehicle_routes))
+        elif _has_route_entries(person_routes, vehicle_routes):
+            demand_xml = ""
+            xml_streams["demand"] = partial(_iter_routes_lines, person_routes, vehicle_routes)
+        od_matrices = {
+            kind: routes.od_matrix
+            for kind, routes in (("person", person_routes), ("vehicle", vehicle_routes))
+            if routes is not None and routes.od_matrix is not None
+        }
+        if person_routes is not None and person_routes.walks:
+            pedestrian_walks = person_routes.walks
 
-    return BuildResult(
-        nodes_xml=nodes_xml,
-        edges_xml=edges_xml,
-        connections_xml=connections_result.xml,
+    result = BuildResult(
+        nodes_xml="" if xml_streams else graph.value("nodes_xml"),
+        edges_xml="" if xml_streams else graph.value("edges_xml"),
+        connections_xml="" if xml_streams else graph.value("connections_xml"),
         connection_links=connections_result.links,
-        tll_xml=tll_xml,
+        tll_xml="" if xml_streams else graph.value("tll_xml"),
         demand_xml=demand_xml,
         endpoint_ids=ped_endpoint_ids,
         vehicle_endpoint_ids=veh_endpoint_ids,
-        junction_ids=junction_ids,
+        junction_ids=graph.value("junction_ids"),
         pedestrian_graph=ped_graph,
-        defaults=defaults,
+        defaults=graph.value("defaults"),
+        xml_streams=xml_streams,
+        od_matrices=od_matrices or None,
+        pedestrian_walks=pedestrian_walks,
+        cache_bytes_written=cache.bytes_written - cache_bytes_before,
     )
+    if cache.enabled:
+        LOG.info(
+            "[CACHE] stage cache %s: hits=%d misses=%d recomputed=%s",
+            cache.root,
+            cache.hits,
+            cache.misses,
+            ",".join(graph.computed) or "-",
+        )
+    return result
 
 
-def _canonical_endpoint_id(node_id: str, breakpoints: Sequence[int]) -> str:
-    tokens = node_id.split(".")
-    if len(tokens) == 4 and tokens[0] == "Node" and tokens[1] == "Main":
-        try:
-            pos = int(tokens[2])
-        except ValueError:
-            return node_id
-        if not breakpoints:
-            return node_id
-        if pos == breakpoints[0]:
-            anchor = "W_end"
-        elif pos == breakpoints[-1]:
-            anchor = "E_end"
-        else:
-            return node_id
-        half = tokens[3]
-        if half not in {"N", "S"}:
-            return node_id
-        sidewalk = "N_sidewalk" if half == "N" else "S_sidewalk"
-        return f"PedEnd.Main.{anchor}.{sidewalk}"
-    return node_id
+def _xml_streams(graph: _BuildGraph) -> Dict[str, Callable[[], Iterable[str]]]:
+    """Deferred line generators for the four documents, bound to this build's stage values."""
+
+    defaults = graph.value("defaults")
+    return {
+        "nodes": partial(iter_nodes_xml, *(graph.value(dep) for dep in _NODES_DEPS)),
+        "edges": partial(iter_edges_xml, graph.value("edges"), defaults),
+        "connections": partial(iter_connections_xml, graph.value("connections").elements),
+        "tll": partial(iter_tll_xml, **_tll_kwargs(*(graph.value(dep) for dep in _TLL_DEPS))),
+    }
+
+
+def _xml_payload(result: BuildResult, name: str) -> XmlPayload:
+    if result.xml_streams and name in result.xml_streams:
+        return result.xml_streams[name]()
+    return getattr(result, f"{name}_xml")
 
 
 def _vehicle_template_ids(catalog: EndpointCatalog, breakpoints: Sequence[int]) -> list[str]:
@@ -225,6 +586,17 @@ def build_and_persist(
         options.output_files,
         extra_context=options.extra_context,
     )
+    return _persist_build(result, artifacts, spec_path, options, task)
+
+
+def _persist_build(
+    result: BuildResult,
+    artifacts: BuildArtifacts,
+    spec_path: Path,
+    options: BuildOptions,
+    task: BuildTask,
+    manifest_extra: Optional[Dict[str, Any]] = None,
+) -> BuildResult:
     artifacts.log_path.parent.mkdir(parents=True, exist_ok=True)
     configure_logger(artifacts.log_path, console=options.console_log)
     LOG.info("outdir: %s", artifacts.outdir.resolve())
@@ -234,10 +606,11 @@ def build_and_persist(
     if task.includes_network():
         persist_xml(
             artifacts,
-            nodes=result.nodes_xml,
-            edges=result.edges_xml,
-            connections=result.connections_xml,
-            tll=result.tll_xml,
+            nodes=_xml_payload(result, "nodes"),
+            edges=_xml_payload(result, "edges"),
+            connections=_xml_payload(result, "connections"),
+            tll=_xml_payload(result, "tll"),
+            compress=options.compress_xml,
         )
         network_ready = True
     elif options.network_input is not None:
@@ -248,12 +621,17 @@ def build_and_persist(
         network_ready = True
 
     if task.includes_demand() and result.demand_xml is not None:
-        persist_routes(artifacts, demand=result.demand_xml)
+        routes_path = persist_routes(
+            artifacts, demand=_xml_payload(result, "demand"), compress=options.compress_routes
+        )
+        if options.write_od_matrix and result.od_matrices:
+            save_od_matrices(artifacts.od_matrix_path, result.od_matrices)
+            LOG.info("[DEMAND] wrote OD matrices (%s) to %s", ",".join(result.od_matrices), artifacts.od_matrix_path)
         if network_ready:
             write_sumocfg(
                 artifacts.sumocfg_path,
                 net_path=artifacts.network_path,
-                routes_path=artifacts.routes_path,
+                routes_path=routes_path,
                 sim_end=options.demand.simulation_end_time if options.demand else None,
                 seed=int(options.extra_context.get("seed", 0)) if options.extra_context else None,
                 fcd_begin=options.demand.warmup_seconds if options.demand else None,
@@ -286,6 +664,7 @@ def build_and_persist(
     manifest = {
         "source": str(spec_path.resolve()),
         "schema": str(options.schema_path.resolve()),
+        **(manifest_extra or {}),
     }
     manifest_path = write_manifest(artifacts, manifest)
     result.manifest_path = manifest_path
@@ -299,16 +678,19 @@ def build_and_persist(
             junction_radius = float(result.defaults.junction_radius_m)
         run_two_step_netconvert(
             artifacts.outdir,
-            artifacts.nodes_path,
-            artifacts.edges_path,
-            artifacts.connections_path,
-            artifacts.tll_path,
+            compressed_path(artifacts.nodes_path, options.compress_xml),
+            compressed_path(artifacts.edges_path, options.compress_xml),
+            compressed_path(artifacts.connections_path, options.compress_xml),
+            compressed_path(artifacts.tll_path, options.compress_xml),
             plain_prefix=artifacts.netconvert_prefix,
             network_output=artifacts.network_path,
             sidewalk_width=sidewalk_width,
             junction_radius=junction_radius,
         )
 
+    if options.validate_pedestrian_walks and task.includes_demand():
+        _validate_pedestrian_walks(result, artifacts.network_path)
+
     if options.run_netedit:
         network_path = artifacts.network_path
         if network_ready and network_path.exists():
@@ -325,3 +707,70 @@ def build_and_persist(
             LOG.warning("sumo-gui requested but no SUMO config is available. Skipping launch.")
 
     return result
+
+
+def _validate_pedestrian_walks(result: BuildResult, network_path: Path) -> None:
+    if not result.pedestrian_walks:
+        LOG.warning("[DEMAND] walk validation requested but no pedestrian walks were emitted. Skipping.")
+        return
+    if not network_path.exists():
+        LOG.warning("[DEMAND] walk validation requested but %s does not exist. Skipping.", network_path)
+        return
+    problems = check_walks_against_net(network_path, result.pedestrian_walks)
+    for problem in problems:
+        LOG.warning("[DEMAND] walk mismatch: %s", problem)
+    LOG.info(
+        "[DEMAND] checked %d pedestrian walks against %s (%d mismatches)",
+        len(result.pedestrian_walks),
+        network_path,
+        len(problems),
+    )
+
+
+def _persist_variant(payload: Tuple[BuildResult, BuildArtifacts, Path, BuildOptions, BuildTask, Dict[str, Any]]) -> BuildResult:
+    return _persist_build(*payload)
+
+
+def build_many(
+    spec_path: Path,
+    deltas: Sequence[Sequence[Mapping[str, Any]]],
+    options: BuildOptions,
+    task: BuildTask = BuildTask.ALL,
+    *,
+    max_workers: Optional[int] = None,
+    memory_entries: int = 512,
+) -> List[BuildResult]:
+    """Build one variant per JSON-patch ``delta`` of the base spec.
+
+    The base spec and schema are loaded once. Variants are built in this process
+    against a shared stage cache, so stages whose inputs a delta does not touch
+    (clusters, lane plan, endpoint catalog, ...) are computed once for all
+    variants. Output directories are allocated up front and the variants are
+    persisted in parallel with ``max_workers`` processes (``1`` persists
+    in-process). Each manifest records the delta under ``"patch"``.
+    """
+
+    base_json = load_json_file(spec_path)
+    schema_json = load_schema_file(options.schema_path)
+    cache = StageCache(options.cache_dir, memory_entries=memory_entries)
+
+    payloads = []
+    for index, delta in enumerate(deltas):
+        variant_json = apply_json_patch(base_json, delta)
+        result = _build_from_json(variant_json, schema_json, options, cache)
+        extra_context = {"variant": index, **(options.extra_context or {})}
+        if options.extra_context:
+            result.run_id = str(options.extra_context.get("id", ""))
+        artifacts = ensure_output_directory(
+            options.output_template,
+            options.output_files,
+            extra_context=extra_context,
+        )
+        manifest_extra = {"variant": index, "patch": [dict(operation) for operation in delta]}
+        payloads.append((result, artifacts, spec_path, options, task, manifest_extra))
+    LOG.info("[BUILD] built %d variants (stage cache hits=%d)", len(payloads), cache.hits)
+
+    if max_workers == 1 or len(payloads) <= 1:
+        return [_persist_variant(payload) for payload in payloads]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_persist_variant, payloads))
@@ -13,6 +13,7 @@ EDGES_FILE_NAME = "PlainXML/1-generated.edg_{id}.xml"
 CONNECTIONS_FILE_NAME = "PlainXML/1-generated.con_{id}.xml"
 TLL_FILE_NAME = "PlainXML/1-generated.tll_{id}.xml"
 ROUTES_FILE_NAME = "PlainXML/demandflow.rou_{id}.xml"
+OD_MATRIX_FILE_NAME = "PlainXML/demandflow.od_{id}.npz"
 SUMO_CONFIG_FILE_NAME = "PlainXML/config_{id}.sumocfg"
 PLAIN_NETCONVERT_PREFIX = "PlainXML/2-cooked_{id}"
 NETWORK_FILE_NAME = "PlainXML/3-assembled.net_{id}.xml"
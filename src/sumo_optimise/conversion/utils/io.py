@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import datetime
+import gzip
+import io
 import json
 import os
 import time
+from contextlib import contextmanager
 from itertools import count
 from pathlib import Path
-from typing import Mapping, Sequence
+from typing import IO, Iterable, Iterator, Mapping, Sequence, Union
 
 from sqids import Sqids
 
@@ -16,6 +19,10 @@ from ..domain.models import OutputDirectoryTemplate, OutputFileTemplates
 
 _SQIDS = Sqids()
 _DEFAULT_SEQ_WIDTH = 3
+_WRITE_BUFFER_BYTES = 1 << 20
+
+# A rendered document, or its lines (without terminators) to be streamed to disk.
+XmlPayload = Union[str, Iterable[str]]
 
 
 def _current_time() -> datetime.datetime:
@@ -149,6 +156,10 @@ class BuildArtifacts:
     def routes_path(self) -> Path:
         return self._resolve_path("routes")
 
+    @property
+    def od_matrix_path(self) -> Path:
+        return self._resolve_path("od_matrix")
+
     @property
     def sumocfg_path(self) -> Path:
         return self._resolve_path("sumocfg")
@@ -248,22 +259,84 @@ def _write_text(path: Path, payload: str) -> None:
     path.write_text(payload, encoding="utf-8")
 
 
+def compressed_path(path: Path, compress: bool) -> Path:
+    """Return ``path`` with a ``.gz`` suffix appended when ``compress`` is set."""
+
+    if not compress or path.suffix == ".gz":
+        return path
+    return path.with_name(path.name + ".gz")
+
+
+@contextmanager
+def open_xml_writer(path: Path, *, compress: bool = False) -> Iterator[IO[str]]:
+    """Open ``path`` for buffered UTF-8 text writing, gzip-compressed when ``compress`` is set.
+
+    Compressed output uses a fixed gzip header timestamp so identical documents
+    produce identical files.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not compress:
+        with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_BYTES) as fp:
+            yield fp
+        return
+    with open(path, "wb", buffering=_WRITE_BUFFER_BYTES) as raw:
+        gz = gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=6, mtime=0)
+        with io.TextIOWrapper(gz, encoding="utf-8") as fp:
+            yield fp
+
+
+def write_xml_lines(path: Path, lines: Iterable[str], *, compress: bool = False) -> int:
+    """Stream ``lines`` to ``path`` one per line; returns the number of lines written."""
+
+    written = 0
+    with open_xml_writer(path, compress=compress) as fp:
+        for line in lines:
+            fp.write(line)
+            fp.write("\n")
+            written += 1
+    return written
+
+
+def _write_xml(path: Path, payload: XmlPayload, *, compress: bool) -> None:
+    if isinstance(payload, str):
+        if not compress:
+            _write_text(path, payload)
+            return
+        with open_xml_writer(path, compress=True) as fp:
+            fp.write(payload)
+        return
+    write_xml_lines(path, payload, compress=compress)
+
+
 def persist_xml(
     artifacts: BuildArtifacts,
     *,
-    nodes: str,
-    edges: str,
-    connections: str,
-    tll: str,
+    nodes: XmlPayload,
+    edges: XmlPayload,
+    connections: XmlPayload,
+    tll: XmlPayload,
+    compress: bool = False,
 ) -> None:
-    _write_text(artifacts.nodes_path, nodes)
-    _write_text(artifacts.edges_path, edges)
-    _write_text(artifacts.connections_path, connections)
-    _write_text(artifacts.tll_path, tll)
+    """Write the four PlainXML documents.
+
+    Each document may be a rendered string or an iterable of lines; iterables are
+    streamed to disk as they are produced. ``compress`` gzips every document and
+    appends ``.gz`` to its file name (see :func:`compressed_path`).
+    """
+
+    _write_xml(compressed_path(artifacts.nodes_path, compress), nodes, compress=compress)
+    _write_xml(compressed_path(artifacts.edges_path, compress), edges, compress=compress)
+    _write_xml(compressed_path(artifacts.connections_path, compress), connections, compress=compress)
+    _write_xml(compressed_path(artifacts.tll_path, compress), tll, compress=compress)
+
 
+def persist_routes(artifacts: BuildArtifacts, *, demand: XmlPayload, compress: bool = False) -> Path:
+    """Write the routes document (a string or an iterable of lines); returns the written path."""
 
-def persist_routes(artifacts: BuildArtifacts, *, demand: str) -> None:
-    _write_text(artifacts.routes_path, demand)
+    path = compressed_path(artifacts.routes_path, compress)
+    _write_xml(path, demand, compress=compress)
+    return path
 
 
 def _config_value(path: Path, base: Path) -> str:
@@ -358,9 +431,13 @@ def write_sumocfg(
 
 __all__ = [
     "BuildArtifacts",
+    "XmlPayload",
+    "compressed_path",
     "ensure_output_directory",
+    "open_xml_writer",
     "persist_xml",
     "persist_routes",
     "write_sumocfg",
     "write_manifest",
+    "write_xml_lines",
 ]
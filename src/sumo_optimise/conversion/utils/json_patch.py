@@ -0,0 +1,87 @@
+"""Minimal RFC 6902 JSON patch (``add``/``replace``/``remove``) with structural sharing."""
+from __future__ import annotations
+
+from typing import Any, Iterable, List, Mapping
+
+from .errors import InvalidConfigurationError
+
+PatchOperation = Mapping[str, Any]
+
+
+def _split_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise InvalidConfigurationError(f"JSON pointer must start with '/': {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _list_index(container: list, token: str, *, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    try:
+        index = int(token)
+    except ValueError:
+        raise InvalidConfigurationError(f"invalid array index in JSON pointer: {token!r}") from None
+    upper = len(container) if allow_end else len(container) - 1
+    if index < 0 or index > upper:
+        raise InvalidConfigurationError(f"array index out of range in JSON pointer: {token!r}")
+    return index
+
+
+def _apply_one(node: Any, tokens: List[str], op: str, value: Any) -> Any:
+    """Return a copy of ``node`` with the operation applied; untouched branches are shared."""
+
+    if not tokens:
+        if op == "remove":
+            raise InvalidConfigurationError("cannot remove the document root")
+        return value
+    head, rest = tokens[0], tokens[1:]
+    if isinstance(node, dict):
+        clone = dict(node)
+        if rest:
+            if head not in clone:
+                raise InvalidConfigurationError(f"JSON pointer segment not found: {head!r}")
+            clone[head] = _apply_one(clone[head], rest, op, value)
+        elif op == "add":
+            clone[head] = value
+        elif head not in clone:
+            raise InvalidConfigurationError(f"JSON pointer segment not found: {head!r}")
+        elif op == "replace":
+            clone[head] = value
+        else:
+            del clone[head]
+        return clone
+    if isinstance(node, list):
+        clone = list(node)
+        if rest:
+            index = _list_index(clone, head, allow_end=False)
+            clone[index] = _apply_one(clone[index], rest, op, value)
+        elif op == "add":
+            clone.insert(_list_index(clone, head, allow_end=True), value)
+        elif op == "replace":
+            clone[_list_index(clone, head, allow_end=False)] = value
+        else:
+            del clone[_list_index(clone, head, allow_end=False)]
+        return clone
+    raise InvalidConfigurationError(f"JSON pointer traverses a scalar at {head!r}")
+
+
+def apply_json_patch(document: Any, operations: Iterable[PatchOperation]) -> Any:
+    """Apply ``operations`` to ``document`` without mutating it.
+
+    Only the containers on each patched path are copied, so unchanged sections of
+    the result are the very objects of ``document``.
+    """
+
+    result = document
+    for operation in operations:
+        op = operation.get("op")
+        if op not in ("add", "replace", "remove"):
+            raise InvalidConfigurationError(f"unsupported JSON patch op: {op!r}")
+        if "path" not in operation:
+            raise InvalidConfigurationError("JSON patch operation requires 'path'")
+        if op != "remove" and "value" not in operation:
+            raise InvalidConfigurationError(f"JSON patch '{op}' requires 'value'")
+        result = _apply_one(result, _split_pointer(operation["path"]), op, operation.get("value"))
+    return result
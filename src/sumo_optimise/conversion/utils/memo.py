@@ -0,0 +1,141 @@
+"""Content-addressed on-disk memo cache for pipeline stages."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+from .logging import get_logger
+
+LOG = get_logger()
+
+CACHE_FORMAT_VERSION = 1
+_PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def digest_json(value: Any) -> str:
+    """Stable digest of a JSON-compatible value (dict key order does not matter)."""
+
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def digest_file(path: Optional[Path]) -> str:
+    """Digest of a file's bytes; ``None`` and missing files hash to fixed markers."""
+
+    if path is None:
+        return "none"
+    hasher = hashlib.sha256()
+    try:
+        with Path(path).open("rb") as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b""):
+                hasher.update(chunk)
+    except FileNotFoundError:
+        return "missing"
+    return hasher.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Fingerprint of the conversion package sources and bundled data files.
+
+    Code edits and edits to package data (schema, conflict-table prototype)
+    both invalidate cached stages.
+    """
+
+    entries = []
+    data_files = (path for path in (_PACKAGE_ROOT / "data").rglob("*") if path.is_file())
+    for path in sorted([*_PACKAGE_ROOT.rglob("*.py"), *data_files]):
+        stat = path.stat()
+        entries.append([str(path.relative_to(_PACKAGE_ROOT)), stat.st_size, stat.st_mtime_ns])
+    return digest_json([CACHE_FORMAT_VERSION, entries])
+
+
+class StageCache:
+    """Pickle store keyed by ``<stage>/<key>.pkl`` under ``root``.
+
+    A ``None`` root disables persistence; every lookup then misses. Entries are
+    written atomically, and unreadable entries are treated as misses.
+
+    ``memory_entries > 0`` adds an in-process LRU layer shared by every build
+    that uses this cache (see :func:`sumo_optimise.conversion.pipeline.build_many`).
+    Values in it are shared between builds and must not be mutated.
+
+    ``bytes_written`` counts the pickle bytes :meth:`store` has put on disk, so
+    callers can account for the cache's disk use without walking ``root``.
+    """
+
+    def __init__(self, root: Optional[Path], *, memory_entries: int = 0) -> None:
+        self.root = Path(root) if root is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.bytes_written = 0
+        self._memory_entries = memory_entries
+        self._memory: OrderedDict[Tuple[str, str], Any] = OrderedDict()
+
+    def recall(self, stage: str, key: str) -> Tuple[bool, Any]:
+        if (stage, key) not in self._memory:
+            return False, None
+        self._memory.move_to_end((stage, key))
+        return True, self._memory[(stage, key)]
+
+    def remember(self, stage: str, key: str, value: Any) -> None:
+        if self._memory_entries <= 0:
+            return
+        self._memory[(stage, key)] = value
+        self._memory.move_to_end((stage, key))
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def key(self, stage: str, inputs: Iterable[str]) -> str:
+        return digest_json([stage, code_fingerprint(), list(inputs)])
+
+    def _path(self, stage: str, key: str) -> Path:
+        assert self.root is not None
+        return self.root / stage / f"{key}.pkl"
+
+    def load(self, stage: str, key: str) -> Tuple[bool, Any]:
+        if self.root is None:
+            return False, None
+        path = self._path(stage, key)
+        try:
+            with path.open("rb") as fp:
+                value = pickle.load(fp)
+        except FileNotFoundError:
+            self.misses += 1
+            return False, None
+        except Exception as exc:  # corrupt or incompatible entry
+            LOG.warning("[CACHE] ignoring unreadable entry %s: %s", path, exc)
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, value
+
+    def store(self, stage: str, key: str, value: Any) -> None:
+        if self.root is None:
+            return
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+                size = fp.tell()
+            os.replace(tmp_name, path)
+            self.bytes_written += size
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
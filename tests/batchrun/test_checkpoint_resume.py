@@ -0,0 +1,201 @@
+from pathlib import Path
+import gzip
+import os
+import subprocess
+import zlib
+
+import pytest
+
+from sumo_optimise.batchrun.benchmark import stub_environment
+from sumo_optimise.batchrun.models import (
+    CheckpointConfig,
+    OutputFormat,
+    QueueDurabilityConfig,
+    RunArtifacts,
+    ScenarioConfig,
+)
+from sumo_optimise.batchrun.orchestrator import (
+    _run_for_scale,
+    _salvage_output,
+    load_segment_starts,
+)
+from sumo_optimise.batchrun.parsers import parse_tripinfo, parse_waiting_percentile
+from sumo_optimise.batchrun.sumo_stub import DEFAULT_REFERENCE_DIR, FAIL_AT_STEP_ENV
+from sumo_optimise.conversion.utils.io import write_sumocfg
+
+
+def test_parsers_drop_rows_replayed_after_a_checkpoint(tmp_path: Path) -> None:
+    summary = tmp_path / "summary.csv"
+    summary.write_text(
+        "step_time;step_halting\n"
+        "0;1\n1;2\n2;3\n3;90\n"  # interrupted at t=3, state saved at t=2
+        "step_time;step_halting\n"
+        "2;3\n3;4\n",
+        encoding="utf-8",
+    )
+
+    assert parse_waiting_percentile(summary, begin=0.0, end=10.0, segment_starts=[2.0]) == pytest.approx(
+        parse_waiting_percentile(_plain(tmp_path, "0;1\n1;2\n2;3\n3;4\n"), begin=0.0, end=10.0)
+    )
+
+
+def _plain(tmp_path: Path, rows: str) -> Path:
+    path = tmp_path / "expected.csv"
+    path.write_text("step_time;step_halting\n" + rows, encoding="utf-8")
+    return path
+
+
+def test_tripinfo_xml_segments_tolerate_truncated_document(tmp_path: Path) -> None:
+    tripinfo = tmp_path / "tripinfo.xml"
+    tripinfo.write_text(
+        '<?xml version="1.0"?>\n<tripinfos>\n'
+        '<tripinfo id="a" depart="0" arrival="5" duration="5" timeLoss="1"/>\n'
+        '<tripinfo id="b" depart="1" arrival="30" duration="29" timeLoss="2"/>\n'
+        '<tripinfo id="c" depart="2" arr'
+        '\n<?xml version="1.0"?>\n<tripinfos>\n'
+        '<tripinfo id="b" depart="1" arrival="30" duration="29" timeLoss="2"/>\n'
+        '<tripinfo id="c" depart="2" arrival="40" duration="38" timeLoss="3"/>\n'
+        "</tripinfos>\n",
+        encoding="utf-8",
+    )
+
+    metrics = parse_tripinfo(tripinfo, begin_filter=0.0, segment_starts=[20.0])
+
+    assert metrics.vehicle_count == 3
+
+
+def test_salvage_output_cuts_truncated_gzip_to_last_line(tmp_path: Path) -> None:
+    path = tmp_path / "out.csv.gz"
+    payload = b"h;v\n" + b"".join(f"{idx};{idx}\n".encode() for idx in range(2000))
+    compressor = zlib.compressobj(wbits=31)
+    data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    path.write_bytes(data[:-3])  # no gzip trailer, partial last block
+
+    _salvage_output(path)
+
+    with gzip.open(path, "rb") as fp:
+        text = fp.read()
+    assert text.endswith(b"\n")
+    assert payload.startswith(text)
+
+
+def test_salvage_output_cuts_plain_file_to_last_line(tmp_path: Path) -> None:
+    path = tmp_path / "out.csv"
+    path.write_bytes(b"h;v\n1;1\n2;")
+
+    _salvage_output(path)
+
+    assert path.read_bytes() == b"h;v\n1;1\n"
+
+
+def _artifacts(outdir: Path) -> RunArtifacts:
+    return RunArtifacts(
+        outdir=outdir,
+        sumocfg=outdir / "config.sumocfg",
+        network=outdir / "net.net.xml",
+        tripinfo=outdir / "vehicle_tripinfo.csv.gz",
+        personinfo=outdir / "person_tripinfo.csv.gz",
+        fcd=outdir / "fcd.csv.gz",
+        summary=outdir / "vehicle_summary.csv.gz",
+        person_summary=outdir / "person_summary.csv.gz",
+        detector=outdir / "detector.xml",
+        queue=outdir / "queue.xml",
+        sumo_log=outdir / "sumo.log",
+        run_id="R-1",
+    )
+
+
+def _scenario() -> ScenarioConfig:
+    return ScenarioConfig(
+        spec=Path("spec.json"),
+        scenario_id="R-1",
+        scenario_base_id="R",
+        seed=1,
+        demand_dir=Path("demand"),
+        warmup_seconds=100.0,
+        unsat_seconds=200.0,
+        sat_seconds=183.0,
+        ped_unsat_scale=1.0,
+        ped_sat_scale=1.0,
+        veh_unsat_scale=1.0,
+        veh_sat_scale=1.0,
+    )
+
+
+def _run(
+    outdir: Path,
+    bin_dir: Path,
+    *,
+    fail_at: str | None,
+    checkpoint: CheckpointConfig = CheckpointConfig(period=50.0),
+) -> tuple:
+    artifacts = _artifacts(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    write_sumocfg(
+        artifacts.sumocfg,
+        net_path=artifacts.network,
+        routes_path=outdir / "routes.rou.xml",
+        sim_end=600,
+        seed=1,
+        tripinfo_path=artifacts.tripinfo,
+        personinfo_path=artifacts.personinfo,
+        summary_output_path=artifacts.summary,
+        column_header_value="auto",
+    )
+    with stub_environment(bin_dir, reference_dir=DEFAULT_REFERENCE_DIR, step_rate=0.0):
+        if fail_at is not None:
+            os.environ[FAIL_AT_STEP_ENV] = fail_at
+        try:
+            trip_metrics, _, waiting_p95 = _run_for_scale(
+                artifacts,
+                _scenario(),
+                queue_config=QueueDurabilityConfig(),
+                output_format=OutputFormat(),
+                scale=1.0,
+                affinity_cpu=None,
+                collect_tripinfo=True,
+                checkpoint=checkpoint,
+            )
+        finally:
+            os.environ.pop(FAIL_AT_STEP_ENV, None)
+    return artifacts, trip_metrics, waiting_p95
+
+
+def test_interrupted_run_resumes_from_checkpoint_with_same_metrics(tmp_path: Path) -> None:
+    _, expected, expected_p95 = _run(tmp_path / "clean", tmp_path / "bin", fail_at=None)
+    artifacts, resumed, resumed_p95 = _run(tmp_path / "crash", tmp_path / "bin", fail_at="237")
+
+    assert load_segment_starts(artifacts.outdir, artifacts.run_id) == [200.0]
+    assert not (artifacts.outdir / "state").exists()
+    assert resumed == expected
+    assert resumed_p95 == expected_p95
+
+
+def test_killed_run_resumes_on_the_next_invocation(tmp_path: Path) -> None:
+    _, expected, expected_p95 = _run(tmp_path / "clean", tmp_path / "bin", fail_at=None)
+    with pytest.raises(subprocess.CalledProcessError):
+        # No in-process resume: the worker dies and leaves its state behind.
+        _run(
+            tmp_path / "killed",
+            tmp_path / "bin",
+            fail_at="237",
+            checkpoint=CheckpointConfig(period=50.0, max_resumes=0),
+        )
+    assert (tmp_path / "killed" / "state").exists()
+
+    artifacts, resumed, resumed_p95 = _run(tmp_path / "killed", tmp_path / "bin", fail_at=None)
+
+    assert load_segment_starts(artifacts.outdir, artifacts.run_id) == [200.0]
+    assert not (artifacts.outdir / "state").exists()
+    assert resumed == expected
+    assert resumed_p95 == expected_p95
+
+
+def test_fresh_run_drops_a_stale_segment_record(tmp_path: Path) -> None:
+    outdir = tmp_path / "run"
+    outdir.mkdir()
+    (outdir / "segments_R-1.json").write_text('{"segment_starts": [200.0]}', encoding="utf-8")
+
+    artifacts, _, _ = _run(outdir, tmp_path / "bin", fail_at=None)
+
+    assert load_segment_starts(artifacts.outdir, artifacts.run_id) == []
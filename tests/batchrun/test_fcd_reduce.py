@@ -0,0 +1,66 @@
+from pathlib import Path
+import gzip
+import math
+
+import pytest
+
+from sumo_optimise.batchrun.fcd import load_fcd_aggregates, reduce_fcd, save_fcd_aggregates
+from sumo_optimise.batchrun.models import FcdReduceConfig
+
+np = pytest.importorskip("numpy")
+
+
+def _write_csv_fcd(path: Path) -> None:
+    rows = [
+        "timestep_time;vehicle_id;vehicle_lane;vehicle_speed",
+        "0.00;v0;E0_0;10.0",
+        "0.00;v1;E0_0;0.0",
+        "1.00;v0;E0_0;12.0",
+        "2.00;;;",
+        "3.00;v1;E1_0;0.05",
+    ]
+    with gzip.open(path, "wt", encoding="utf-8") as fp:
+        fp.write("\n".join(rows) + "\n")
+
+
+def test_reduce_csv_fcd_bins_per_lane(tmp_path: Path) -> None:
+    fcd = tmp_path / "fcd.csv.gz"
+    _write_csv_fcd(fcd)
+
+    aggregates = reduce_fcd(
+        fcd,
+        config=FcdReduceConfig(enabled=True, bin_seconds=2.0),
+        lane_lengths={"E0_0": 100.0},
+    )
+
+    assert aggregates.lanes == ["E0_0", "E1_0"]
+    assert list(aggregates.bin_start) == [0.0, 2.0]
+    # Bin 0 has two timesteps: three E0_0 samples -> 1.5 vehicles on average.
+    assert aggregates.vehicles[0, 0] == pytest.approx(1.5)
+    assert aggregates.density[0, 0] == pytest.approx(15.0)
+    assert aggregates.mean_speed[0, 0] == pytest.approx(22.0 / 3)
+    assert aggregates.queue[0, 0] == pytest.approx(0.5)
+    assert aggregates.queue[1, 1] == pytest.approx(0.5)
+    assert math.isnan(aggregates.density[1, 1])
+    assert math.isnan(aggregates.mean_speed[0, 1])
+
+
+def test_reduce_xml_fcd_round_trips_through_npz(tmp_path: Path) -> None:
+    fcd = tmp_path / "fcd.xml"
+    fcd.write_text(
+        "<fcd-export>"
+        '<timestep time="10.00"><vehicle id="v0" lane="E0_0" speed="5.0"/></timestep>'
+        '<timestep time="11.00"><vehicle id="v0" lane="E0_0" speed="7.0"/></timestep>'
+        "</fcd-export>",
+        encoding="utf-8",
+    )
+
+    aggregates = reduce_fcd(fcd, config=FcdReduceConfig(enabled=True, bin_seconds=60.0))
+    target = save_fcd_aggregates(tmp_path / "fcd_lanes.npz", aggregates)
+    loaded = load_fcd_aggregates(target)
+
+    assert loaded.lanes == ["E0_0"]
+    assert loaded.bin_seconds == 60.0
+    assert list(loaded.bin_start) == [10.0]
+    assert loaded.vehicles[0, 0] == pytest.approx(1.0)
+    assert loaded.mean_speed[0, 0] == pytest.approx(6.0)
@@ -0,0 +1,57 @@
+from pathlib import Path
+from queue import Queue
+import threading
+
+from sumo_optimise.batchrun.orchestrator import _build_bytes, _render_loop, _send_bytes, _send_status
+from sumo_optimise.batchrun.models import WorkerPhase
+from sumo_optimise.conversion.domain.models import BuildResult, OutputFileTemplates
+
+
+def test_render_loop_accumulates_reported_bytes_without_scanning(tmp_path: Path, capsys, monkeypatch) -> None:
+    def _fail_scan(path: Path) -> int:
+        raise AssertionError("output tree should not be scanned when reconciliation is disabled")
+
+    monkeypatch.setattr("sumo_optimise.batchrun.orchestrator._dir_size_bytes", _fail_scan)
+    queue: Queue = Queue()
+    _send_status(queue, worker_id=0, scenario_id="S-1", phase=WorkerPhase.SUMO, label="sumo")
+    _send_bytes(queue, worker_id=0, nbytes=3 * 1024 * 1024)
+    _send_bytes(queue, worker_id=0, nbytes=-1024 * 1024)
+    stop_event = threading.Event()
+    stop_event.set()
+
+    _render_loop(queue, stop_event, 1, 1, tmp_path)
+
+    assert "out 2.0MB" in capsys.readouterr().out
+
+
+def test_render_loop_reconciles_with_periodic_scan(tmp_path: Path, capsys, monkeypatch) -> None:
+    monkeypatch.setattr("sumo_optimise.batchrun.orchestrator._dir_size_bytes", lambda path: 5 * 1024 * 1024)
+    queue: Queue = Queue()
+    _send_bytes(queue, worker_id=0, nbytes=1024)
+    stop_event = threading.Event()
+    stop_event.set()
+
+    _render_loop(queue, stop_event, 1, 1, tmp_path, size_scan_interval=1e-9)
+
+    assert "out 5.0MB" in capsys.readouterr().out
+
+
+def test_build_bytes_skips_linked_shared_routes(tmp_path: Path) -> None:
+    files = OutputFileTemplates()
+    context = {"id": "S-1"}
+    manifest = tmp_path / files.manifest.format_map(context)
+    routes = tmp_path / files.routes.format_map(context)
+    network = tmp_path / files.network.format_map(context)
+    for path, size in ((manifest, 10), (routes, 1000), (network, 100)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    (tmp_path / "unrelated.bin").write_bytes(b"x" * 5000)
+    result = BuildResult(
+        nodes_xml="", edges_xml="", connections_xml="", connection_links=[], tll_xml="", manifest_path=manifest
+    )
+    result.run_id = "S-1"
+
+    assert _build_bytes(result, include_routes=True) == 1110
+    assert _build_bytes(result, include_routes=False) == 110
+    result.cache_bytes_written = 7
+    assert _build_bytes(result, include_routes=False) == 117
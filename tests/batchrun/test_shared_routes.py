@@ -0,0 +1,136 @@
+import os
+import queue
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from sumo_optimise.batchrun.models import (
+    OutputFormat,
+    QueueDurabilityConfig,
+    ScaleProbeConfig,
+    ScenarioConfig,
+)
+from sumo_optimise.batchrun.orchestrator import (
+    STAGE_CACHE_DIR_NAME,
+    _group_by_routes_key,
+    _init_worker,
+    _link_shared_routes,
+    _routes_share_key,
+    run_scenario,
+)
+from sumo_optimise.conversion.emitters import conflict_table
+
+
+def _demand_dir(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    for suffix in ("pe", "pj", "ve", "vj"):
+        (root / f"demand.{suffix}.csv").write_text(f"{suffix}\n", encoding="utf-8")
+    return root
+
+
+def _scenario(tmp_path: Path, seed: int, **overrides) -> ScenarioConfig:
+    spec = tmp_path / "spec.json"
+    if not spec.exists():
+        spec.write_text("{}", encoding="utf-8")
+    base = ScenarioConfig(
+        spec=spec,
+        scenario_id=f"S-{seed}",
+        scenario_base_id="S",
+        seed=seed,
+        demand_dir=_demand_dir(tmp_path / "demand"),
+        warmup_seconds=60.0,
+        unsat_seconds=600.0,
+        sat_seconds=300.0,
+        ped_unsat_scale=1.0,
+        ped_sat_scale=1.0,
+        veh_unsat_scale=1.0,
+        veh_sat_scale=1.5,
+    )
+    return replace(base, **overrides)
+
+
+def test_routes_key_ignores_seed_but_tracks_demand_inputs(tmp_path: Path) -> None:
+    key = _routes_share_key(_scenario(tmp_path, 1))
+    assert key == _routes_share_key(_scenario(tmp_path, 2))
+    assert key != _routes_share_key(_scenario(tmp_path, 1, veh_sat_scale=2.0))
+
+    other = _demand_dir(tmp_path / "other")
+    assert key == _routes_share_key(_scenario(tmp_path, 1, demand_dir=other))
+    (other / "demand.ve.csv").write_text("ve\nedited\n", encoding="utf-8")
+    assert key != _routes_share_key(_scenario(tmp_path, 1, demand_dir=other))
+
+    (tmp_path / "spec.json").write_text('{"edited": true}', encoding="utf-8")
+    assert key != _routes_share_key(_scenario(tmp_path, 1))
+
+
+def test_group_by_routes_key_preserves_manifest_order(tmp_path: Path) -> None:
+    scenarios = [
+        _scenario(tmp_path, 1),
+        _scenario(tmp_path, 1, sat_seconds=10.0),
+        _scenario(tmp_path, 2),
+        _scenario(tmp_path, 3),
+    ]
+
+    groups = sorted(_group_by_routes_key(scenarios).values())
+
+    assert groups == [[0, 2, 3], [1]]
+
+
+def test_link_shared_routes_shares_inode(tmp_path: Path) -> None:
+    source = tmp_path / "shared" / "demandflow.rou_key.xml"
+    source.parent.mkdir()
+    source.write_text("<routes/>", encoding="utf-8")
+    destination = tmp_path / "run" / "PlainXML" / "demandflow.rou_S-1-base.xml"
+
+    _link_shared_routes(source, destination)
+
+    assert destination.read_text(encoding="utf-8") == "<routes/>"
+    assert destination.stat().st_ino == source.stat().st_ino
+
+
+def test_group_by_routes_key_isolates_broken_demand_dir(tmp_path: Path) -> None:
+    broken = _demand_dir(tmp_path / "broken")
+    (broken / "demand.pe.csv").unlink()
+    scenarios = [
+        _scenario(tmp_path, 1),
+        _scenario(tmp_path, 1, scenario_id="B-1", demand_dir=broken),
+        _scenario(tmp_path, 2),
+        _scenario(tmp_path, 2, scenario_id="B-2", demand_dir=broken),
+    ]
+
+    groups = sorted(_group_by_routes_key(scenarios).values())
+
+    assert groups == [[0, 2], [1], [3]]
+
+    result = run_scenario(
+        scenarios[1],
+        output_root=tmp_path / "out",
+        queue_config=QueueDurabilityConfig(),
+        scale_probe=ScaleProbeConfig(),
+        output_format=OutputFormat(),
+        affinity_cpu=None,
+        worker_id=0,
+        status_queue=queue.Queue(),
+        use_pty=False,
+    )
+
+    assert result is not None
+    assert "Expected exactly one file matching *.pe.csv" in result.error
+
+
+def test_workers_cache_the_conflict_table_in_the_stage_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv(conflict_table.CACHE_DIR_ENV, raising=False)
+    stage_cache = tmp_path / STAGE_CACHE_DIR_NAME
+
+    _init_worker(stage_cache)
+    conflict_table.load_conflict_matrix()
+
+    assert os.environ[conflict_table.CACHE_DIR_ENV] == str(stage_cache)
+    assert list((stage_cache / "conflict_table").iterdir())
+
+    monkeypatch.setenv(conflict_table.CACHE_DIR_ENV, "")
+    _init_worker(stage_cache)
+    assert os.environ[conflict_table.CACHE_DIR_ENV] == ""
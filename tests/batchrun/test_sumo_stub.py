@@ -0,0 +1,83 @@
+from pathlib import Path
+import gzip
+import subprocess
+
+import pytest
+
+from sumo_optimise.batchrun.benchmark import stub_environment
+from sumo_optimise.batchrun.parsers import parse_tripinfo
+from sumo_optimise.batchrun.sumo_stub import DEFAULT_REFERENCE_DIR, run
+from sumo_optimise.conversion.utils.io import write_sumocfg
+
+
+def test_stub_replays_reference_outputs_via_path(tmp_path: Path) -> None:
+    sumocfg = tmp_path / "run" / "config.sumocfg"
+    sumocfg.parent.mkdir()
+    write_sumocfg(
+        sumocfg,
+        net_path=tmp_path / "run" / "net.net.xml",
+        routes_path=tmp_path / "run" / "routes.rou.xml",
+        sim_end=600,
+        seed=1,
+        tripinfo_path=tmp_path / "run" / "vehicle_tripinfo.csv.gz",
+        personinfo_path=tmp_path / "run" / "person_tripinfo.csv.gz",
+        summary_output_path=tmp_path / "run" / "vehicle_summary.csv.gz",
+        column_header_value="auto",
+    )
+
+    with stub_environment(tmp_path / "bin", reference_dir=DEFAULT_REFERENCE_DIR, step_rate=0.0):
+        proc = subprocess.run(["sumo", "-c", str(sumocfg)], capture_output=True, text=True, check=True)
+
+    assert "Step #10.00" in proc.stdout
+    summary = tmp_path / "run" / "vehicle_summary.csv.gz"
+    with gzip.open(summary, "rt", encoding="utf-8") as fp:
+        assert fp.read() == (DEFAULT_REFERENCE_DIR / "vehicle_summary.csv").read_text(encoding="utf-8")
+
+    plain_trip = tmp_path / "vehicle_tripinfo.csv"
+    plain_person = tmp_path / "person_tripinfo.csv"
+    with gzip.open(tmp_path / "run" / "vehicle_tripinfo.csv.gz", "rb") as fp:
+        plain_trip.write_bytes(fp.read())
+    with gzip.open(tmp_path / "run" / "person_tripinfo.csv.gz", "rb") as fp:
+        plain_person.write_bytes(fp.read())
+    metrics = parse_tripinfo(plain_trip, begin_filter=0.0, personinfo=plain_person)
+    assert metrics.vehicle_count > 0
+    assert metrics.person_count > 0
+
+
+def _summary_only_config(tmp_path: Path) -> Path:
+    sumocfg = tmp_path / "run" / "config.sumocfg"
+    sumocfg.parent.mkdir()
+    write_sumocfg(
+        sumocfg,
+        net_path=tmp_path / "run" / "net.net.xml",
+        routes_path=tmp_path / "run" / "routes.rou.xml",
+        sim_end=600,
+        seed=1,
+        summary_output_path=tmp_path / "run" / "vehicle_summary.csv",
+        column_header_value="auto",
+    )
+    return sumocfg
+
+
+def test_stub_saves_state_for_fractional_periods(tmp_path: Path) -> None:
+    sumocfg = _summary_only_config(tmp_path)
+    prefix = tmp_path / "state" / "run"
+
+    run(
+        sumocfg,
+        reference_dir=DEFAULT_REFERENCE_DIR,
+        step_rate=0.0,
+        stdout_replay=None,
+        save_state_period=0.5,
+        save_state_prefix=str(prefix),
+    )
+
+    saved = sorted(int(path.read_text(encoding="utf-8")) for path in prefix.parent.glob("run_*.xbin"))
+    assert saved[:3] == [1, 2, 3]
+
+
+def test_stub_reports_missing_reference_dir(tmp_path: Path) -> None:
+    sumocfg = _summary_only_config(tmp_path)
+
+    with pytest.raises(SystemExit, match="SUMO_STUB_REFERENCE_DIR"):
+        run(sumocfg, reference_dir=tmp_path / "missing", step_rate=0.0, stdout_replay=None)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+from sumo_optimise.conversion.domain.models import BuildOptions, DemandOptions
+from sumo_optimise.conversion.pipeline import build_corridor_artifacts
+
+SPEC_PATH = Path("data/sample_updated/SUMO_OPTX_v1.4_sample_updated.json")
+SCHEMA_PATH = Path("src/sumo_optimise/conversion/data/schema.json")
+DEMAND_DIR = Path("data/sample_updated")
+
+
+def _entries(cache_dir: Path) -> dict[str, int]:
+    return {stage.name: len(list(stage.glob("*.pkl"))) for stage in cache_dir.iterdir() if stage.is_dir()}
+
+
+def test_stage_cache_reuses_unchanged_stages(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    options = BuildOptions(schema_path=SCHEMA_PATH, cache_dir=cache_dir)
+
+    first = build_corridor_artifacts(SPEC_PATH, options)
+    cached_entries = _entries(cache_dir)
+    second = build_corridor_artifacts(SPEC_PATH, options)
+    uncached = build_corridor_artifacts(SPEC_PATH, replace(options, cache_dir=None))
+
+    assert _entries(cache_dir) == cached_entries
+    assert first.cache_bytes_written == sum(path.stat().st_size for path in cache_dir.rglob("*.pkl"))
+    assert second.cache_bytes_written == 0 and uncached.cache_bytes_written == 0
+    for result in (second, uncached):
+        assert result.nodes_xml == first.nodes_xml
+        assert result.edges_xml == first.edges_xml
+        assert result.connections_xml == first.connections_xml
+        assert result.tll_xml == first.tll_xml
+
+
+def test_signal_profile_change_only_recomputes_tll(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    options = BuildOptions(schema_path=SCHEMA_PATH, cache_dir=cache_dir)
+    build_corridor_artifacts(SPEC_PATH, options)
+    before = _entries(cache_dir)
+
+    spec = json.loads(SPEC_PATH.read_text(encoding="utf-8"))
+    profile = spec["signal_profiles"]["tee"][0]
+    profile["phases"][0]["duration_s"] += 5
+    profile["cycle_s"] += 5
+    edited = tmp_path / "spec.json"
+    edited.write_text(json.dumps(spec), encoding="utf-8")
+    result = build_corridor_artifacts(edited, options)
+
+    after = _entries(cache_dir)
+    changed = {stage for stage, count in after.items() if count != before.get(stage, 0)}
+    assert changed == {"tll_xml"}
+    assert result.tll_xml == build_corridor_artifacts(edited, replace(options, cache_dir=None)).tll_xml
+
+
+def test_demand_scale_change_only_rerenders_routes(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    demand = DemandOptions(
+        ped_endpoint_csv=DEMAND_DIR / "ped_EP_demand_sampleUpd.csv",
+        ped_junction_turn_weight_csv=DEMAND_DIR / "ped_jct_turn_weight_sampleUpd.csv",
+        veh_endpoint_csv=DEMAND_DIR / "veh_EP_demand_sampleUpd.csv",
+        veh_junction_turn_weight_csv=DEMAND_DIR / "veh_jct_turn_weight_sampleUpd.csv",
+        simulation_end_time=3600.0,
+        unsat_seconds=1800.0,
+        sat_seconds=1800.0,
+    )
+    options = BuildOptions(schema_path=SCHEMA_PATH, cache_dir=cache_dir, demand=demand)
+    build_corridor_artifacts(SPEC_PATH, options)
+    before = _entries(cache_dir)
+
+    scaled = replace(options, demand=replace(demand, ped_sat_scale=1.5, veh_unsat_scale=0.5))
+    result = build_corridor_artifacts(SPEC_PATH, scaled)
+
+    after = _entries(cache_dir)
+    changed = {stage for stage, count in after.items() if count != before.get(stage, 0)}
+    assert changed == {"person_routes", "vehicle_routes"}
+    assert result.demand_xml == build_corridor_artifacts(SPEC_PATH, replace(scaled, cache_dir=None)).demand_xml
+
+
+def test_pedestrian_walks_are_routed_only_when_requested(tmp_path: Path, monkeypatch) -> None:
+    import sumo_optimise.conversion.demand.person_flow as person_flow
+
+    routed = []
+    original = person_flow.compute_pedestrian_walks
+
+    def counting(*args, **kwargs):
+        routed.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(person_flow, "compute_pedestrian_walks", counting)
+    cache_dir = tmp_path / "cache"
+    demand = DemandOptions(
+        ped_endpoint_csv=DEMAND_DIR / "ped_EP_demand_sampleUpd.csv",
+        ped_junction_turn_weight_csv=DEMAND_DIR / "ped_jct_turn_weight_sampleUpd.csv",
+        simulation_end_time=3600.0,
+        unsat_seconds=3600.0,
+    )
+    options = BuildOptions(schema_path=SCHEMA_PATH, cache_dir=cache_dir, demand=demand)
+    build_corridor_artifacts(SPEC_PATH, options)
+    assert routed == []
+    before = _entries(cache_dir)
+
+    result = build_corridor_artifacts(SPEC_PATH, replace(options, demand=replace(demand, explicit_pedestrian_walks=True)))
+
+    after = _entries(cache_dir)
+    changed = {stage for stage, count in after.items() if count != before.get(stage, 0)}
+    assert routed == [1]
+    assert changed == {"person_walks", "person_routes"}
+    assert result.pedestrian_walks
+
+
+def test_parallel_stage_workers_match_sequential_build() -> None:
+    options = BuildOptions(schema_path=SCHEMA_PATH, generate_demand_templates=True)
+
+    sequential = build_corridor_artifacts(SPEC_PATH, options)
+    parallel = build_corridor_artifacts(SPEC_PATH, replace(options, stage_workers=2))
+
+    assert parallel.nodes_xml == sequential.nodes_xml
+    assert parallel.edges_xml == sequential.edges_xml
+    assert parallel.connections_xml == sequential.connections_xml
+    assert parallel.tll_xml == sequential.tll_xml
+    assert parallel.endpoint_ids == sequential.endpoint_ids
+    assert parallel.vehicle_endpoint_ids == sequential.vehicle_endpoint_ids
+
+
+def test_code_fingerprint_covers_package_data(tmp_path: Path, monkeypatch) -> None:
+    from sumo_optimise.conversion.utils import memo
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "module.py").write_text("X = 1\n", encoding="utf-8")
+    table = tmp_path / "data" / "conflict_table.txt"
+    table.write_text("a\n", encoding="utf-8")
+    monkeypatch.setattr(memo, "_PACKAGE_ROOT", tmp_path)
+    memo.code_fingerprint.cache_clear()
+    try:
+        before = memo.code_fingerprint()
+        table.write_text("a\nb\n", encoding="utf-8")
+        memo.code_fingerprint.cache_clear()
+        assert memo.code_fingerprint() != before
+    finally:
+        memo.code_fingerprint.cache_clear()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from sumo_optimise.conversion import pipeline
+from sumo_optimise.conversion.domain.models import BuildOptions, BuildTask, OutputDirectoryTemplate
+from sumo_optimise.conversion.utils.errors import InvalidConfigurationError
+from sumo_optimise.conversion.utils.json_patch import apply_json_patch
+
+SPEC_PATH = Path("data/sample_updated/SUMO_OPTX_v1.4_sample_updated.json")
+SCHEMA_PATH = Path("src/sumo_optimise/conversion/data/schema.json")
+
+
+def test_apply_json_patch_copies_only_patched_paths() -> None:
+    document = {"a": {"b": [1, 2, 3]}, "c": {"d": 1}}
+
+    patched = apply_json_patch(
+        document,
+        [
+            {"op": "replace", "path": "/a/b/0", "value": 10},
+            {"op": "add", "path": "/a/b/-", "value": 4},
+            {"op": "remove", "path": "/a/b/1"},
+            {"op": "add", "path": "/a/e~1f", "value": True},
+        ],
+    )
+
+    assert patched == {"a": {"b": [10, 3, 4], "e/f": True}, "c": {"d": 1}}
+    assert document == {"a": {"b": [1, 2, 3]}, "c": {"d": 1}}
+    assert patched["c"] is document["c"]
+
+
+def test_apply_json_patch_rejects_missing_targets() -> None:
+    with pytest.raises(InvalidConfigurationError):
+        apply_json_patch({"a": 1}, [{"op": "replace", "path": "/b", "value": 2}])
+    with pytest.raises(InvalidConfigurationError):
+        apply_json_patch({"a": [1]}, [{"op": "replace", "path": "/a/3", "value": 2}])
+
+
+def test_build_many_shares_unaffected_stages(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = {"lane_plan": 0, "tll_xml": 0}
+    for name in calls:
+        stage = pipeline._STAGES[name]
+
+        def counting(*args, _name=name, _fn=stage.fn):
+            calls[_name] += 1
+            return _fn(*args)
+
+        monkeypatch.setitem(pipeline._STAGES, name, replace(stage, fn=counting))
+
+    options = BuildOptions(
+        schema_path=SCHEMA_PATH,
+        output_template=OutputDirectoryTemplate(root=str(tmp_path / "out"), run="v{variant:02}"),
+    )
+    deltas = [
+        [],
+        [{"op": "replace", "path": "/signal_profiles/tee/0/phases/0/duration_s", "value": 50},
+         {"op": "replace", "path": "/signal_profiles/tee/0/cycle_s", "value": 125}],
+    ]
+
+    results = pipeline.build_many(SPEC_PATH, deltas, options, task=BuildTask.NETWORK, max_workers=1)
+
+    assert calls == {"lane_plan": 1, "tll_xml": 2}
+    assert results[0].nodes_xml == results[1].nodes_xml
+    assert results[0].tll_xml != results[1].tll_xml
+    manifest = json.loads(results[1].manifest_path.read_text(encoding="utf-8"))
+    assert manifest["variant"] == 1
+    assert manifest["patch"] == deltas[1]
+    assert (tmp_path / "out" / "v00").is_dir()
+    assert results[1].manifest_path.parent == tmp_path / "out" / "v01"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from sumo_optimise.conversion.emitters import conflict_table
+
+
+def test_import_does_not_load_conflict_matrix() -> None:
+    code = (
+        "import sumo_optimise.conversion.pipeline\n"
+        "from sumo_optimise.conversion.emitters.conflict_table import get_conflict_matrix\n"
+        "print(get_conflict_matrix.cache_info().currsize)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, conflict_table.CACHE_DIR_ENV: ""},
+    ).stdout
+
+    assert output.strip() == "0"
+
+
+def test_compiled_conflict_table_is_reused_until_source_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "conflict_table.txt"
+    shutil.copyfile(conflict_table._CONFLICT_TABLE_PATH, source)
+    monkeypatch.setenv(conflict_table.CACHE_DIR_ENV, str(tmp_path / "cache"))
+    parsed = []
+    original = conflict_table._parse_conflict_file
+
+    def counting(path: Path) -> conflict_table.ConflictMatrix:
+        parsed.append(path)
+        return original(path)
+
+    monkeypatch.setattr(conflict_table, "_parse_conflict_file", counting)
+
+    first = conflict_table.load_conflict_matrix(source)
+    second = conflict_table.load_conflict_matrix(source)
+    assert len(parsed) == 1
+    assert second._matrix == first._matrix
+    assert second.relation("EB_L", "WB_T") == first.relation("EB_L", "WB_T")
+
+    source.write_bytes(source.read_bytes() + b"\n")
+    conflict_table.load_conflict_matrix(source)
+    assert len(parsed) == 2
+
+
+def test_conflict_table_cache_is_opt_in(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(conflict_table.CACHE_DIR_ENV, raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+
+    def no_hashing(*_args):
+        raise AssertionError("cache key computed with caching off")
+
+    monkeypatch.setattr(conflict_table, "code_fingerprint", no_hashing)
+    monkeypatch.setattr(conflict_table, "digest_file", no_hashing)
+
+    conflict_table.load_conflict_matrix()
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import io
+import re
+from pathlib import Path
+
+import pytest
+
+from sumo_optimise.conversion import pipeline
+from sumo_optimise.conversion.demand import segments
+from sumo_optimise.conversion.demand.segments import load_demand_profile, profile_segments
+from sumo_optimise.conversion.domain.models import BuildOptions, DemandOptions
+from sumo_optimise.conversion.pipeline import build_corridor_artifacts
+from sumo_optimise.conversion.utils.errors import DemandValidationError
+
+SPEC_PATH = Path("data/sample_updated/SUMO_OPTX_v1.4_sample_updated.json")
+SCHEMA_PATH = Path("src/sumo_optimise/conversion/data/schema.json")
+DEMAND_DIR = Path("data/sample_updated")
+
+
+def test_profile_windows_collapse_equal_and_zero_slots() -> None:
+    windows = load_demand_profile(
+        io.StringIO(
+            "begin_s,end_s,scale,veh_scale\n"
+            "0,900,0.5,1\n"
+            "900,1800,0.5,1\n"
+            "1800,2700,0,1.5\n"
+            "3600,4500,0.5,1.5\n"
+        )
+    )
+
+    assert profile_segments(windows, "ped") == [(0.0, 1800.0, 0.5), (3600.0, 4500.0, 0.5)]
+    assert profile_segments(windows, "veh") == [(0.0, 1800.0, 1.0), (1800.0, 2700.0, 1.5), (3600.0, 4500.0, 1.5)]
+
+
+def test_profile_rejects_overlapping_windows() -> None:
+    with pytest.raises(DemandValidationError, match="row 3"):
+        load_demand_profile(io.StringIO("begin_s,end_s,scale\n0,900,1\n600,1200,1\n"))
+
+
+def test_profile_windows_are_clipped_to_the_simulation_end() -> None:
+    windows = load_demand_profile(
+        io.StringIO("begin_s,end_s,scale\n0,900,1\n900,2700,2\n2700,3600,3\n"),
+        simulation_end_time=1800.0,
+    )
+
+    assert profile_segments(windows, "veh") == [(0.0, 900.0, 1.0), (900.0, 1800.0, 2.0)]
+
+
+def test_profile_is_parsed_once_per_build(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    profile = tmp_path / "profile.csv"
+    profile.write_text("begin_s,end_s,scale\n0,1800,1\n1800,7200,2\n", encoding="utf-8")
+    loads = []
+
+    def counting(source, **kwargs):
+        loads.append(source)
+        return load_demand_profile(source, **kwargs)
+
+    def no_reload(*_args, **_kwargs):
+        raise AssertionError("demand profile parsed again while rendering")
+
+    monkeypatch.setattr(pipeline, "load_demand_profile", counting)
+    monkeypatch.setattr(segments, "load_demand_profile", no_reload)
+    demand = DemandOptions(
+        ped_endpoint_csv=DEMAND_DIR / "ped_EP_demand_sampleUpd.csv",
+        ped_junction_turn_weight_csv=DEMAND_DIR / "ped_jct_turn_weight_sampleUpd.csv",
+        veh_endpoint_csv=DEMAND_DIR / "veh_EP_demand_sampleUpd.csv",
+        veh_junction_turn_weight_csv=DEMAND_DIR / "veh_jct_turn_weight_sampleUpd.csv",
+        simulation_end_time=3600.0,
+        demand_profile_csv=profile,
+    )
+
+    result = build_corridor_artifacts(SPEC_PATH, BuildOptions(schema_path=SCHEMA_PATH, demand=demand))
+
+    assert loads == [profile]
+    assert result.od_matrices is not None
+    assert result.od_matrices["vehicle"].segments == [(0.0, 1800.0, 1.0), (1800.0, 3600.0, 2.0)]
+
+
+def test_profile_drives_emitted_flow_windows(tmp_path: Path) -> None:
+    profile = tmp_path / "profile.csv"
+    rows = ["begin_s,end_s,ped_scale,veh_scale"]
+    rows += [f"{slot * 900},{(slot + 1) * 900},{1.0 if slot < 2 else 2.0},{0.0 if slot == 3 else 1.0}" for slot in range(4)]
+    profile.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    demand = DemandOptions(
+        ped_endpoint_csv=DEMAND_DIR / "ped_EP_demand_sampleUpd.csv",
+        ped_junction_turn_weight_csv=DEMAND_DIR / "ped_jct_turn_weight_sampleUpd.csv",
+        veh_endpoint_csv=DEMAND_DIR / "veh_EP_demand_sampleUpd.csv",
+        veh_junction_turn_weight_csv=DEMAND_DIR / "veh_jct_turn_weight_sampleUpd.csv",
+        simulation_end_time=3600.0,
+        demand_profile_csv=profile,
+    )
+
+    result = build_corridor_artifacts(SPEC_PATH, BuildOptions(schema_path=SCHEMA_PATH, demand=demand))
+
+    assert result.demand_xml is not None
+    person_windows = set(re.findall(r'<personFlow [^>]*begin="([^"]+)" end="([^"]+)"', result.demand_xml))
+    vehicle_windows = set(re.findall(r'<flow [^>]*begin="([^"]+)" end="([^"]+)"', result.demand_xml))
+    assert person_windows == {("0.00", "1800.00"), ("1800.00", "3600.00")}
+    assert vehicle_windows == {("0.00", "2700.00")}
+    assert result.od_matrices is not None
+    assert result.od_matrices["person"].segments == [(0.0, 1800.0, 1.0), (1800.0, 3600.0, 2.0)]
@@ -21,7 +21,9 @@ from sumo_optimise.conversion.domain.models import (
     SignalRef,
     SnapRule,
 )
-from sumo_optimise.conversion.emitters.tll import render_tll_xml
+from sumo_optimise.conversion.emitters.conflict_table import get_conflict_matrix
+from sumo_optimise.conversion.emitters import tll
+from sumo_optimise.conversion.emitters.tll import _ConflictTable, _normalize_conflict_state, render_tll_xml
 
 
 def _make_defaults() -> Defaults:
@@ -622,3 +624,67 @@ def test_midblock_flow_blocks_corresponding_crosswalk():
     )
     states = _extract_states(xml)
     assert states == ["GrG", "rGG"]
+
+
+def test_conflict_table_matches_pairwise_relations():
+    tokens = ["EB_L", "EB_T", "WB_T", "WB_R", "NB_L", "SB_T", "PedX_N", "EB_T"]
+    matrix = get_conflict_matrix()
+    expected: Dict[str, str] = {}
+    unique = list(dict.fromkeys(tokens))
+    for token_a in unique:
+        markers = {
+            _normalize_conflict_state(token_a, token_b, matrix.relation(token_a, token_b)[0])
+            for token_b in unique
+            if token_b != token_a
+        }
+        expected[token_a] = "r" if "S" in markers else "g" if "Y" in markers else "G"
+
+    table = _ConflictTable(tokens + ["SB_L"])
+
+    assert table.evaluate(tokens) == expected
+    assert table.evaluate(["SB_L"]) == {"SB_L": "G"}
+
+
+def test_identical_programs_reuse_phases(monkeypatch):
+    profile = SignalProfileDef(
+        id="profile",
+        cycle_s=10,
+        ped_early_cutoff_s=1,
+        yellow_duration_s=2,
+        phases=[
+            SignalPhaseDef(duration_s=6, allow_movements=["EB_R_pg"]),
+            SignalPhaseDef(duration_s=4, allow_movements=[]),
+        ],
+        kind=EventKind.CROSS,
+    )
+    profiles = {EventKind.CROSS.value: {"profile": profile}}
+    clusters = [
+        _cluster_with_signal(pos=100, profile_id="profile", kind=EventKind.CROSS, offset=0),
+        _cluster_with_signal(pos=200, profile_id="profile", kind=EventKind.CROSS, offset=15),
+        _cluster_with_signal(pos=300, profile_id="profile", kind=EventKind.CROSS, two_stage=True, refuge=True),
+    ]
+    links = [
+        SignalLink(
+            tl_id=cluster_id(pos),
+            movement="main_EB_R",
+            slot_index=0,
+            link_index=0,
+            kind="connection",
+            element_id=f"veh{pos}",
+        )
+        for pos in (100, 200, 300)
+    ]
+    calls = []
+    original = tll._build_timelines
+
+    def counting(program, program_links):
+        calls.append(program.tl_id)
+        return original(program, program_links)
+
+    monkeypatch.setattr(tll, "_build_timelines", counting)
+
+    xml = _render(clusters=clusters, profiles=profiles, links=links)
+
+    assert calls == [cluster_id(100), cluster_id(300)]
+    assert f'id="{cluster_id(200)}" type="static" programID="0" offset="15"' in xml
+    assert _extract_states(xml) == ["G", "y", "r"] * 3
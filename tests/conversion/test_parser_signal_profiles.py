@@ -170,3 +170,20 @@ def test_parse_signal_profiles_reject_duplicate_vehicle_turns():
     spec = _spec_with_profile(EventKind.CROSS, profile)
     with pytest.raises(SemanticValidationError):
         parse_signal_profiles(spec)
+
+
+def test_parse_signal_profiles_accepts_fractional_durations():
+    profile = [
+        {
+            "id": "fractional",
+            "cycle_s": 30.5,
+            "ped_early_cutoff_s": 2.5,
+            "yellow_duration_s": 3.0,
+            "phases": _phases(10.25, 20.25),
+        }
+    ]
+    spec = _spec_with_profile(EventKind.TEE, profile)
+    parsed = parse_signal_profiles(spec)[EventKind.TEE.value]["fractional"]
+    assert parsed.cycle_s == 30.5
+    assert [phase.duration_s for phase in parsed.phases] == [10.25, 20.25]
+    assert isinstance(parsed.yellow_duration_s, int)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pickle
+
+import networkx as nx
+import pytest
+
+from sumo_optimise.conversion.builder.ids import main_edge_id
+from sumo_optimise.conversion.demand.person_flow import walks
+from sumo_optimise.conversion.demand.person_flow.pedestrian_graph import PedestrianGraph
+from sumo_optimise.conversion.domain.models import PedestrianSide
+
+
+def _multigraph() -> nx.MultiGraph:
+    graph = nx.MultiGraph()
+    graph.add_node("A", coord=(0.0, 0.0), cluster_id="Cluster.0", node_type="main_north", is_endpoint=True)
+    graph.add_node("B", coord=(10.0, 0.0), cluster_id="Cluster.10", node_type="main_north", is_endpoint=False)
+    graph.add_node("C", node_type="unknown")
+    graph.add_edge("B", "C", orientation="NS", side=PedestrianSide.WEST_SIDE, length=4.0)
+    graph.add_edge("A", "B", orientation="EW", side=PedestrianSide.NORTH_SIDE, length=10.0)
+    graph.add_edge("B", "C", orientation="NS", side=PedestrianSide.EAST_SIDE, length=4.0)
+    return graph
+
+
+def test_csr_adjacency_follows_multigraph_order() -> None:
+    source = _multigraph()
+    graph = PedestrianGraph.from_networkx(source)
+
+    for idx, node_id in enumerate(graph.node_ids):
+        expected = [neighbor for neighbor, keyed in source.adj[node_id].items() for _ in keyed]
+        assert [graph.node_ids[neighbor] for neighbor, _ in graph.neighbors(idx)] == expected
+        assert graph.degree(idx) == source.degree(node_id)
+
+    b = graph.index["B"]
+    sides = [graph.edge_sides[edge] for neighbor, edge in graph.neighbors(b) if graph.node_ids[neighbor] == "C"]
+    assert sides == [PedestrianSide.WEST_SIDE, PedestrianSide.EAST_SIDE]
+    assert graph.endpoint_ids() == ["A"]
+    assert not graph.has_coord(graph.index["C"])
+    assert "C" in graph and "D" not in graph
+
+
+def test_pedestrian_graph_pickles_and_exports() -> None:
+    graph = PedestrianGraph.from_networkx(_multigraph())
+
+    restored = pickle.loads(pickle.dumps(graph))
+    exported = restored.to_networkx()
+
+    assert restored.node_ids == graph.node_ids
+    assert list(restored.neighbors(1)) == list(graph.neighbors(1))
+    assert exported.number_of_edges() == 3
+    assert exported.nodes["B"]["cluster_id"] == "Cluster.10"
+    assert exported["A"]["B"][0]["orientation"] == "EW"
+
+
+def test_walk_edges_use_stored_main_positions() -> None:
+    source = _multigraph()
+    graph = PedestrianGraph.from_networkx(source)
+    (edge,) = [edge for _, edge in graph.neighbors(graph.index["A"])]
+
+    with pytest.raises(ValueError, match="node A has no main-road position"):
+        walks._sumo_edge(graph, edge, resolver=None)
+
+    source.nodes["A"]["pos"] = 0
+    source.nodes["B"]["pos"] = 10
+    graph = PedestrianGraph.from_networkx(source)
+    assert walks._sumo_edge(graph, edge, resolver=None) == main_edge_id("EB", 0, 10)
@@ -709,3 +709,26 @@ def test_no_main_u_turn_od_pairs() -> None:
             d_parts = destination.split(".")
             if len(o_parts) == 4 and len(d_parts) == 4 and o_parts[2] == d_parts[2] and o_parts[3] != d_parts[3]:
                 raise AssertionError(f"mainline U-turn flow detected: {origin} -> {destination}")
+
+
+def test_looping_walks_are_absorbed_exactly() -> None:
+    graph = nx.MultiGraph()
+    graph.add_node("Start", is_endpoint=True)
+    graph.add_node("A", is_endpoint=False)
+    graph.add_node("B", is_endpoint=False)
+    graph.add_node("End", is_endpoint=True)
+    graph.add_edge("Start", "A", orientation="NS", side=PedestrianSide.WEST_SIDE, length=4.0)
+    graph.add_edge("A", "B", orientation="NS", side=PedestrianSide.WEST_SIDE, length=4.0)
+    graph.add_edge("A", "B", orientation="NS", side=PedestrianSide.WEST_SIDE, length=4.0)
+    graph.add_edge("B", "End", orientation="NS", side=PedestrianSide.WEST_SIDE, length=4.0)
+
+    rows = [
+        EndpointDemandRow(endpoint_id="Start", flow_per_hour=300.0, row_index=2),
+        EndpointDemandRow(endpoint_id="Start", flow_per_hour=600.0, row_index=3),
+    ]
+    flows = compute_od_flows(graph, {}, rows)
+
+    # Walkers bounce between A and B over the parallel edges; two thirds eventually reach End.
+    assert [(origin, destination) for origin, destination, _, _ in flows] == [("Start", "End")] * 2
+    assert flows[0][2] == pytest.approx(200.0, rel=1e-12)
+    assert flows[1][2] == pytest.approx(400.0, rel=1e-12)
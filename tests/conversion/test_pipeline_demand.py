@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
+from xml.etree import ElementTree as ET
 
+import pytest
+
+from sumo_optimise.conversion.demand.od_matrix import load_od_matrices
+from sumo_optimise.conversion.demand.person_flow.walks import check_walks_against_net
 from sumo_optimise.conversion.domain.models import (
     BuildOptions,
     BuildTask,
@@ -64,3 +69,93 @@ def test_demand_run_reuses_existing_network(tmp_path):
     assert copied_net.exists()
     assert copied_net.read_text(encoding="utf-8") == content
     assert result.sumocfg_path is not None and result.sumocfg_path.exists()
+
+
+def test_od_matrices_are_written_per_segment(tmp_path):
+    pytest.importorskip("numpy")
+
+    options = BuildOptions(
+        schema_path=SCHEMA_PATH,
+        output_template=OutputDirectoryTemplate(root=str(tmp_path), run="od"),
+        demand=DemandOptions(
+            ped_endpoint_csv=PED_ENDPOINT_CSV,
+            ped_junction_turn_weight_csv=PED_JUNCTION_CSV,
+            veh_endpoint_csv=VEH_ENDPOINT_CSV,
+            veh_junction_turn_weight_csv=VEH_JUNCTION_CSV,
+            simulation_end_time=3600.0,
+            warmup_seconds=600.0,
+            unsat_seconds=1800.0,
+            sat_seconds=1200.0,
+            ped_sat_scale=2.0,
+            veh_sat_scale=1.5,
+        ),
+        write_od_matrix=True,
+    )
+
+    result = build_and_persist(SPEC_PATH, options, task=BuildTask.DEMAND)
+
+    assert result.manifest_path is not None
+    (path,) = result.manifest_path.parent.glob("PlainXML/demandflow.od_*.npz")
+    loaded = load_od_matrices(path)
+    assert set(loaded) == {"person", "vehicle"}
+    for kind, matrix in loaded.items():
+        built = result.od_matrices[kind]
+        assert matrix.endpoints == built.endpoints
+        assert matrix.segments == built.segments
+        assert matrix.cells == pytest.approx(built.cells)
+    assert [scale for _, _, scale in loaded["person"].segments] == [1.0, 2.0]
+    assert loaded["vehicle"].segments[1] == (2400.0, 3600.0, 1.5)
+
+    import numpy as np
+
+    with np.load(path) as data:
+        flows = data["person_flows"]
+        assert flows.shape == (2, len(loaded["person"].endpoints), len(loaded["person"].endpoints))
+        assert flows[1].sum() == pytest.approx(2.0 * loaded["person"].total())
+
+
+def _assembled_net(result, path: Path) -> Path:
+    """Stand-in for the netconvert output: emitted edges between joined junctions, all walkable."""
+
+    junction_of = {}
+    for join in ET.fromstring(result.nodes_xml).iter("join"):
+        for node in join.get("nodes", "").split():
+            junction_of[node] = join.get("id")
+    lines = ["<net>"]
+    for edge in ET.fromstring(result.edges_xml).iter("edge"):
+        begin = junction_of.get(edge.get("from"), edge.get("from"))
+        end = junction_of.get(edge.get("to"), edge.get("to"))
+        lines.append(f'  <edge id="{edge.get("id")}" from="{begin}" to="{end}">')
+        lines.append(f'    <lane id="{edge.get("id")}_0" allow="pedestrian"/>')
+        lines.append("  </edge>")
+    lines.append("</net>")
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def test_pedestrian_walks_replace_person_trips(tmp_path):
+    options = BuildOptions(
+        schema_path=SCHEMA_PATH,
+        output_template=OutputDirectoryTemplate(root=str(tmp_path), run="walks"),
+        demand=DemandOptions(
+            ped_endpoint_csv=PED_ENDPOINT_CSV,
+            ped_junction_turn_weight_csv=PED_JUNCTION_CSV,
+            simulation_end_time=3600.0,
+            unsat_seconds=3600.0,
+            explicit_pedestrian_walks=True,
+        ),
+    )
+
+    result = build_and_persist(SPEC_PATH, options, task=BuildTask.ALL)
+
+    assert result.demand_xml is not None
+    assert "<personTrip" not in result.demand_xml
+    assert result.demand_xml.count("<walk edges=") == len(result.pedestrian_walks)
+    net_path = _assembled_net(result, tmp_path / "assembled.net.xml")
+    assert check_walks_against_net(net_path, result.pedestrian_walks) == []
+
+    (pair, walk), *_ = (item for item in result.pedestrian_walks.items() if len(item[1]) > 2)
+    broken = {pair: (walk[0], walk[-1], "Edge.Missing")}
+    problems = check_walks_against_net(net_path, broken)
+    assert any("do not share a junction" in problem for problem in problems)
+    assert any("Edge.Missing is missing" in problem for problem in problems)
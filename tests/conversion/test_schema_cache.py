@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from sumo_optimise.conversion.parser import spec_loader
+from sumo_optimise.conversion.utils.errors import SchemaValidationError
+
+
+class _Error:
+    def __init__(self, message: str) -> None:
+        self.path: list = []
+        self.schema_path: list = []
+        self.message = message
+        self.validator = "stub"
+
+
+class _CountingValidator:
+    compiled = 0
+    validated = 0
+
+    def __init__(self, schema: dict) -> None:
+        type(self).compiled += 1
+        self.schema = schema
+
+    def iter_errors(self, instance: dict):
+        type(self).validated += 1
+        if instance.get("invalid"):
+            yield _Error("invalid spec")
+
+
+@pytest.fixture(autouse=True)
+def _counting_validator(monkeypatch: pytest.MonkeyPatch):
+    spec_loader.clear_validation_caches()
+    _CountingValidator.compiled = 0
+    _CountingValidator.validated = 0
+    monkeypatch.setattr(spec_loader, "Draft7Validator", _CountingValidator)
+    yield
+    spec_loader.clear_validation_caches()
+
+
+def test_validator_compiled_once_and_passing_specs_skipped(tmp_path: Path) -> None:
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+
+    for _ in range(3):
+        spec_loader.validate_json_schema({"version": "1.4"}, spec_loader.load_schema_file(schema_path))
+    spec_loader.validate_json_schema({"version": "1.4.1"}, spec_loader.load_schema_file(schema_path))
+
+    assert _CountingValidator.compiled == 1
+    assert _CountingValidator.validated == 2
+
+
+def test_failing_specs_are_revalidated(tmp_path: Path) -> None:
+    schema = {"type": "object"}
+
+    for _ in range(2):
+        with pytest.raises(SchemaValidationError):
+            spec_loader.validate_json_schema({"invalid": True}, schema)
+
+    assert _CountingValidator.validated == 2
+
+
+def test_schema_file_reloaded_when_modified(tmp_path: Path) -> None:
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+    first = spec_loader.load_schema_file(schema_path)
+    assert spec_loader.load_schema_file(schema_path) is first
+
+    schema_path.write_text(json.dumps({"type": "object", "required": ["version"]}), encoding="utf-8")
+    stat = schema_path.stat()
+    os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = spec_loader.load_schema_file(schema_path)
+
+    assert second == {"type": "object", "required": ["version"]}
+    spec_loader.validate_json_schema({"version": "1.4"}, first)
+    spec_loader.validate_json_schema({"version": "1.4"}, second)
+    assert _CountingValidator.compiled == 2
+
+
+def test_schema_digests_do_not_accumulate(tmp_path: Path) -> None:
+    schema_path = tmp_path / "schema.json"
+    for revision in range(3):
+        schema_path.write_text(json.dumps({"type": "object", "title": str(revision)}), encoding="utf-8")
+        stat = schema_path.stat()
+        os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + revision * 1_000_000))
+        spec_loader.validate_json_schema({"version": "1.4"}, spec_loader.load_schema_file(schema_path))
+    for _ in range(3):
+        spec_loader.validate_json_schema({"version": "1.4"}, {"type": "object"})
+
+    assert len(spec_loader._SCHEMA_FILES) == 1
+    assert _CountingValidator.compiled == 4
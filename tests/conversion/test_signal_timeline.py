@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, List
+
+from sumo_optimise.conversion.emitters.signal_timeline import (
+    apply_ped_cutoff,
+    apply_yellow,
+    build_timeline,
+    format_seconds,
+    paint_phases,
+    to_phases,
+)
+
+
+def _per_second(timeline) -> List[str]:
+    return [state for start, end, state in timeline for _ in range(end - start)]
+
+
+def _runs(states: List[str]):
+    return build_timeline(((idx, idx + 1, state) for idx, state in enumerate(states)), lambda state: state)
+
+
+def _reference_yellow(timeline: List[str], yellow: int) -> List[str]:
+    timeline = list(timeline)
+    cycle = len(timeline)
+    for idx in range(cycle):
+        nxt = timeline[(idx + 1) % cycle]
+        if timeline[idx] in ("G", "g") and nxt == "r":
+            for back in range(yellow):
+                pos = (idx - back) % cycle
+                if timeline[pos] not in ("G", "g"):
+                    break
+                timeline[pos] = "y"
+    return timeline
+
+
+def _reference_ped_cutoff(timeline: List[str], cutoff: int) -> List[str]:
+    timeline = list(timeline)
+    cycle = len(timeline)
+    for idx in range(cycle):
+        nxt = timeline[(idx + 1) % cycle]
+        if timeline[idx] == "G" and nxt == "r":
+            for back in range(cutoff):
+                pos = (idx - back) % cycle
+                if timeline[pos] != "G":
+                    break
+                timeline[pos] = "r"
+    return timeline
+
+
+def test_tail_substitution_matches_per_second_sweep() -> None:
+    rng = random.Random(7)
+    for _ in range(2000):
+        cycle = rng.randint(1, 24)
+        states = [rng.choice("GGgr") for _ in range(cycle)]
+        amount = rng.randint(1, 8)
+        runs = _runs(states)
+
+        assert _per_second(apply_yellow(runs, cycle, amount)) == _reference_yellow(states, amount)
+        assert _per_second(apply_ped_cutoff(runs, cycle, amount)) == _reference_ped_cutoff(states, amount)
+
+
+def test_painting_wraps_and_later_phases_overwrite() -> None:
+    segments = paint_phases(10, [4, 8, 3])
+
+    assert segments == [(0, 2, 1), (2, 5, 2), (5, 10, 1)]
+
+
+def test_fractional_phases_merge_across_cycle_wrap() -> None:
+    states: Dict[int, str] = {0: "G", 1: "r", 2: "G"}
+    segments = paint_phases(60.5, [20.25, 30.0, 10.25])
+    vehicle = build_timeline(segments, lambda index: states[index])
+    vehicle = apply_yellow(vehicle, 60.5, 3)
+
+    phases = to_phases([vehicle], 60.5)
+
+    assert phases == [(27.5, "G"), (3, "y"), (30.0, "r")]
+    assert [format_seconds(duration) for duration, _ in phases] == ["27.5", "3", "30"]
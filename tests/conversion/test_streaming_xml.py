@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import gzip
+import pickle
+import re
+from dataclasses import replace
+from pathlib import Path
+
+from sumo_optimise.conversion.domain.models import (
+    BuildOptions,
+    BuildTask,
+    DemandOptions,
+    OutputDirectoryTemplate,
+    OutputFileTemplates,
+)
+from sumo_optimise.conversion.demand.routes import RouteEntry, iter_routes_document
+from sumo_optimise.conversion.pipeline import build_and_persist, build_corridor_artifacts
+from sumo_optimise.conversion.utils import io
+
+SPEC_PATH = Path("data/sample_updated/SUMO_OPTX_v1.4_sample_updated.json")
+SCHEMA_PATH = Path("src/sumo_optimise/conversion/data/schema.json")
+
+
+def test_write_xml_lines_plain_and_gzip(tmp_path: Path) -> None:
+    lines = ["<nodes>", '  <node id="a"/>', "</nodes>"]
+
+    assert io.write_xml_lines(tmp_path / "n.xml", iter(lines)) == 3
+    io.write_xml_lines(tmp_path / "n.xml.gz", iter(lines), compress=True)
+    io.write_xml_lines(tmp_path / "m.xml.gz", iter(lines), compress=True)
+
+    expected = "\n".join(lines) + "\n"
+    assert (tmp_path / "n.xml").read_text(encoding="utf-8") == expected
+    assert gzip.decompress((tmp_path / "n.xml.gz").read_bytes()).decode("utf-8") == expected
+    assert (tmp_path / "n.xml.gz").read_bytes() == (tmp_path / "m.xml.gz").read_bytes()
+    assert io.compressed_path(tmp_path / "n.xml", True) == tmp_path / "n.xml.gz"
+    assert io.compressed_path(tmp_path / "n.xml", False) == tmp_path / "n.xml"
+
+
+def test_streamed_documents_match_rendered_documents(tmp_path: Path) -> None:
+    options = BuildOptions(
+        schema_path=SCHEMA_PATH,
+        output_template=OutputDirectoryTemplate(root=str(tmp_path), run="{name}"),
+        output_files=OutputFileTemplates(
+            nodes="nodes.xml", edges="edges.xml", connections="connections.xml", tll="tll.xml"
+        ),
+    )
+    rendered = build_corridor_artifacts(SPEC_PATH, options)
+
+    streamed = build_and_persist(
+        SPEC_PATH,
+        replace(options, stream_xml=True, extra_context={"name": "plain"}),
+        task=BuildTask.NETWORK,
+    )
+    build_and_persist(
+        SPEC_PATH,
+        replace(options, stream_xml=True, compress_xml=True, extra_context={"name": "gz"}),
+        task=BuildTask.NETWORK,
+    )
+
+    assert streamed.nodes_xml == "" and streamed.xml_streams is not None
+    pickle.loads(pickle.dumps(streamed.xml_streams))
+    for name, text in (
+        ("nodes", rendered.nodes_xml),
+        ("edges", rendered.edges_xml),
+        ("connections", rendered.connections_xml),
+        ("tll", rendered.tll_xml),
+    ):
+        assert (tmp_path / "plain" / f"{name}.xml").read_text(encoding="utf-8") == text
+        compressed = (tmp_path / "gz" / f"{name}.xml.gz").read_bytes()
+        assert gzip.decompress(compressed).decode("utf-8") == text
+
+
+def test_streamed_routes_merge_segments_in_departure_order(tmp_path: Path) -> None:
+    demand_dir = Path("data/sample_updated")
+    options = BuildOptions(
+        schema_path=SCHEMA_PATH,
+        output_template=OutputDirectoryTemplate(root=str(tmp_path), run="{name}"),
+        output_files=OutputFileTemplates(routes="routes.rou.xml", sumocfg="run.sumocfg"),
+        demand=DemandOptions(
+            ped_endpoint_csv=demand_dir / "ped_EP_demand_sampleUpd.csv",
+            ped_junction_turn_weight_csv=demand_dir / "ped_jct_turn_weight_sampleUpd.csv",
+            veh_endpoint_csv=demand_dir / "veh_EP_demand_sampleUpd.csv",
+            veh_junction_turn_weight_csv=demand_dir / "veh_jct_turn_weight_sampleUpd.csv",
+            simulation_end_time=3600.0,
+            unsat_seconds=1800.0,
+            sat_seconds=1800.0,
+        ),
+    )
+    rendered = build_corridor_artifacts(SPEC_PATH, options)
+
+    streamed = build_and_persist(
+        SPEC_PATH,
+        replace(options, stream_xml=True, compress_routes=True, extra_context={"name": "gz"}),
+    )
+
+    assert rendered.demand_xml is not None
+    assert streamed.demand_xml == "" and streamed.xml_streams is not None
+    pickle.loads(pickle.dumps(streamed.xml_streams["demand"]))
+    routes = tmp_path / "gz" / "routes.rou.xml.gz"
+    assert gzip.decompress(routes.read_bytes()).decode("utf-8") == rendered.demand_xml
+    assert 'value="routes.rou.xml.gz"' in (tmp_path / "gz" / "run.sumocfg").read_text(encoding="utf-8")
+
+    begins = [float(value) for value in re.findall(r' begin="([^"]+)"', rendered.demand_xml)]
+    assert begins == sorted(begins) and begins[0] < begins[-1]
+    first_person = rendered.demand_xml.index("<personFlow")
+    assert rendered.demand_xml.index("<flow") < first_person < rendered.demand_xml.index('begin="1800.00"')
+
+
+def test_routes_document_renders_lazy_entries_as_it_goes() -> None:
+    rendered: list[float] = []
+
+    def segments(kind: str, begins: list[float]):
+        for begin in begins:
+            rendered.append(begin)
+            yield RouteEntry(begin, f"<{kind} begin={begin:g}/>")
+
+    lines = iter_routes_document(
+        person_entries=segments("personFlow", [0.0, 900.0]),
+        vehicle_entries=segments("flow", [0.0, 1800.0]),
+    )
+    body = [line for line in lines if line.startswith("<") and "begin=" in line]
+
+    assert body == ["<flow begin=0/>", "<personFlow begin=0/>", "<personFlow begin=900/>", "<flow begin=1800/>"]
+
+    lines = iter_routes_document(
+        person_entries=segments("personFlow", [0.0, 900.0]),
+        vehicle_entries=segments("flow", [0.0, 1800.0]),
+    )
+    rendered.clear()
+    while next(lines) != "<flow begin=0/>":
+        pass
+    assert 1800.0 not in rendered and 900.0 not in rendered
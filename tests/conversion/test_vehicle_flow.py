@@ -5,22 +5,32 @@ from typing import Dict
 
 from sumo_optimise.conversion.demand.routes import render_routes_document
 from sumo_optimise.conversion.demand.vehicle_flow.flow_propagation import compute_vehicle_od_flows
-from sumo_optimise.conversion.demand.vehicle_flow.reachability import evaluate_vehicle_od_reachability
+from sumo_optimise.conversion.demand.vehicle_flow.reachability import (
+    VehicleConnectionGraph,
+    evaluate_vehicle_od_reachability,
+)
 from sumo_optimise.conversion.demand.vehicle_flow.route_output import build_vehicle_flow_entries
 from sumo_optimise.conversion.demand.vehicle_flow.topology import (
     build_vehicle_network,
     canonicalize_vehicle_endpoint,
 )
 from sumo_optimise.conversion.domain.models import (
+    BuildOptions,
     CardinalDirection,
+    DemandOptions,
     Cluster,
     EndpointDemandRow,
     EventKind,
     LayoutEvent,
     PersonFlowPattern,
     JunctionTurnWeights,
+    NetworkEdge,
     TurnMovement,
+    VehicleConnection,
 )
+from sumo_optimise.conversion.parser.spec_loader import load_json_file
+from sumo_optimise.conversion.pipeline import _BuildGraph, _build_sources, build_corridor_artifacts
+from sumo_optimise.conversion.utils.memo import StageCache
 
 
 def _make_cluster(pos: int) -> Cluster:
@@ -126,6 +136,32 @@ def test_vehicle_od_reachability_filters_unreachable_pairs() -> None:
     assert report.unreachable[0].row.row_index == 1
 
 
+def test_vehicle_reachability_is_traversed_once_per_origin() -> None:
+    edges_xml = """
+<edges>
+  <edge id="a" from="N0" to="N1"/>
+  <edge id="b" from="N1" to="N2"/>
+  <edge id="c" from="N2" to="N1"/>
+  <edge id="d" from="N1" to="N3"/>
+</edges>
+""".strip()
+    connections_xml = """
+<connections>
+  <connection from="a" to="b"/>
+  <connection from="b" to="c"/>
+  <connection from="c" to="b"/>
+</connections>
+""".strip()
+    graph = VehicleConnectionGraph.from_xml(edges_xml, connections_xml)
+
+    reached = graph.reachable_nodes("N0")
+
+    assert reached == {"N1", "N2"}
+    assert graph.reachable_nodes("N0") is reached
+    assert graph.has_path("N0", "N2") and not graph.has_path("N0", "N3")
+    assert graph.has_path("N1", "N3") and graph.has_path("N3", "N3")
+
+
 def test_vehicle_od_reachability_uses_default_adjacency_when_no_connections() -> None:
     edges_xml = """
 <edges>
@@ -149,6 +185,37 @@ def test_vehicle_od_reachability_uses_default_adjacency_when_no_connections() ->
     assert not report.unreachable
 
 
+def test_vehicle_od_reachability_accepts_network_records() -> None:
+    edges = [
+        NetworkEdge(id="edge_main", from_node="Node.Main.0.N", to_node="Node.Main.100.N", lanes=1),
+        NetworkEdge(id="edge_minor_s", from_node="Node.Main.100.N", to_node="Node.Minor.100.S_end", lanes=1),
+        NetworkEdge(id="edge_minor_blocked", from_node="Node.Main.100.N", to_node="Node.Minor.200.S_end", lanes=1),
+    ]
+    connections = [VehicleConnection(from_edge="edge_main", to_edge="edge_minor_s", from_lane=1, to_lane=1)]
+    flows = [
+        ("Node.Main.0.N", "Node.Minor.100.S_end", 50.0, EndpointDemandRow(endpoint_id="Node.Main.0.N", flow_per_hour=50.0)),
+        ("Node.Main.0.N", "Node.Minor.200.S_end", 25.0, EndpointDemandRow(endpoint_id="Node.Main.0.N", flow_per_hour=25.0)),
+    ]
+
+    report = evaluate_vehicle_od_reachability(flows, edges=edges, connections=connections)
+
+    assert [record.destination for record in report.reachable] == ["Node.Minor.100.S_end"]
+    assert [record.destination for record in report.unreachable] == ["Node.Minor.200.S_end"]
+
+
+def test_emitted_network_records_match_rendered_xml() -> None:
+    spec_path = Path("data/sample_updated/SUMO_OPTX_v1.4_sample_updated.json")
+    options = BuildOptions(schema_path=Path("src/sumo_optimise/conversion/data/schema.json"))
+    graph = _BuildGraph(_build_sources(load_json_file(spec_path), options), StageCache(None))
+    edges = graph.value("edges")
+    connections = graph.value("connections")
+
+    from_xml = VehicleConnectionGraph.from_xml(graph.value("edges_xml"), graph.value("connections_xml"))
+    from_records = VehicleConnectionGraph.from_network(edges, connections.connections)
+    assert from_records._edge_nodes == from_xml._edge_nodes
+    assert from_records._transitions == from_xml._transitions
+
+
 def test_canonicalize_vehicle_endpoint_accepts_template_ids() -> None:
     breakpoints = [0, 100]
     clusters = [_make_cluster(100)]
@@ -238,3 +305,41 @@ def test_vehicle_no_main_u_turn_pairs() -> None:
             d_parts = dest.split(".")
             if len(o_parts) == 4 and len(d_parts) == 4 and o_parts[2] == d_parts[2] and o_parts[3] != d_parts[3]:
                 raise AssertionError(f"vehicle U-turn flow detected: {origin} -> {dest}")
+
+
+def test_explicit_vehicle_routes_are_shared_across_segments() -> None:
+    spec = Path("data/sample_updated/SUMO_OPTX_v1.4_sample_updated.json")
+    demand_dir = Path("data/sample_updated")
+    demand = DemandOptions(
+        veh_endpoint_csv=demand_dir / "veh_EP_demand_sampleUpd.csv",
+        veh_junction_turn_weight_csv=demand_dir / "veh_jct_turn_weight_sampleUpd.csv",
+        simulation_end_time=3600.0,
+        unsat_seconds=1800.0,
+        sat_seconds=1800.0,
+        explicit_vehicle_routes=True,
+    )
+    options = BuildOptions(schema_path=Path("src/sumo_optimise/conversion/data/schema.json"), demand=demand)
+
+    result = build_corridor_artifacts(spec, options)
+
+    assert result.demand_xml is not None
+    edge_nodes = {
+        match[0]: (match[1], match[2])
+        for match in re.findall(r'<edge id="([^"]+)" from="([^"]+)" to="([^"]+)"', result.edges_xml)
+    }
+    connected: Dict[str, set] = {}
+    for from_edge, to_edge in re.findall(r'<connection from="([^"]+)" to="([^"]+)"', result.connections_xml):
+        connected.setdefault(from_edge, set()).add(to_edge)
+    routes = dict(re.findall(r'<route id="([^"]+)" edges="([^"]+)"/>', result.demand_xml))
+    flows = re.findall(r'<flow id="vf_([^"]+?)__([^"]+?)__seg\d+__\d+" [^>]*route="([^"]+)"', result.demand_xml)
+    assert routes and "fromJunction" not in result.demand_xml
+    assert result.demand_xml.index("<route ") < result.demand_xml.index("<flow ")
+    assert len(flows) == 2 * len(routes)
+    for origin, destination, route_id in flows:
+        edges = routes[route_id].split()
+        assert edge_nodes[edges[0]][0] == origin and edge_nodes[edges[-1]][1] == destination
+        for current, following in zip(edges, edges[1:]):
+            if current in connected:
+                assert following in connected[current]
+            else:
+                assert edge_nodes[current][1] == edge_nodes[following][0]
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import random
+from collections import defaultdict, deque
+
+from sumo_optimise.conversion.demand.vehicle_flow import flow_propagation
 from sumo_optimise.conversion.demand.vehicle_flow.flow_propagation import compute_vehicle_od_flows
 from sumo_optimise.conversion.demand.vehicle_flow.topology import (
     VehicleClusterMeta,
@@ -40,3 +44,78 @@ def test_minor_origin_reaches_main_end():
     destinations = {destination for _, destination, _, _ in od_flows}
 
     assert "Node.Main.1500.N" in destinations
+
+
+def _reference_propagate(initial_states, amount, *, network, turn_weights):
+    queue = deque((state, amount) for state in initial_states)
+    od_map = defaultdict(float)
+    while queue:
+        state, flow = queue.popleft()
+        shares = flow_propagation._compute_shares(state, network=network, turn_weights=turn_weights)
+        for direction, share in shares.items():
+            portion = flow * share
+            if portion <= 0.0:
+                continue
+            destination = flow_propagation._destination_for(state.pos, direction, network)
+            if destination is not None:
+                od_map[destination] += portion
+                continue
+            next_state = flow_propagation._advance_state(state, direction, network)
+            if next_state is not None:
+                queue.append((next_state, portion))
+    return od_map
+
+
+def _random_weights(rng: random.Random) -> dict[TurnMovement, float]:
+    return {movement: rng.choice([0.0, 0.0, 1.0, 2.5, rng.random() * 10]) for movement in TurnMovement}
+
+
+def test_transfer_table_matches_queue_walk_exactly() -> None:
+    rng = random.Random(11)
+    for _ in range(50):
+        positions = sorted(rng.sample(range(0, 5000, 50), rng.randint(2, 12)))
+        cluster_meta = {
+            pos: VehicleClusterMeta(pos=pos, has_north_minor=rng.random() < 0.6, has_south_minor=rng.random() < 0.6)
+            for pos in positions
+        }
+        network = VehicleNetwork(
+            positions=positions,
+            index_by_pos={pos: idx for idx, pos in enumerate(positions)},
+            cluster_meta=cluster_meta,
+            min_pos=positions[0],
+            max_pos=positions[-1],
+        )
+        turn_weights = {
+            vehicle_cluster_id(pos): JunctionTurnWeights(
+                junction_id=vehicle_cluster_id(pos),
+                main=_random_weights(rng),
+                minor=_random_weights(rng),
+            )
+            for pos in positions
+        }
+        endpoints = [f"Node.Main.{positions[0]}.N", f"Node.Main.{positions[-1]}.S"]
+        for meta in cluster_meta.values():
+            if meta.has_north_minor:
+                endpoints.append(f"Node.Minor.{meta.pos}.N_end")
+            if meta.has_south_minor:
+                endpoints.append(f"Node.Minor.{meta.pos}.S_end")
+        rows = [
+            EndpointDemandRow(endpoint_id=endpoint, flow_per_hour=rng.choice([1.0, -1.0]) * rng.uniform(1, 900))
+            for endpoint in endpoints
+            for _ in range(2)
+        ]
+
+        expected = []
+        for row in rows:
+            endpoint = row.endpoint_id
+            states = flow_propagation._initial_states(endpoint, network)
+            od_map = _reference_propagate(states, abs(row.flow_per_hour), network=network, turn_weights=turn_weights)
+            for other, value in od_map.items():
+                if value <= 0.0 or other == endpoint:
+                    continue
+                pair = (endpoint, other) if row.flow_per_hour >= 0 else (other, endpoint)
+                if flow_propagation._is_main_u_turn(*pair):
+                    continue
+                expected.append((*pair, value, row))
+
+        assert compute_vehicle_od_flows(rows, network=network, turn_weights=turn_weights) == expected